@@ -1,11 +1,44 @@
 print("Loading app.py...")
-from flask import Flask, request, jsonify, send_from_directory
-
-from nlp_engine import text_to_image
-from regeneration import regenerate
+from flask import Flask, request, jsonify, g, Response
+
+import warmup
+import model_loader
+
+# Independent model loads (spaCy, SBERT) run concurrently; the module-level
+# loads below then reuse the cached instances
+with warmup.loading("models"):
+    model_loader.preload()
+
+# Model loads are timed per component for /health (see warmup.py)
+with warmup.loading("nlp_engine"):
+    from nlp_engine import text_to_image, text_to_worksheet, static_visual
+# Question-independent visuals as in-memory PNGs (before fork: shared by pre-fork workers)
+with warmup.loading("static_visuals"):
+    from visuals import static_cache
+    static_cache.prerender()
+with warmup.loading("equivalence_engine"):
+    from regeneration import regenerate
+    import equivalence_engine
+if not equivalence_engine.AVAILABLE:
+    warmup.mark_failed("equivalence_engine", "ML dependencies missing (mock mode)")
+with warmup.loading("braille"):
+    from braille_converter import to_braille
+from metrics import QUEUE_DEPTH, render_metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+import tracing
+import http_cache
+import janitor
+from traffic_log import TrafficRecorder
 import os
+import time
 
 app = Flask(__name__)
+# gzip/brotli for HTML and JSON responses (see http_cache.py)
+http_cache.init_app(app)
+
+# Optional live-traffic recording for loadgen.py replays
+_TRAFFIC_RECORDER = (
+    TrafficRecorder(os.environ["TRAFFIC_RECORD_PATH"]) if os.getenv("TRAFFIC_RECORD_PATH") else None
+)
 
 # Manual CORS support
 @app.after_request
@@ -13,16 +46,79 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    request_id = tracing.current_request_id()
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    if _TRAFFIC_RECORDER is not None and "request_start" in g:
+        _TRAFFIC_RECORDER.record(
+            request.method,
+            g.get("metrics_route", request.path),
+            request.get_json(silent=True),
+            status=response.status_code,
+            latency_ms=(time.perf_counter() - g.request_start) * 1000,
+            ts=g.request_wall_start,
+        )
     return response
 
 
+# Requests in flight per route (the /metrics "queue depth" gauge)
+@app.before_request
+def track_in_flight():
+    g.request_start = time.perf_counter()
+    g.request_wall_start = time.time()
+    g.metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+    QUEUE_DEPTH.inc(route=g.metrics_route)
+    # One trace per request; every span below (LLM call, validators, render) joins it
+    g.trace_scope = tracing.start_request(
+        g.metrics_route,
+        request_id=request.headers.get("X-Request-ID"),
+        method=request.method,
+    )
+    g.trace_scope.__enter__()
+
+
+@app.teardown_request
+def untrack_in_flight(exc=None):
+    scope = g.pop("trace_scope", None)
+    if scope is not None:
+        scope.__exit__(type(exc) if exc else None, exc, None)
+    route = g.pop("metrics_route", None)
+    if route is not None:
+        QUEUE_DEPTH.dec(route=route)
+
+
 @app.route("/")
 def home():
-    return send_from_directory(".", "el.html")
+    return http_cache.send_file_cached(".", "el.html")
 
 @app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "online", "message": "Server is running"}), 200
+    # Liveness and readiness together; always 200 while the process answers
+    report = warmup.snapshot()
+    return jsonify({
+        "status": "online",
+        "message": "Server is running",
+        "live": True,
+        "ready": report["ready"],
+        "readiness": report["status"],
+        "uptime_s": report["uptime_s"],
+        "warmup": report["warmup"],
+        "components": report["components"]
+    }), 200
+
+@app.route("/health/live", methods=["GET"])
+def health_live():
+    return jsonify({"live": True}), 200
+
+@app.route("/health/ready", methods=["GET"])
+def health_ready():
+    # Load balancers route traffic only to workers answering 200 here
+    report = warmup.snapshot()
+    return jsonify(report), 200 if report["ready"] else 503
+
+@app.route("/metrics", methods=["GET"])
+def metrics_route():
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
 
 @app.route("/generate", methods=["POST"])
 def generate():
@@ -41,6 +137,13 @@ def generate():
 
     # ---------------- VISUAL MODE ----------------
     if mode == "visual":
+        cached = static_visual(question)
+        if cached:
+            return jsonify({
+                "status": "success",
+                "image": static_cache.url(cached)
+            })
+
         output_path = text_to_image(question)
 
         if not output_path:
@@ -51,7 +154,8 @@ def generate():
 
         return jsonify({
             "status": "success",
-            "image": f"/generated_images/{os.path.basename(output_path)}"
+            # ?v=<content hash>: the URL changes whenever the image does, so it is cached as immutable
+            "image": http_cache.versioned_url(f"/generated_images/{os.path.basename(output_path)}", output_path)
         })
 
     # ---------------- TEXT MODES ----------------
@@ -72,9 +176,78 @@ def generate():
 
 from regeneration import regenerate
 
+# Batch /validate limits (413 when exceeded)
+VALIDATE_MAX_ITEMS = int(os.getenv("VALIDATE_MAX_ITEMS", "64"))
+VALIDATE_MAX_CHARS = int(os.getenv("VALIDATE_MAX_CHARS", "5000"))
+
+
+def _validate_items(data):
+    """
+    Batch mode: {"items": [{"original": ..., "candidate": ...}, ...], "full": false}
+
+    All pairs go through equivalence_engine.validate_pairs (one batched SBERT
+    encode and one spaCy pipe per validator). With "full": true every metric is
+    computed; otherwise metrics after the first failed check are null and listed
+    in "skipped".
+    """
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list of {original, candidate} objects"}), 400
+    if len(items) > VALIDATE_MAX_ITEMS:
+        return jsonify({"error": f"Too many items ({len(items)}); max {VALIDATE_MAX_ITEMS} per request"}), 413
+
+    originals, candidates = [], []
+    for index, item in enumerate(items):
+        original = item.get("original") if isinstance(item, dict) else None
+        candidate = item.get("candidate") if isinstance(item, dict) else None
+        if not isinstance(original, str) or not original or not isinstance(candidate, str):
+            return jsonify({"error": f"items[{index}] needs a non-empty 'original' and a 'candidate' string"}), 400
+        if len(original) > VALIDATE_MAX_CHARS or len(candidate) > VALIDATE_MAX_CHARS:
+            return jsonify({"error": f"items[{index}] is longer than {VALIDATE_MAX_CHARS} characters"}), 413
+        originals.append(original)
+        candidates.append(candidate)
+
+    from equivalence_engine import validate_pairs
+    results = validate_pairs(originals, candidates, early_exit=not data.get("full", False))
+
+    return jsonify({
+        "count": len(results),
+        "passed": sum(1 for r in results if r["pass"]),
+        "results": results
+    })
+
+
+@app.route("/worksheet", methods=["POST"])
+def worksheet():
+    """
+    Several visuals on one sheet, rendered and encoded once.
+    Body: {"items": [question or visual spec, ...], "title": "...", "columns": 3}
+    (specs: see visuals/worksheet.py)
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list of questions or visual specs"}), 400
+
+    try:
+        output_path = text_to_worksheet(items, title=data.get("title"), columns=data.get("columns"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "status": "success",
+        "image": http_cache.versioned_url(f"/generated_images/{os.path.basename(output_path)}", output_path)
+    })
+
+
 @app.route("/validate", methods=["POST"])
 def validate_route():
-    data = request.json
+    data = request.json or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    if "items" in data:
+        return _validate_items(data)
+
     text = data.get("text", "")
 
     if not text:
@@ -85,6 +258,8 @@ def validate_route():
         return x + " in simple words"
 
     result = regenerate(text, dummy_generator)
+    if result["metrics"] is None:
+        return jsonify({"error": "No candidate could be generated"}), 500
 
     return jsonify({
         "validated": result["validated"],
@@ -98,20 +273,44 @@ def validate_route():
     })
 
 
+@app.route("/static_visuals/<name>.png")
+def serve_static_visual(name):
+    visual = static_cache.get(name)
+    if visual is None:
+        return jsonify({"error": "Not found"}), 404
+    return http_cache.send_bytes_cached(visual.data, visual.digest, "image/png")
+
+
 @app.route("/generated_images/<filename>")
 def serve_image(filename):
-    return send_from_directory("generated_images", filename)
+    # Pinned until the response is closed, so the janitor cannot delete it mid-send
+    held = janitor.pin(os.path.join("generated_images", filename))
+    try:
+        response = http_cache.send_file_cached("generated_images", filename)
+    except Exception:
+        held.release()
+        raise
+    response.call_on_close(held.release)
+    return response
 
 
 # ---------------- PRE-LOAD MODELS ----------------
 try:
     print("Initializing Text Simplifier (Pre-loading models)...")
-    from text_simplifier import TextSimplifier
-    _GLOBAL_SIMPLIFIER = TextSimplifier()
+    with warmup.loading("text_simplifier"):
+        from text_simplifier import TextSimplifier
+        _GLOBAL_SIMPLIFIER = TextSimplifier()
     print("Text Simplifier ready.")
 except Exception as e:
     print(f"FAILED to load Text Simplifier: {e}")
-    _GLOBAL_SIMPLifier = None
+    _GLOBAL_SIMPLIFIER = None
+
+# Warm every loaded model in the background; /health/ready reports 503 until done.
+# serve_prefork.py defers this to each forked worker (WARMUP_DEFERRED=1).
+if os.getenv("WARMUP_DEFERRED", "0") != "1":
+    warmup.start_background(_GLOBAL_SIMPLIFIER)
+    # Quota/age eviction for generated_images and outputs (see janitor.py)
+    janitor.start_background()
 
 @app.route("/simplify", methods=["POST"])
 def simplify_route():
@@ -136,7 +335,8 @@ def simplify_route():
                 "semantic_score": result["semantic_score"],
                 "difficulty_change": result["difficulty_change"],
                 "passed": result["passed_internal_validation"],
-                "attempts": result["attempt"]
+                "attempts": result["attempt"],
+                "tier": result.get("tier")
             },
             "quality_report": {
                  "status": "passed" if result["passed_internal_validation"] else "failed",
@@ -163,7 +363,6 @@ def braille_route():
     if not text:
         return jsonify({"error": "No text provided"}), 400
 
-    from braille_converter import to_braille
     braille_text = to_braille(text)
 
 
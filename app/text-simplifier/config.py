@@ -13,7 +13,7 @@ load_dotenv()
 HUGGINGFACE_API_KEY = os.getenv('HUGGINGFACE_API_KEY', '')
 
 # If no API key found, provide helpful message but don't crash
-if not HUGGINGFACE_API_KEY:
+if not HUGGINGFACE_API_KEY and not os.getenv('LLM_API_URL'):
     print("⚠️  WARNING: HUGGINGFACE_API_KEY not found in environment")
     print("   The module will work in DEMO MODE with sample outputs")
     print("   To enable full functionality:")
@@ -23,7 +23,10 @@ if not HUGGINGFACE_API_KEY:
 
 # Model Configuration
 MODEL_NAME = "meta-llama/Llama-3.2-3B-Instruct"
-API_URL = f"https://api-inference.huggingface.co/models/{MODEL_NAME}"
+
+# Optional override, e.g. the local stub: http://127.0.0.1:8081/models/stub
+LLM_API_URL = os.getenv('LLM_API_URL', '')
+API_URL = LLM_API_URL or f"https://api-inference.huggingface.co/models/{MODEL_NAME}"
 
 # Validation Thresholds
 SEMANTIC_SIMILARITY_THRESHOLD = 0.85
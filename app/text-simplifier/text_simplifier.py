@@ -23,8 +23,8 @@ class TextSimplifier:
             "Authorization": f"Bearer {config.HUGGINGFACE_API_KEY}"
         } if config.HUGGINGFACE_API_KEY else {}
         
-        # Check if running in demo mode
-        self.demo_mode = not config.HUGGINGFACE_API_KEY
+        # Check if running in demo mode (a configured LLM_API_URL needs no key)
+        self.demo_mode = not config.HUGGINGFACE_API_KEY and not config.LLM_API_URL
         
         if self.demo_mode:
             print("🎭 Running in DEMO MODE (no API key detected)")
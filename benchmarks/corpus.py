@@ -0,0 +1,71 @@
+"""
+Fixed Benchmark Corpora
+Inputs are frozen so timings stay comparable against benchmarks/baseline.json.
+Do not edit an existing entry - add new ones and re-save the baseline.
+"""
+
+# Assessment questions of increasing length and vocabulary difficulty
+QUESTIONS = [
+    "Calculate the area of the circle with radius = 6cm.",
+    "Evaluate the definite integral of f(x) = x^2 from x = 0 to x = 5.",
+    "It is important to note that the velocity of the projectile increased due to the fact that the force was applied.",
+    "The perimeter of a rectangular garden is 48 meters. If the length is twice the width, determine the dimensions of the garden.",
+    "Analyze the relationship between photosynthesis and cellular respiration in plants, and demonstrate how the mitochondria facilitates the release of energy.",
+    "Because the coefficient of friction is substantial, the magnitude of the acceleration is considerably reduced; consequently, determine the displacement of the block after 4 seconds.",
+    "Although the hypothesis appears appropriate, investigate whether the correlation between the concentration of the catalyst and the reaction rate implies causation, whereas the equilibrium constant remains unchanged.",
+    "A polynomial function has a vertex at (2, -3). Compute the coefficient of the quadratic term if the function passes through the point (4, 5), and illustrate the domain and range.",
+]
+
+# (original, simplified) pairs for the similarity and equivalence validators
+PAIRS = [
+    (
+        "Calculate the area of the circle with radius = 6cm.",
+        "Find the area of the circle with radius = 6cm.",
+    ),
+    (
+        "Evaluate the definite integral of f(x) = x^2 from x = 0 to x = 5.",
+        "Find the area under the curve f(x) = x^2 from x = 0 to x = 5.",
+    ),
+    (
+        "It is important to note that the velocity of the projectile increased due to the fact that the force was applied.",
+        "The speed of the flying object increased because the push was applied.",
+    ),
+    (
+        "The perimeter of a rectangular garden is 48 meters. If the length is twice the width, determine the dimensions of the garden.",
+        "A rectangle-shaped garden has a perimeter of 48 meters. The length is two times the width. Find the length and width.",
+    ),
+    (
+        "Analyze the relationship between photosynthesis and cellular respiration in plants.",
+        "Study how photosynthesis and cellular respiration are connected in plants.",
+    ),
+    (
+        "Determine the displacement of the block after 4 seconds.",
+        "Find how far the block moved after 4 seconds.",
+    ),
+]
+
+# One prompt per text_to_image branch (keys are the shape names used in metrics)
+VISUAL_PROMPTS = {
+    "concept_card": "Explain the water cycle to a student",
+    "triangle": "Draw a triangle",
+    "circle": "Draw a circle with radius 7",
+    "rectangle": "Draw a rectangle 8 by 3",
+    "force": "A force of 20 newton pushes left",
+    "motion": "Show the motion of a car moving right",
+    "projectile": "Projectile launched at 25 m/s and 60 degrees",
+    "circuit": "Draw a circuit with a battery and resistor",
+    "flowchart": "flowchart: Start, Read input, Compute, End",
+    "function": "plot sin(x)",
+    "derivative": "derivative of x**3 - 2*x",
+    "pie": "pie chart of 10, 20, 30, 40",
+    "histogram": "histogram of 1, 2, 2, 3, 3, 3, 4",
+    "bar": "bar chart of 5, 3, 7, 2",
+    "graph": "graph the line through 1, 2 and 3, 6",
+}
+
+# Text for Braille conversion, including digits, capitals and punctuation
+BRAILLE_TEXTS = [
+    "Find the area of a circle with radius 6.",
+    "Question 12: A train travels 300 km in 4 hours. What is its speed?",
+    "The Mitochondria (the cell's power plant) releases energy; Photosynthesis stores it!",
+]
@@ -0,0 +1,74 @@
+"""
+Difficulty Engine Parity Check
+
+Scores every corpus question (plus any extra texts given on the command
+line) with both DifficultyScorer engines and reports the per-metric
+difference. Exits with status 1 when any composite_difficulty differs by
+more than --tolerance points.
+
+Usage:
+    python benchmarks/difficulty_parity.py
+    python benchmarks/difficulty_parity.py --tolerance 1.0 "Some other question."
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import QUESTIONS, PAIRS
+
+# composite_difficulty is 0-100; SIMPLIFIER thresholds move in steps of ~10
+DEFAULT_TOLERANCE = 2.0
+
+METRICS = (
+    "composite_difficulty",
+    "flesch_reading_ease",
+    "flesch_kincaid_grade",
+    "avg_word_length",
+    "avg_sentence_length",
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("texts", nargs="*", help="extra texts to compare")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="max allowed composite_difficulty difference (points)")
+    args = parser.parse_args(argv)
+
+    from difficulty_scorer import DifficultyScorer
+    native = DifficultyScorer(engine="native")
+    legacy = DifficultyScorer(engine="spacy")
+
+    texts = list(QUESTIONS) + [b for _, b in PAIRS] + args.texts
+    worst = {metric: 0.0 for metric in METRICS}
+    failures = []
+
+    for text in texts:
+        a = native.calculate_difficulty(text)
+        b = legacy.calculate_difficulty(text)
+        for metric in METRICS:
+            worst[metric] = max(worst[metric], abs(a[metric] - b[metric]))
+        delta = abs(a["composite_difficulty"] - b["composite_difficulty"])
+        if delta > args.tolerance:
+            failures.append((delta, text, a["composite_difficulty"], b["composite_difficulty"]))
+
+    print(f"Compared {len(texts)} texts (native vs spacy)")
+    for metric in METRICS:
+        print(f"  max |Δ| {metric:<22} {worst[metric]:.2f}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} text(s) above tolerance {args.tolerance}:")
+        for delta, text, a, b in sorted(failures, reverse=True):
+            print(f"  Δ={delta:.2f} native={a} spacy={b}  {text[:70]}")
+        return 1
+    print(f"\n✅ All composite scores within {args.tolerance}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
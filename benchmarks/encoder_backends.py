@@ -0,0 +1,86 @@
+"""
+Semantic Encoder Backend Check: accuracy and throughput
+
+For each backend in encoders.BACKENDS:
+  - accuracy: SemanticChecker.check_similarity on every corpus pair must
+    agree with the fp32 "torch" reference within --tolerance
+  - throughput: sentences/second encoding the corpus in one batch
+
+Usage:
+    python benchmarks/encoder_backends.py
+    python benchmarks/encoder_backends.py --backends torch quantized --tolerance 0.03
+
+Exits with status 1 when a backend drifts beyond the tolerance. Backends
+whose dependencies are missing (e.g. optimum for "onnx") are reported and
+skipped.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import QUESTIONS, PAIRS
+
+# Scores are compared against SEMANTIC_THRESHOLD = 0.85; 0.02 keeps pass/fail stable
+DEFAULT_TOLERANCE = 0.02
+DEFAULT_REPEAT = 5
+
+
+def _throughput(model, sentences, repeat: int) -> float:
+    model.encode(sentences)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.encode(sentences)
+        timings.append(time.perf_counter() - start)
+    return len(sentences) / statistics.median(timings)
+
+
+def main(argv=None) -> int:
+    from encoders import BACKENDS, DEFAULT_MODEL
+    from semantic_checker import SemanticChecker
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="max allowed |score - torch score| per pair")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    reference = SemanticChecker(args.model, backend="torch")
+    reference_scores = [reference.check_similarity(a, b) for a, b in PAIRS]
+    sentences = list(QUESTIONS) + [text for pair in PAIRS for text in pair]
+
+    failed = False
+    print(f"\n{'Backend':<10} {'sent/s':>10} {'speed-up':>9} {'max |Δ|':>9} {'mean |Δ|':>9}")
+    base_rate = None
+    for backend in args.backends:
+        try:
+            checker = SemanticChecker(args.model, backend=backend)
+        except Exception as e:
+            print(f"{backend:<10} skipped: {e}")
+            continue
+
+        rate = _throughput(checker.model, sentences, args.repeat)
+        if backend == "torch":
+            base_rate = rate
+        scores = [checker.check_similarity(a, b) for a, b in PAIRS]
+        deltas = [abs(s - r) for s, r in zip(scores, reference_scores)]
+        speedup = f"{rate / base_rate:.2f}x" if base_rate else "-"
+        print(f"{backend:<10} {rate:>10.1f} {speedup:>9} {max(deltas):>9.4f} {statistics.mean(deltas):>9.4f}")
+        if max(deltas) > args.tolerance:
+            failed = True
+            print(f"  ❌ {backend} drifts beyond tolerance {args.tolerance}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+HTTP Bytes Benchmark: bytes sent per browser session, HTTP_CACHE=0 vs 1
+
+Replays a typical session against the real el.html and generated_images
+files through http_cache (the same calls app.py makes), without loading any
+models:
+  - open the page, generate a few visuals, view each image
+  - view the same images again, then reload the page (`--visits` times)
+
+The simulated browser keeps a cache: it revalidates with If-None-Match and
+skips the request entirely for URLs served as immutable. JSON responses from
+/generate are included, so compression of JSON is counted too.
+
+Usage:
+    python benchmarks/http_bytes.py --visits 3
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, jsonify  # noqa: E402
+
+import http_cache  # noqa: E402
+
+IMAGE_DIR = os.path.join(ROOT, "generated_images")
+
+
+def build_app() -> Flask:
+    app = Flask(__name__)
+    http_cache.init_app(app)
+
+    @app.route("/")
+    def home():
+        return http_cache.send_file_cached(ROOT, "el.html")
+
+    @app.route("/generate/<filename>")
+    def generate(filename):
+        # Same response shape as /generate in visual mode
+        path = os.path.join(IMAGE_DIR, filename)
+        return jsonify({
+            "status": "success",
+            "image": http_cache.versioned_url(f"/generated_images/{filename}", path),
+        })
+
+    @app.route("/generated_images/<filename>")
+    def serve_image(filename):
+        return http_cache.send_file_cached(IMAGE_DIR, filename)
+
+    return app
+
+
+class Browser:
+    """Minimal HTTP cache: ETag revalidation and immutable reuse."""
+
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}  # url -> (etag, immutable, body)
+        self.bytes = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.skipped = 0
+
+    def _fetch(self, url: str, headers: dict):
+        response = self.client.get(url, headers=dict(headers, **{"Accept-Encoding": "gzip, br"}))
+        self.requests += 1
+        self.bytes += len(response.get_data()) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        body = response.get_data()
+        encoding = response.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "br":
+            body = http_cache.brotli.decompress(body)
+        return response, body
+
+    def get(self, url: str) -> bytes:
+        cached = self.cache.get(url)
+        if cached and cached[1]:
+            self.skipped += 1
+            return cached[2]
+        headers = {"If-None-Match": cached[0]} if cached and cached[0] else {}
+        response, body = self._fetch(url, headers)
+        if response.status_code == 304:
+            self.not_modified += 1
+            return cached[2]
+        etag = response.headers.get("ETag")
+        immutable = "immutable" in response.headers.get("Cache-Control", "")
+        if etag or immutable:
+            self.cache[url] = (etag, immutable, body)
+        return body
+
+    def post_like(self, url: str) -> dict:
+        """Uncached API call (stands in for POST /generate)."""
+        return json.loads(self._fetch(url, {})[1])
+
+
+def run_session(app: Flask, images, visits: int) -> dict:
+    browser = Browser(app.test_client())
+    for _ in range(visits):
+        browser.get("/")
+        for _ in range(2):
+            for name in images:
+                browser.get(browser.post_like(f"/generate/{name}")["image"])
+    return {
+        "bytes": browser.bytes,
+        "requests": browser.requests,
+        "not_modified": browser.not_modified,
+        "skipped": browser.skipped,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--visits", type=int, default=3)
+    parser.add_argument("--images", type=int, default=5, help="distinct visuals per visit")
+    parser.add_argument("--json-out", default="")
+    args = parser.parse_args(argv)
+
+    images = sorted(f for f in os.listdir(IMAGE_DIR) if f.endswith(".png"))[:args.images]
+    app = build_app()
+    results = {}
+    for label, value in (("before", "0"), ("after", "1")):
+        os.environ["HTTP_CACHE"] = value
+        results[label] = run_session(app, images, args.visits)
+
+    print(f"\n{'':<8} {'bytes':>10} {'requests':>9} {'304s':>6} {'skipped':>8}")
+    for label, r in results.items():
+        print(f"{label:<8} {r['bytes']:>10} {r['requests']:>9} {r['not_modified']:>6} {r['skipped']:>8}")
+    saved = 1 - results["after"]["bytes"] / max(results["before"]["bytes"], 1)
+    print(f"\nBytes per session: {saved:.0%} fewer with HTTP caching and compression")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
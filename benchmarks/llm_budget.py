@@ -0,0 +1,126 @@
+"""
+LLM Output Budget Benchmark (against llm_stub_server.py)
+
+Sends the simplification prompt for every corpus question and level to the
+stub's chat-completion endpoint, once with the old fixed budget and once with
+the adaptive budget, and reports per-item latency and truncation rate:
+  - fixed:    max_tokens=500, no stop sequence (previous behaviour)
+  - adaptive: prompts.get_max_tokens(text, level), stop=[END_MARKER]
+
+Usage:
+    python benchmarks/llm_budget.py                          # in-process stub
+    python benchmarks/llm_budget.py --token-latency 0.02 --trailing-tokens 120
+    python benchmarks/llm_budget.py --url http://127.0.0.1:8081   # running stub
+
+The in-process stub uses the "echo" policy; --token-latency and
+--trailing-tokens model decode time and a model that keeps writing after
+the answer.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import QUESTIONS
+from prompts import END_MARKER, MAX_MAX_TOKENS, get_max_tokens, get_simplification_prompt
+
+LEVELS = ("minimal", "moderate", "significant")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def start_stub(token_latency: float, trailing_tokens: int) -> str:
+    """Serve llm_stub_server on an ephemeral port in a daemon thread; returns its URL."""
+    from werkzeug.serving import make_server
+    from llm_stub_server import StubPolicy, create_app
+
+    policy = StubPolicy(policy="echo", token_latency=token_latency, trailing_tokens=trailing_tokens)
+    server = make_server("127.0.0.1", 0, create_app(policy), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def complete(url: str, prompt: str, max_tokens: int, stop=None) -> dict:
+    body = {
+        "model": "stub",
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+    }
+    if stop:
+        body["stop"] = stop
+    req = urllib.request.Request(
+        url + "/v1/chat/completions",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=120) as response:
+        return json.loads(response.read())
+
+
+def run_scenario(url: str, adaptive: bool, repeat: int) -> dict:
+    latencies, tokens, truncated, total = [], [], 0, 0
+    for _ in range(repeat):
+        for text in QUESTIONS:
+            for level in LEVELS:
+                prompt = get_simplification_prompt(text, level)
+                if adaptive:
+                    max_tokens, stop = get_max_tokens(text, level), [END_MARKER]
+                else:
+                    max_tokens, stop = MAX_MAX_TOKENS, None
+                start = time.perf_counter()
+                data = complete(url, prompt, max_tokens, stop)
+                latencies.append((time.perf_counter() - start) * 1000)
+                tokens.append(data["usage"]["completion_tokens"])
+                truncated += data["choices"][0]["finish_reason"] == "length"
+                total += 1
+    return {
+        "items": total,
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "mean_completion_tokens": round(statistics.mean(tokens), 1),
+        "truncation_rate": round(truncated / total, 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="", help="running stub server (default: start one in-process)")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="in-process stub: seconds per token")
+    parser.add_argument("--trailing-tokens", type=int, default=80,
+                        help="in-process stub: filler tokens after the end marker")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json-out", default="", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    url = args.url.rstrip("/") or start_stub(args.token_latency, args.trailing_tokens)
+    results = {
+        "fixed": run_scenario(url, adaptive=False, repeat=args.repeat),
+        "adaptive": run_scenario(url, adaptive=True, repeat=args.repeat),
+    }
+
+    print(f"\n{'Budget':<10} {'items':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'tokens':>8} {'trunc %':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['items']:>6} {r['mean_ms']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['mean_completion_tokens']:>8.1f} {r['truncation_rate'] * 100:>7.1f}%")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
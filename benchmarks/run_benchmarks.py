@@ -0,0 +1,271 @@
+"""
+Hot-Path Benchmark Suite with Regression Baselines
+
+Times every hot path on the fixed corpora in benchmarks/corpus.py and
+compares the median per-item latency with benchmarks/baseline.json.
+
+Usage:
+    python benchmarks/run_benchmarks.py                   # compare with baseline
+    python benchmarks/run_benchmarks.py --save-baseline   # record a new baseline
+    python benchmarks/run_benchmarks.py --only semantic --tolerance 0.15
+
+Exits with status 1 when any case is slower than baseline * (1 + tolerance).
+Baselines are machine-specific: record one per host class.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import QUESTIONS, PAIRS, VISUAL_PROMPTS, BRAILLE_TEXTS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.20  # 20% slower than baseline counts as a regression
+DEFAULT_REPEAT = 5
+
+
+class Case:
+    """
+    One benchmark case.
+
+    Args:
+        name: Stable id used as the baseline key
+        setup: Called once, returns a list of zero-argument callables (one per corpus item)
+    """
+
+    def __init__(self, name: str, setup: Callable[[], List[Callable[[], object]]]):
+        self.name = name
+        self.setup = setup
+
+
+# =====================================================
+# Case definitions (imports are lazy so a missing model only skips its cases)
+# =====================================================
+
+def _simplify_text_case(aggression):
+    def setup():
+        from simplifier_engine import simplify_text
+        return [lambda q=q: simplify_text(q, aggression=aggression) for q in QUESTIONS]
+    return Case(f"simplify_text[aggression={aggression}]", setup)
+
+
+def _difficulty_case(engine):
+    def setup():
+        from difficulty_scorer import DifficultyScorer
+        scorer = DifficultyScorer(engine=engine)
+        return [lambda q=q: scorer.calculate_difficulty(q) for q in QUESTIONS]
+    return Case(f"DifficultyScorer.calculate_difficulty[{engine}]", setup)
+
+
+_SEMANTIC_CHECKER = None
+
+
+def _semantic_checker():
+    global _SEMANTIC_CHECKER
+    if _SEMANTIC_CHECKER is None:
+        from semantic_checker import SemanticChecker
+        _SEMANTIC_CHECKER = SemanticChecker()
+    return _SEMANTIC_CHECKER
+
+
+def _semantic_case():
+    def setup():
+        checker = _semantic_checker()
+        return [lambda a=a, b=b: checker.check_similarity(a, b) for a, b in PAIRS]
+    return Case("SemanticChecker.check_similarity", setup)
+
+
+def _semantic_batch_case():
+    def setup():
+        checker = _semantic_checker()
+        originals = [a for a, _ in PAIRS]
+        simplified = [b for _, b in PAIRS]
+        return [lambda: checker.batch_check_similarity(originals, simplified)]
+    return Case("SemanticChecker.batch_check_similarity", setup)
+
+
+def _equivalence_case():
+    def setup():
+        import equivalence_engine
+        if not equivalence_engine.AVAILABLE:
+            raise RuntimeError("equivalence_engine running in mock mode")
+        return [lambda a=a, b=b: equivalence_engine.validate(a, b) for a, b in PAIRS]
+    return Case("equivalence_engine.validate", setup)
+
+
+def _render_case(shape, prompt, output_folder):
+    def setup():
+        from nlp_engine import text_to_image
+        return [lambda: text_to_image(prompt, output_folder)]
+    return Case(f"text_to_image[{shape}]", setup)
+
+
+def _braille_case():
+    def setup():
+        from braille_converter import to_braille
+        return [lambda t=t: to_braille(t) for t in BRAILLE_TEXTS]
+    return Case("to_braille", setup)
+
+
+def build_cases(output_folder: str) -> List[Case]:
+    cases = [_simplify_text_case(level) for level in (1, 2, 3)]
+    cases += [
+        _difficulty_case("native"),
+        _difficulty_case("spacy"),
+        _semantic_case(),
+        _semantic_batch_case(),
+        _equivalence_case(),
+    ]
+    cases += [_render_case(shape, prompt, output_folder) for shape, prompt in VISUAL_PROMPTS.items()]
+    cases.append(_braille_case())
+    return cases
+
+
+# =====================================================
+# Runner
+# =====================================================
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_case(case: Case, repeat: int) -> Dict[str, object]:
+    """
+    Run one case: one untimed warm-up pass, then `repeat` timed passes over its corpus.
+
+    A failing setup (typically a missing optional dependency) skips the case;
+    a failure in a warm-up or timed call marks it as an error. Neither stops
+    the rest of the suite.
+    """
+    try:
+        calls = case.setup()
+    except Exception as e:
+        return {"status": "skipped", "reason": f"{type(e).__name__}: {e}"}
+
+    phase = "warm-up"
+    try:
+        for call in calls:
+            call()
+
+        phase = "timed run"
+        durations_ms = []
+        for _ in range(repeat):
+            for call in calls:
+                start = time.perf_counter()
+                call()
+                durations_ms.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        return {"status": "error", "reason": f"{phase}: {type(e).__name__}: {e}"}
+
+    return {
+        "status": "ok",
+        "items": len(calls),
+        "samples": len(durations_ms),
+        "median_ms": round(statistics.median(durations_ms), 4),
+        "p95_ms": round(_percentile(durations_ms, 95), 4),
+        "mean_ms": round(statistics.fmean(durations_ms), 4),
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Return one message per case whose median exceeds baseline * (1 + tolerance)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if result.get("status") != "ok" or not base or base.get("status") != "ok":
+            continue
+        limit = base["median_ms"] * (1 + tolerance)
+        if result["median_ms"] > limit:
+            change = (result["median_ms"] / base["median_ms"] - 1) * 100
+            regressions.append(
+                f"{name}: {result['median_ms']:.3f} ms vs baseline {base['median_ms']:.3f} ms (+{change:.1f}%)"
+            )
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON path")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction (default 0.20)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed passes per case")
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="bench_images_") as output_folder:
+        cases = [c for c in build_cases(output_folder) if args.only in c.name]
+        results = {}
+        for case in cases:
+            result = run_case(case, args.repeat)
+            results[case.name] = result
+            if result["status"] == "ok":
+                print(f"{case.name:<45} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms")
+            else:
+                print(f"{case.name:<45} {result['status'].upper()} ({result['reason']})")
+    errors = [name for name, result in results.items() if result["status"] == "error"]
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {"cases": {}}
+        baseline["environment"] = environment()
+        for name, result in results.items():
+            # A skipped or failing run never replaces a recorded timing
+            if result["status"] == "ok" or baseline["cases"].get(name, {}).get("status") != "ok":
+                baseline["cases"][name] = result
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 1 if errors else 0
+
+    if errors:
+        print(f"\nERRORS in {len(errors)} case(s): {', '.join(errors)}")
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first.")
+        return 1 if errors else 0
+
+    if baseline.get("environment") != environment():
+        print("\nWARNING: baseline was recorded on a different environment:", baseline.get("environment"))
+
+    regressions = compare(results, baseline.get("cases", {}), args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print("  " + line)
+        return 1
+
+    print(f"\nNo regressions beyond {args.tolerance:.0%}.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Expression Sandbox Benchmark: latency of accepted, rejected and timed-out plots (visuals/safe_expr.py)
+
+  - cold: first plot, includes starting a sandbox worker
+  - warm: median over --repeat runs of each accepted expression
+  - rejected: inputs stopped by the whitelist/budget before any worker is used
+  - timeout: an expression over --timeout (worker killed); a second timeout of the
+    same input is remembered, so the third attempt fails fast
+
+Usage:
+    python benchmarks/safe_expr.py [--repeat 20] [--timeout 0.05]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from visuals import safe_expr  # noqa: E402
+from visuals.safe_expr import ExpressionError, plot_data  # noqa: E402
+
+ACCEPTED = ("x**2", "sin(10*x)", "tan(x)", "x^3 - 2x", "exp(-x**2)*cos(3x)")
+REJECTED = (
+    "__import__('os').system('id')",
+    "x.__class__",
+    "9**9**9",
+    "x**1000",
+    "sin(" * 25 + "x" + ")" * 25,
+    "lambda: 0",
+    "foo(x)",
+)
+HEAVY = "((x+1)**50*(x-1)**50*(x+2)**50*(x-3)**50)*sin(x)**40*cos(x)**40"
+
+
+def _time(text, **kwargs):
+    start = time.perf_counter()
+    try:
+        plot_data(text, **kwargs)
+        result = "ok"
+    except ExpressionError as e:
+        result = e.reason
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    ms, _ = _time("x")
+    print(f"\n{'cold start':<36} {ms:>9.1f} ms")
+
+    print(f"\n{'accepted':<36} {'median':>9}")
+    for text in ACCEPTED:
+        runs = [_time(text, derivative=True)[0] for _ in range(args.repeat)]
+        print(f"{text:<36} {statistics.median(runs):>9.1f} ms")
+
+    print(f"\n{'rejected':<36} {'median':>9}  reason")
+    for text in REJECTED:
+        runs = [_time(text) for _ in range(args.repeat)]
+        print(f"{text[:36]:<36} {statistics.median(r[0] for r in runs):>9.3f} ms  {runs[0][1]}")
+
+    safe_expr._POOL.timeout_s = args.timeout
+    first, reason = _time(HEAVY, derivative=True)
+    second, _ = _time(HEAVY, derivative=True)
+    third, _ = _time(HEAVY, derivative=True)
+    print(f"\n{'timeout (worker killed)':<36} {first:>9.1f} ms  {reason}")
+    print(f"{'second timeout (now remembered)':<36} {second:>9.1f} ms")
+    print(f"{'same input again (fail fast)':<36} {third:>9.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Sampling Benchmark: 400 uniform points vs adaptive sampling (visuals/sampling.py)
+
+For each function on [-10, 10]:
+  - evaluations spent
+  - max interpolation error against a 200k-point reference, within the plot's y-view
+  - vertical artefacts: drawn segments spanning 90% of the view (lines through poles)
+
+Usage:
+    python benchmarks/sampling.py
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import sympy as sp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from visuals.sampling import sample_function  # noqa: E402
+
+FUNCTIONS = ("x**2", "x**3 - 2*x", "sin(10*x)", "exp(x)", "sqrt(x)", "log(x)", "tan(x)", "1/x", "1/(x-2)**2")
+DOMAIN = (-10.0, 10.0)
+
+
+def _values(f, x):
+    with np.errstate(all="ignore"):
+        y = np.asarray(f(x), dtype=float) * np.ones_like(x)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def _score(x, y, x_ref, y_ref, ylim):
+    finite = np.isfinite(y)
+    in_view = np.isfinite(y_ref) & (y_ref > ylim[0]) & (y_ref < ylim[1])
+    error = np.abs(np.interp(x_ref, x[finite], y[finite]) - y_ref)[in_view]
+    with np.errstate(invalid="ignore"):
+        verticals = int(np.sum(np.abs(np.diff(y)) > 0.9 * (ylim[1] - ylim[0])))
+    return float(error.max()) if error.size else 0.0, verticals
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    x_sym = sp.symbols("x")
+    x_ref = np.linspace(*DOMAIN, 200001)
+    x_uniform = np.linspace(*DOMAIN, 400)
+    print(f"\n{'function':<12} {'evals':>6} {'adaptive err':>13} {'uniform err':>12} {'verticals a/u':>14}")
+    for text in FUNCTIONS:
+        f = sp.lambdify(x_sym, sp.sympify(text), "numpy")
+        sampled = sample_function(f, DOMAIN, budget=args.budget)
+        y_ref = _values(f, x_ref)
+        err_a, vert_a = _score(sampled.x, sampled.y, x_ref, y_ref, sampled.ylim)
+        err_u, vert_u = _score(x_uniform, _values(f, x_uniform), x_ref, y_ref, sampled.ylim)
+        print(f"{text:<12} {sampled.evaluations:>6} {err_a:>13.3g} {err_u:>12.3g} {vert_a:>7}/{vert_u}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Startup Benchmark: time until every model the API uses is loaded
+
+Each scenario runs in a fresh interpreter (nothing cached in-process) and
+performs the API's startup loads: nlp_engine, simplifier_engine,
+equivalence_engine and TextSimplifier.
+  - baseline:   the tree at --baseline-ref (before model_loader), exported with
+                git archive; every module spacy.load()s its own pipeline
+  - sequential: MODEL_PRELOAD=0, shared get_spacy() cache, models load one
+                after another on import
+  - parallel:   model_loader.preload() loads spaCy and SBERT concurrently first
+  - snapshot:   parallel, from MODEL_SNAPSHOT_DIR (skipped unless --snapshot-dir)
+
+Usage:
+    python benchmarks/startup.py --repeat 3
+    python benchmarks/startup.py --baseline-ref HEAD~5
+    python model_loader.py --save-snapshots /tmp/snapshots
+    python benchmarks/startup.py --snapshot-dir /tmp/snapshots
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Last commit before model_loader: one spacy.load() per module
+BASELINE_REF = "b8877c5"
+
+_CHILD = r"""
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, os.environ["STARTUP_ROOT"])
+import model_loader
+preload = model_loader.preload()
+import nlp_engine, simplifier_engine, equivalence_engine
+from text_simplifier import TextSimplifier
+TextSimplifier()
+print("STARTUP_RESULT " + json.dumps({
+    "total_ms": round((time.perf_counter() - start) * 1000, 1),
+    "preload": preload,
+    "loads": model_loader.load_times(),
+}))
+"""
+
+
+# The baseline tree has no model_loader: only the same imports, timed
+_BASELINE_CHILD = r"""
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, os.environ["STARTUP_ROOT"])
+import nlp_engine, simplifier_engine, equivalence_engine
+from text_simplifier import TextSimplifier
+TextSimplifier()
+print("STARTUP_RESULT " + json.dumps({
+    "total_ms": round((time.perf_counter() - start) * 1000, 1),
+    "loads": {},
+}))
+"""
+
+
+def export_tree(ref: str, directory: str) -> str:
+    """Write the files of ref to directory (git archive, no worktree state)."""
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", directory], input=archive.stdout, check=True)
+    return directory
+
+
+def run_once(env_overrides: dict, root: str = ROOT, child: str = _CHILD) -> dict:
+    env = dict(os.environ, STARTUP_ROOT=root, WARMUP="0", **env_overrides)
+    proc = subprocess.run(
+        [sys.executable, "-c", child], cwd=root, env=env, capture_output=True, text=True
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_RESULT "):
+            return json.loads(line[len("STARTUP_RESULT "):])
+    raise RuntimeError(f"startup run failed:\n{proc.stderr[-2000:]}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--snapshot-dir", default="", help="MODEL_SNAPSHOT_DIR for the snapshot scenario")
+    parser.add_argument("--baseline-ref", default=BASELINE_REF,
+                        help="git ref timed as the baseline scenario ('' to skip)")
+    parser.add_argument("--json-out", default="")
+    args = parser.parse_args(argv)
+
+    baseline_dir = tempfile.TemporaryDirectory(prefix="startup-baseline-") if args.baseline_ref else None
+    scenarios = {}
+    if baseline_dir:
+        export_tree(args.baseline_ref, baseline_dir.name)
+        scenarios["baseline"] = ({}, baseline_dir.name, _BASELINE_CHILD)
+    scenarios["sequential"] = ({"MODEL_PRELOAD": "0", "MODEL_SNAPSHOT_DIR": ""}, ROOT, _CHILD)
+    scenarios["parallel"] = ({"MODEL_PRELOAD": "1", "MODEL_SNAPSHOT_DIR": ""}, ROOT, _CHILD)
+    if args.snapshot_dir:
+        scenarios["snapshot"] = ({"MODEL_PRELOAD": "1", "MODEL_SNAPSHOT_DIR": args.snapshot_dir}, ROOT, _CHILD)
+
+    results = {}
+    for name, (env, root, child) in scenarios.items():
+        runs = [run_once(env, root, child) for _ in range(args.repeat)]
+        totals = [r["total_ms"] for r in runs]
+        results[name] = {
+            "median_ms": round(statistics.median(totals), 1),
+            "min_ms": min(totals),
+            "loads": runs[-1]["loads"],
+        }
+
+    print(f"\n{'Scenario':<12} {'median ms':>10} {'min ms':>10}  per-model load ms (last run)")
+    for name, r in results.items():
+        loads = ", ".join(f"{k} {v}" for k, v in r["loads"].items())
+        print(f"{name:<12} {r['median_ms']:>10.0f} {r['min_ms']:>10.0f}  {loads}")
+    if "baseline" in results:
+        base = results["baseline"]["median_ms"]
+        for name, r in results.items():
+            if name != "baseline" and r["median_ms"]:
+                print(f"  {name}: {base / r['median_ms']:.2f}x faster than baseline ({args.baseline_ref})")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if baseline_dir:
+        baseline_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Worksheet Benchmark: N separate text_to_image renders vs one worksheet
+
+Both sides draw the same visuals (circles of several radii, a projectile
+angle sweep, force directions); "separate" pays a figure setup and PNG
+encode per visual, "worksheet" one of each for the whole sheet.
+
+Usage:
+    python benchmarks/worksheet.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nlp_engine import text_to_image, text_to_worksheet  # noqa: E402
+
+RADII = (2, 4, 6, 8)
+ANGLES = (15, 30, 45, 60, 75)
+DIRECTIONS = ("up", "down", "left", "right")
+
+
+def separate(folder: str) -> int:
+    written = 0
+    for r in RADII:
+        text_to_image(f"Draw a circle with radius {r}", folder)
+        written += os.path.getsize(os.path.join(folder, "circle.png"))
+    for a in ANGLES:
+        text_to_image(f"Projectile launched at 20 m/s at {a} degrees", folder)
+        written += os.path.getsize(os.path.join(folder, "projectile.png"))
+    for d in DIRECTIONS:
+        text_to_image(f"A force of 10 N pushes the box {d}", folder)
+        written += os.path.getsize(os.path.join(folder, "force.png"))
+    return written
+
+
+def worksheet(folder: str) -> int:
+    path = text_to_worksheet([
+        {"type": "circle", "radius": list(RADII)},
+        {"type": "projectile", "velocity": 20, "angle": list(ANGLES)},
+        {"type": "force", "force_value": 10, "direction": list(DIRECTIONS)},
+    ], output_folder=folder)
+    return os.path.getsize(path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix="worksheet_bench_")
+    results = {}
+    for name, fn in (("separate", separate), ("worksheet", worksheet)):
+        fn(folder)  # font cache, sympy import
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            size = fn(folder)
+            times.append((time.perf_counter() - start) * 1000)
+        results[name] = (statistics.median(times), size)
+
+    print(f"\n{'':<10} {'median ms':>10} {'PNG bytes':>10}")
+    for name, (ms, size) in results.items():
+        print(f"{name:<10} {ms:>10.0f} {size:>10}")
+    print(f"\nSpeed-up: {results['separate'][0] / results['worksheet'][0]:.1f}x "
+          f"({len(RADII) + len(ANGLES) + len(DIRECTIONS)} visuals)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
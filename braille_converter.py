@@ -1,3 +1,4 @@
+from metrics import STAGE_LATENCY
 
 BRAILLE_MAP = {
     'a': '⠁', 'b': '⠃', 'c': '⠉', 'd': '⠙', 'e': '⠑', 'f': '⠋', 'g': '⠛', 'h': '⠓', 'i': '⠊', 'j': '⠚',
@@ -10,6 +11,11 @@ BRAILLE_MAP = {
 }
 
 def to_braille(text):
+    with STAGE_LATENCY.time(stage="braille"):
+        return _to_braille(text)
+
+
+def _to_braille(text):
     result = []
     is_number = False
 
@@ -13,7 +13,8 @@ class ConceptChecker:
             try:
                 # Reuse if possible, or load
                 print("Loading Spacy model for Concepts (Singleton)...")
-                _NLP_CONCEPT = spacy.load("en_core_web_sm")
+                from model_loader import get_spacy
+                _NLP_CONCEPT = get_spacy()
             except:
                 _NLP_CONCEPT = None
         self.nlp = _NLP_CONCEPT
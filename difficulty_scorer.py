@@ -1,10 +1,18 @@
 """
 Difficulty Scoring using Flesch-Kincaid and spaCy
 Internal validator for text simplification module
+
+Two engines compute the same composite score:
+  - "spacy" (default): textstat + spaCy parse (original implementation)
+  - "native": single-pass readability.text_statistics, no spaCy model
+Select with DifficultyScorer(engine=...) or the DIFFICULTY_ENGINE variable.
+Switch to "native" only after benchmarks/difficulty_parity.py (or
+test_difficulty_parity.py) passes against the installed spaCy model.
 """
 
-import textstat
-import spacy
+import os
+
+import readability
 
 class DifficultyScorer:
     """
@@ -12,17 +20,33 @@ class DifficultyScorer:
     Ensures simplified text maintains similar cognitive challenge.
     """
     
-    def __init__(self):
+    def __init__(self, engine: str = None):
+        """
+        Initialize the scoring engine.
+
+        Args:
+            engine: "native" or "spacy" (defaults to DIFFICULTY_ENGINE, else "spacy")
+        """
+        self.engine = engine or os.getenv("DIFFICULTY_ENGINE", "spacy")
+        if self.engine not in ("native", "spacy"):
+            raise ValueError(f"Unknown difficulty engine: {self.engine}")
+
+        self.nlp = None
+        if self.engine == "spacy":
+            self._load_spacy()
+        print(f"Subject: Difficulty scorer ready ({self.engine} engine)")
+
+    def _load_spacy(self):
         """Initialize with spaCy English model"""
+        from model_loader import get_spacy
         print("Loading spaCy model for difficulty analysis...")
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = get_spacy()
         except OSError:
             print("⚠️  spaCy model not found. Downloading...")
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-        print("Subject: Difficulty scorer ready")
+            self.nlp = get_spacy()
     
     def calculate_difficulty(self, text: str) -> dict:
         """
@@ -39,23 +63,15 @@ class DifficultyScorer:
                 - avg_word_length: Average characters per word
                 - avg_sentence_length: Average words per sentence
         """
-        # Flesch-Kincaid metrics
-        flesch_reading_ease = textstat.flesch_reading_ease(text)
-        flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
-        
-        # spaCy linguistic analysis
-        doc = self.nlp(text)
-        words = [token for token in doc if not token.is_punct]
-        sentences = list(doc.sents)
-        
-        num_words = len(words)
-        num_sentences = len(sentences)
-        
-        avg_word_length = (
-            sum(len(token.text) for token in words) / num_words 
-            if num_words > 0 else 0
-        )
-        avg_sentence_length = num_words / num_sentences if num_sentences > 0 else 0
+        if self.engine == "native":
+            stats = readability.text_statistics(text)
+        else:
+            stats = self._spacy_statistics(text)
+
+        flesch_reading_ease = stats['flesch_reading_ease']
+        flesch_kincaid_grade = stats['flesch_kincaid_grade']
+        avg_word_length = stats['avg_word_length']
+        avg_sentence_length = stats['avg_sentence_length']
         
         # Normalize metrics to 0-100 scale
         # Flesch Reading Ease: 100 (easy) to 0 (hard) → invert it
@@ -86,6 +102,35 @@ class DifficultyScorer:
             'avg_sentence_length': round(avg_sentence_length, 2)
         }
     
+    def _spacy_statistics(self, text: str) -> dict:
+        """Original textstat + spaCy computation (engine="spacy")"""
+        import textstat
+
+        # Flesch-Kincaid metrics
+        flesch_reading_ease = textstat.flesch_reading_ease(text)
+        flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
+        
+        # spaCy linguistic analysis
+        doc = self.nlp(text)
+        words = [token for token in doc if not token.is_punct]
+        sentences = list(doc.sents)
+        
+        num_words = len(words)
+        num_sentences = len(sentences)
+        
+        avg_word_length = (
+            sum(len(token.text) for token in words) / num_words 
+            if num_words > 0 else 0
+        )
+        avg_sentence_length = num_words / num_sentences if num_sentences > 0 else 0
+
+        return {
+            'flesch_reading_ease': flesch_reading_ease,
+            'flesch_kincaid_grade': flesch_kincaid_grade,
+            'avg_word_length': avg_word_length,
+            'avg_sentence_length': avg_sentence_length
+        }
+    
     def compute_change(self, original: str, simplified: str) -> float:
         """
         Compute percentage change in difficulty between texts.
@@ -0,0 +1,195 @@
+"""
+Persistent Embedding Store
+Append-only, memory-mapped sentence embeddings for the question bank
+
+Files (for EMBEDDING_STORE_PATH=/data/embeddings):
+  - /data/embeddings.f16   float16 matrix, one row per text, appended in place
+  - /data/embeddings.keys  16-byte BLAKE2b digest per row, same order
+  - /data/embeddings.json  model / backend / dimension the rows belong to
+
+Readers map the matrix with np.memmap(mode="r"), so several worker processes
+share the same page-cache pages instead of each holding a copy. A process
+opened with readonly=True (EMBEDDING_STORE_READONLY=1) never writes and picks
+up rows appended by the writer on its next miss.
+
+Rows are appended before their keys, so a crash can only leave an unkeyed
+row at the end of the matrix, which the next load ignores.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from metrics import CACHE_HITS, CACHE_MISSES
+
+DIGEST_SIZE = 16
+
+
+def text_key(text: str) -> bytes:
+    """Content hash used as the row key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class EmbeddingStore:
+    """
+    Append-only float16 embedding matrix with a hash -> row index.
+
+    Args:
+        path: File prefix (".f16", ".keys" and ".json" are appended)
+        dim: Embedding dimension
+        model_id: Encoder identity, e.g. "all-MiniLM-L6-v2/torch"
+        readonly: Never append (worker processes sharing a writer's store)
+    """
+
+    def __init__(self, path: str, dim: int, model_id: str, readonly: bool = False):
+        self.path = path
+        self.dim = dim
+        self.model_id = model_id
+        self.readonly = readonly
+        self.matrix_path = path + ".f16"
+        self.keys_path = path + ".keys"
+        self.meta_path = path + ".json"
+
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._keys_read = 0  # bytes of the keys file already indexed
+        self._matrix: Optional[np.memmap] = None
+        self._rows = 0
+
+        self._check_meta()
+        self._refresh()
+
+    # ---------------- loading ----------------
+
+    def _check_meta(self) -> None:
+        meta = {"model": self.model_id, "dim": self.dim, "dtype": "float16"}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                existing = json.load(f)
+            if existing != meta:
+                raise ValueError(f"Embedding store {self.path} was built for {existing}, not {meta}")
+        elif self.readonly:
+            raise FileNotFoundError(f"Embedding store {self.path} does not exist")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            open(self.matrix_path, "ab").close()
+            open(self.keys_path, "ab").close()
+
+    def _refresh(self) -> None:
+        """Index keys appended since the last refresh and remap the matrix."""
+        size = os.path.getsize(self.keys_path)
+        if size == self._keys_read and self._matrix is not None:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_read)
+            data = f.read(size - self._keys_read)
+        usable = len(data) - len(data) % DIGEST_SIZE
+        row = self._keys_read // DIGEST_SIZE
+        for offset in range(0, usable, DIGEST_SIZE):
+            self._index.setdefault(data[offset:offset + DIGEST_SIZE], row)
+            row += 1
+        self._keys_read += usable
+        self._rows = row
+        if self._rows:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode="r", shape=(self._rows, self.dim))
+
+    # ---------------- public API ----------------
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def lookup(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Stored embeddings for texts (None where missing).
+
+        Returns:
+            One float32 vector or None per text
+        """
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            if any(key not in self._index for key in keys):
+                self._refresh()
+            rows = [self._index.get(key) for key in keys]
+            matrix = self._matrix
+
+        results = []
+        for row in rows:
+            if row is None:
+                CACHE_MISSES.inc(cache="embedding_store")
+                results.append(None)
+            else:
+                CACHE_HITS.inc(cache="embedding_store")
+                results.append(np.asarray(matrix[row], dtype=np.float32))
+        return results
+
+    def add(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Append embeddings for texts not already stored (no-op when read-only).
+
+        Args:
+            texts: Texts that were encoded
+            embeddings: Matrix of shape (len(texts), dim)
+        """
+        if self.readonly or not len(texts):
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float16).reshape(len(texts), self.dim)
+
+        with self._lock, open(self.keys_path, "ab") as keys_file:
+            # Serialise writers across processes; readers never take the lock
+            fcntl.flock(keys_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                # Drop an unkeyed tail row left by an interrupted append
+                expected = self._rows * self.dim * 2
+                if os.path.getsize(self.matrix_path) != expected:
+                    os.truncate(self.matrix_path, expected)
+
+                new_keys, new_rows, seen = [], [], set()
+                for text, vector in zip(texts, embeddings):
+                    key = text_key(text)
+                    if key in self._index or key in seen:
+                        continue
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_rows.append(vector)
+                if not new_keys:
+                    return
+
+                with open(self.matrix_path, "ab") as matrix_file:
+                    matrix_file.write(np.stack(new_rows).tobytes())
+                    matrix_file.flush()
+                    os.fsync(matrix_file.fileno())
+                keys_file.write(b"".join(new_keys))
+                keys_file.flush()
+                self._refresh()
+            finally:
+                fcntl.flock(keys_file, fcntl.LOCK_UN)
+
+
+def from_env(dim: int, model_id: str) -> Optional[EmbeddingStore]:
+    """
+    Open the store configured by EMBEDDING_STORE_PATH (None when unset or unusable).
+
+    Args:
+        dim: Embedding dimension of the encoder
+        model_id: Encoder identity the rows must belong to
+    """
+    path = os.getenv("EMBEDDING_STORE_PATH")
+    if not path:
+        return None
+    readonly = os.getenv("EMBEDDING_STORE_READONLY", "0") == "1"
+    try:
+        store = EmbeddingStore(path, dim, model_id, readonly=readonly)
+        mode = "read-only" if readonly else "read-write"
+        print(f"Embedding store: {path} ({len(store)} rows, {mode})")
+        return store
+    except Exception as e:
+        print(f"⚠️  Embedding store disabled: {e}")
+        return None
@@ -0,0 +1,161 @@
+"""
+Sentence Encoder Backends
+Shared Sentence-BERT encoders for SemanticChecker and equivalence_engine
+
+Backends (SEMANTIC_BACKEND environment variable, default "torch"):
+  - "torch":     PyTorch fp32 on CPU (original behaviour)
+  - "quantized": PyTorch with nn.Linear layers dynamically quantized to int8
+  - "onnx":      ONNX Runtime via sentence-transformers' backend="onnx"
+                 (needs sentence-transformers>=3.2 and optimum[onnxruntime];
+                 SEMANTIC_ONNX_FILE picks a pre-exported file, e.g.
+                 "onnx/model_qint8_avx512_vnni.onnx")
+
+Every backend returns a SentenceTransformer, so .encode() and
+util.cos_sim keep working unchanged. Encoders are cached per
+(model, backend): SemanticChecker instances and equivalence_engine share one.
+
+encode() goes through a per-encoder MicroBatcher (microbatch.py), so
+concurrent requests share batched forward passes:
+  - ENCODE_BATCHING=0          call the encoder directly
+  - ENCODE_BATCH_WINDOW_MS     collection window (default 2)
+  - ENCODE_MAX_BATCH           texts per batch (default 32)
+  - TORCH_NUM_THREADS          intra-op threads (default min(4, CPU count))
+"""
+
+import os
+import threading
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+BACKENDS = ("torch", "quantized", "onnx")
+
+_ENCODERS: Dict[Tuple[str, str], object] = {}
+_BATCHERS: Dict[Tuple[str, str], object] = {}
+_LOCK = threading.Lock()
+_THREADS_CONFIGURED = False
+
+
+def configure_torch_threads() -> None:
+    """
+    Set PyTorch thread pools explicitly (once per process).
+
+    Encodes are serialised by the micro-batcher, so one forward pass may use
+    several intra-op threads; inter-op parallelism is not needed.
+    """
+    global _THREADS_CONFIGURED
+    if _THREADS_CONFIGURED:
+        return
+    _THREADS_CONFIGURED = True
+    try:
+        import torch
+    except ImportError:
+        return
+    threads = int(os.getenv("TORCH_NUM_THREADS", min(4, os.cpu_count() or 1)))
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before the first inter-op parallel work
+        pass
+
+
+def default_backend() -> str:
+    """Backend selected by SEMANTIC_BACKEND (falls back to "torch")."""
+    return os.getenv("SEMANTIC_BACKEND", "torch").strip().lower() or "torch"
+
+
+def load_encoder(model_name: str = DEFAULT_MODEL, backend: str = "torch"):
+    """
+    Load a fresh encoder (uncached; use get_encoder in application code).
+
+    Args:
+        model_name: HuggingFace model ID for sentence embeddings
+        backend: One of BACKENDS
+
+    Returns:
+        SentenceTransformer running on CPU with the requested backend
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown semantic backend '{backend}', expected one of {BACKENDS}")
+
+    configure_torch_threads()
+    from sentence_transformers import SentenceTransformer
+    from model_loader import snapshot_path
+
+    # Local snapshot (MODEL_SNAPSHOT_DIR) avoids Hub lookups at startup
+    source = snapshot_path("sbert", model_name) or model_name
+
+    if backend == "onnx":
+        model_kwargs = {}
+        onnx_file = os.getenv("SEMANTIC_ONNX_FILE")
+        if onnx_file:
+            model_kwargs["file_name"] = onnx_file
+        return SentenceTransformer(
+            source, device="cpu", backend="onnx", model_kwargs=model_kwargs or None
+        )
+
+    model = SentenceTransformer(source, device="cpu")
+    if backend == "quantized":
+        import torch
+        model.eval()
+        torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    return model
+
+
+def get_encoder(model_name: str = DEFAULT_MODEL, backend: str = None):
+    """
+    Shared encoder for (model_name, backend), loaded once per process.
+
+    Args:
+        model_name: HuggingFace model ID for sentence embeddings
+        backend: One of BACKENDS (defaults to SEMANTIC_BACKEND)
+
+    Returns:
+        Cached SentenceTransformer
+    """
+    backend = backend or default_backend()
+    key = (model_name, backend)
+    encoder = _ENCODERS.get(key)
+    if encoder is not None:
+        return encoder
+    with _LOCK:
+        encoder = _ENCODERS.get(key)
+        if encoder is None:
+            print(f"Loading Sentence-BERT model: {model_name} ({backend} backend)...")
+            encoder = load_encoder(model_name, backend)
+            _ENCODERS[key] = encoder
+    return encoder
+
+
+def encode(texts: Sequence[str], model_name: str = DEFAULT_MODEL, backend: str = None) -> np.ndarray:
+    """
+    Encode texts with the shared encoder, micro-batched across threads.
+
+    Returns:
+        float32 matrix, one row per text
+    """
+    backend = backend or default_backend()
+    if os.getenv("ENCODE_BATCHING", "1") == "0":
+        return np.asarray(get_encoder(model_name, backend).encode(list(texts)), dtype=np.float32)
+
+    key = (model_name, backend)
+    batcher = _BATCHERS.get(key)
+    if batcher is None:
+        from microbatch import MicroBatcher
+        model = get_encoder(model_name, backend)
+        max_batch = int(os.getenv("ENCODE_MAX_BATCH", "32"))
+        with _LOCK:
+            batcher = _BATCHERS.get(key)
+            if batcher is None:
+                batcher = MicroBatcher(
+                    lambda batch: model.encode(batch, batch_size=max_batch),
+                    max_batch=max_batch,
+                    window_ms=float(os.getenv("ENCODE_BATCH_WINDOW_MS", "2")),
+                    name=f"{model_name}/{backend}"
+                )
+                _BATCHERS[key] = batcher
+    return np.asarray(batcher.encode(texts), dtype=np.float32)
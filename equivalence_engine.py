@@ -1,12 +1,18 @@
+from metrics import STAGE_LATENCY, VALIDATIONS, VALIDATION_SKIPPED
+from tracing import span
+
 try:
-    from sentence_transformers import SentenceTransformer, util
+    from sentence_transformers import util
     import textstat
     import spacy
 
+    from encoders import get_encoder, encode
+    from model_loader import get_spacy
+
     print("Loading SentenceTransformer...")
-    model = SentenceTransformer("all-MiniLM-L6-v2")
+    model = get_encoder()
     print("Loading Spacy...")
-    nlp = spacy.load("en_core_web_sm")
+    nlp = get_spacy()
     AVAILABLE = True
 except Exception as e:
 
@@ -30,8 +36,7 @@ def semantic_similarity(text1, text2):
 
 
 
-    emb1 = model.encode(text1, convert_to_tensor=True)
-    emb2 = model.encode(text2, convert_to_tensor=True)
+    emb1, emb2 = encode([text1, text2])
     score = float(util.cos_sim(emb1, emb2))
     return round(score, 4)
 
@@ -45,49 +50,182 @@ def difficulty_score(text):
         return 0
 
 
+def _key_terms(doc):
+    return {t.lemma_ for t in doc if t.pos_ in ["NOUN", "VERB"]}
+
+
+def _overlap(key1, key2):
+    if not key1:
+        return 0.0
+
+    return round(len(key1 & key2) / len(key1), 3)
+
+
 def concept_overlap(text1, text2):
     doc1 = nlp(text1)
 
 
     doc2 = nlp(text2)
 
-    key1 = {t.lemma_ for t in doc1 if t.pos_ in ["NOUN", "VERB"]}
-    key2 = {t.lemma_ for t in doc2 if t.pos_ in ["NOUN", "VERB"]}
+    return _overlap(_key_terms(doc1), _key_terms(doc2))
 
-    if not key1:
-        return 0.0
 
-    return round(len(key1 & key2) / len(key1), 3)
+# ------------------ BATCHED METRICS ------------------
+# Same values as the pairwise metrics for lists of (original, candidate) pairs.
+# Each distinct text is scored/parsed/encoded once, all in a single call.
 
+def _distinct(texts):
+    return list(dict.fromkeys(texts))
 
-# ------------------ MAIN VALIDATION ------------------
 
-def validate(original, generated):
-    sim = float(semantic_similarity(original, generated))
-    diff = float(abs(difficulty_score(original) - difficulty_score(generated)))
-    concept = float(concept_overlap(original, generated))
-
-    return {
-        "semantic_score": sim,
-        "difficulty_change": diff,
-        "concept_overlap": concept,
-        "pass": (
-            sim >= SIMILARITY_THRESHOLD and
-            diff <= MAX_DIFFICULTY_CHANGE and
-            concept >= 0.6
-        )
-    }
+def _semantic_similarity_batch(originals, candidates):
+    scores = [0.0] * len(candidates)
+    pairs = [i for i, (a, b) in enumerate(zip(originals, candidates)) if a and b]
+    if not pairs:
+        return scores
+    texts = _distinct([originals[i] for i in pairs] + [candidates[i] for i in pairs])
+    row = {text: i for i, text in enumerate(texts)}
+    embeddings = encode(texts)
+    sims = util.pairwise_cos_sim(
+        embeddings[[row[originals[i]] for i in pairs]],
+        embeddings[[row[candidates[i]] for i in pairs]]
+    )
+    for i, score in zip(pairs, sims):
+        scores[i] = round(float(score), 4)
+    return scores
+
+
+def _difficulty_change_batch(originals, candidates):
+    scores = {text: difficulty_score(text) for text in _distinct(originals + candidates)}
+    return [abs(scores[a] - scores[b]) for a, b in zip(originals, candidates)]
 
 
-    print("\n--- EQUIVALENCE CHECK ---")
-    print("Similarity:", sim)
-    print("Difficulty Δ:", diff)
-    print("Concept overlap:", concept)
-    print("Pass:", passed)
+def _concept_overlap_batch(originals, candidates):
+    texts = _distinct(originals + candidates)
+    terms = {text: _key_terms(doc) for text, doc in zip(texts, nlp.pipe(texts))}
+    return [_overlap(terms[a], terms[b]) for a, b in zip(originals, candidates)]
 
-    return {
-        "semantic_score": sim,
-        "difficulty_change": diff,
-        "concept_overlap": concept,
-        "pass": passed
-    }
+
+# ------------------ MAIN VALIDATION ------------------
+
+def _difficulty_change(original, generated):
+    return abs(difficulty_score(original) - difficulty_score(generated))
+
+
+# Validators in increasing cost order: textstat < spaCy parse < SBERT encode.
+# (name, result key, metrics stage, compute, batch compute, passes)
+VALIDATORS = (
+    ("difficulty", "difficulty_change", "difficulty", _difficulty_change, _difficulty_change_batch,
+     lambda v: v <= MAX_DIFFICULTY_CHANGE),
+    ("concept", "concept_overlap", "concept", concept_overlap, _concept_overlap_batch,
+     lambda v: v >= MIN_CONCEPT_OVERLAP),
+    ("semantic", "semantic_score", "semantic_check", semantic_similarity, _semantic_similarity_batch,
+     lambda v: v >= SIMILARITY_THRESHOLD),
+)
+
+
+def _run_validator(validator, original, generated):
+    name, key, stage, compute = validator[:4]
+    with span(f"validate.{name}"), STAGE_LATENCY.time(stage=stage):
+        return float(compute(original, generated))
+
+
+def _run_validator_batch(validator, originals, candidates):
+    name, key, stage, _, compute_batch = validator[:5]
+    with span(f"validate.{name}", batch=len(candidates)), STAGE_LATENCY.time(stage=stage):
+        return [float(v) for v in compute_batch(originals, candidates)]
+
+
+def validate(original, generated, early_exit=True):
+    """
+    Run the equivalence checks cheapest first.
+
+    With early_exit, the first hard-threshold failure stops validation: the
+    remaining metrics are None and their names are listed in "skipped".
+    Use complete() to fill them in when they are needed later.
+    """
+    result = {"skipped": []}
+    passed = True
+
+    for validator in VALIDATORS:
+        name, key, passes = validator[0], validator[1], validator[-1]
+        if early_exit and not passed:
+            result[key] = None
+            result["skipped"].append(name)
+            VALIDATION_SKIPPED.inc(validator="equivalence_engine", metric=name)
+            continue
+        result[key] = _run_validator(validator, original, generated)
+        passed = passed and passes(result[key])
+
+    result["pass"] = passed
+    VALIDATIONS.inc(validator="equivalence_engine", result="pass" if passed else "fail")
+    return result
+
+
+def complete(original, generated, metrics):
+    """Compute metrics skipped by early exit, in place ("pass" is unchanged)."""
+    for validator in VALIDATORS:
+        name, key = validator[0], validator[1]
+        if name in metrics.get("skipped", ()):
+            metrics[key] = _run_validator(validator, original, generated)
+            metrics["skipped"].remove(name)
+    return metrics
+
+
+def validate_batch(original, candidates, early_exit=True):
+    """validate() for many candidates of one original (see validate_pairs)."""
+    return validate_pairs([original] * len(candidates), candidates, early_exit)
+
+
+def validate_pairs(originals, candidates, early_exit=True):
+    """
+    validate() for many (original, candidate) pairs, one batched call per validator.
+
+    Each validator only sees the pairs still passing (with early_exit),
+    so results match calling validate() on every pair.
+    """
+    if len(originals) != len(candidates):
+        raise ValueError("Lists must have same length")
+    results = [{"skipped": []} for _ in candidates]
+    passed = [True] * len(candidates)
+
+    for validator in VALIDATORS:
+        name, key, passes = validator[0], validator[1], validator[-1]
+        # One pass: indices to run in order, the rest are skipped
+        todo = []
+        for i in range(len(candidates)):
+            if passed[i] or not early_exit:
+                todo.append(i)
+            else:
+                results[i][key] = None
+                results[i]["skipped"].append(name)
+                VALIDATION_SKIPPED.inc(validator="equivalence_engine", metric=name)
+        if not todo:
+            continue
+        values = _run_validator_batch(
+            validator, [originals[i] for i in todo], [candidates[i] for i in todo]
+        )
+        for i, value in zip(todo, values):
+            results[i][key] = value
+            passed[i] = passed[i] and passes(value)
+
+    for result, ok in zip(results, passed):
+        result["pass"] = ok
+        VALIDATIONS.inc(validator="equivalence_engine", result="pass" if ok else "fail")
+    return results
+
+
+def complete_batch(original, candidates, metrics_list):
+    """complete() for many candidates, batching each skipped metric."""
+    for validator in VALIDATORS:
+        name, key = validator[0], validator[1]
+        todo = [i for i, m in enumerate(metrics_list) if name in m.get("skipped", ())]
+        if not todo:
+            continue
+        values = _run_validator_batch(
+            validator, [original] * len(todo), [candidates[i] for i in todo]
+        )
+        for i, value in zip(todo, values):
+            metrics_list[i][key] = value
+            metrics_list[i]["skipped"].remove(name)
+    return metrics_list
@@ -0,0 +1,222 @@
+"""
+HTTP Caching and Compression for the Flask API
+
+  - Strong ETags from a BLAKE2b hash of the file content (cached per
+    path/mtime/size, so unchanged files are not re-hashed)
+  - Conditional GET: If-None-Match -> 304 Not Modified, no body
+  - Content-addressed URLs: generated images are linked as
+    /generated_images/<name>?v=<hash>; a matching ?v= is served with
+    "Cache-Control: public, max-age=31536000, immutable". Renderers reuse
+    names like circle.png, so without ?v= the browser must revalidate.
+  - gzip (or brotli, when the optional `brotli` package is installed) for
+    HTML, JSON and other text responses the client accepts
+
+HTTP_CACHE=0 turns all of it off (plain send_from_directory, no compression).
+HTTP_HASH_CACHE_SIZE bounds the number of memoized file hashes (default 4096).
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from flask import Response, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+MIN_COMPRESS_BYTES = 512
+COMPRESSIBLE_TYPES = (
+    "text/html", "text/plain", "text/css", "text/csv",
+    "application/json", "application/javascript", "image/svg+xml",
+)
+# Same content, different encoding -> different strong ETag
+_ENCODING_SUFFIX = {"gzip": "-gz", "br": "-br"}
+
+# LRU of path -> (mtime_ns, size, digest); an overwritten file replaces its own entry
+_HASHES: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_HASHES_MAX = int(os.getenv("HTTP_HASH_CACHE_SIZE", "4096"))
+_HASH_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.getenv("HTTP_CACHE", "1") != "0"
+
+
+def _memoized_hash(path: str, stat: os.stat_result) -> Optional[str]:
+    with _HASH_LOCK:
+        entry = _HASHES.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            _HASHES.move_to_end(path)
+            return entry[2]
+    return None
+
+
+def _remember_hash(path: str, stat: os.stat_result, digest: str) -> None:
+    with _HASH_LOCK:
+        _HASHES[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        _HASHES.move_to_end(path)
+        while len(_HASHES) > _HASHES_MAX:
+            _HASHES.popitem(last=False)
+
+
+def file_hash(path: str) -> str:
+    """Content hash of a file (hex, 32 chars), memoized on (path, mtime, size)."""
+    stat = os.stat(path)
+    digest = _memoized_hash(path, stat)
+    if digest is not None:
+        return digest
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _remember_hash(path, stat, digest)
+    return digest
+
+
+def _read_with_hash(path: str) -> Tuple[bytes, str]:
+    """
+    File content and the hash of exactly those bytes.
+
+    Renderers overwrite names like circle.png in place, so the memoized hash
+    is only trusted when the file did not change while it was being read;
+    otherwise the bytes actually read are hashed.
+    """
+    with open(path, "rb") as f:
+        before = os.fstat(f.fileno())
+        data = f.read()
+        after = os.fstat(f.fileno())
+    stable = (before.st_mtime_ns, before.st_size) == (after.st_mtime_ns, after.st_size) \
+        and len(data) == after.st_size
+    digest = _memoized_hash(path, after) if stable else None
+    if digest is None:
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if stable:
+            _remember_hash(path, after, digest)
+    return data, digest
+
+
+def versioned_url(url: str, path: str) -> str:
+    """Append ?v=<content hash> so the URL can be cached as immutable."""
+    if not enabled():
+        return url
+    return f"{url}?v={file_hash(path)[:16]}"
+
+
+def _if_none_match_hits(etag: str) -> bool:
+    header = request.headers.get("If-None-Match", "")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag[2:] if tag.startswith("W/") else tag
+        tag = tag.strip('"')
+        for suffix in _ENCODING_SUFFIX.values():
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+        if tag == etag:
+            return True
+    return False
+
+
+def send_bytes_cached(data: bytes, digest: str, mimetype: str) -> Response:
+    """
+    In-memory content with a strong ETag, 304s and immutable caching.
+
+    Args:
+        data: Response body
+        digest: Content hash of data (hex); ?v= must be a prefix of it for immutable caching
+        mimetype: Content type
+    """
+    if not enabled():
+        return Response(data, mimetype=mimetype)
+    version = request.args.get("v", "")
+    cache_control = IMMUTABLE if len(version) >= 8 and digest.startswith(version) else REVALIDATE
+    response = Response(status=304) if _if_none_match_hits(digest) else Response(data, mimetype=mimetype)
+    response.headers["ETag"] = f'"{digest}"'
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def send_file_cached(directory: str, filename: str) -> Response:
+    """
+    send_from_directory with a content-hash ETag, 304s and immutable caching.
+
+    Args:
+        directory: Folder to serve from
+        filename: Requested file (path traversal is rejected with 404)
+    """
+    if not enabled():
+        return send_from_directory(directory, filename)
+
+    path = safe_join(os.path.abspath(directory), filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    digest = file_hash(path)
+    if _if_none_match_hits(digest):
+        # Body is never sent; skip reading the file
+        return send_bytes_cached(b"", digest, "application/octet-stream")
+    # ETag and body must describe the same bytes, even if the file was rewritten meanwhile
+    data, digest = _read_with_hash(path)
+    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return send_bytes_cached(data, digest, mimetype)
+
+
+def _choose_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook: gzip/brotli text responses when the client accepts it."""
+    if not enabled():
+        return response
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == "br":
+        compressed = brotli.compress(data, quality=5)
+    else:
+        compressed = gzip.compress(data, compresslevel=6)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    etag = response.headers.get("ETag")
+    if etag and etag.endswith('"'):
+        response.headers["ETag"] = etag[:-1] + _ENCODING_SUFFIX[encoding] + '"'
+    return response
+
+
+def init_app(app) -> None:
+    """Register response compression on a Flask app."""
+    app.after_request(compress_response)
@@ -0,0 +1,273 @@
+"""
+Generated-file Janitor
+Size-bounded LRU garbage collection for generated_images/ and outputs/
+
+text_to_image and the braille exporter write files on every call and nothing
+removed them. A background thread now sweeps the managed directories:
+  1. rescan: index of path -> (size, last access)
+  2. delete files not accessed for JANITOR_MAX_AGE_S
+  3. while the total is over JANITOR_MAX_BYTES, delete the least recently
+     accessed file
+
+Last access is max(atime, mtime); serving a file bumps its atime explicitly
+(noatime/relatime mounts would not), so the index is correct across
+processes, e.g. pre-fork workers serving while the master sweeps.
+
+A file being served is never deleted: pin() holds a shared flock on it for
+the lifetime of the response, and eviction only unlinks files it can lock
+exclusively without blocking. Files younger than JANITOR_MIN_AGE_S are also
+kept, so an image is not evicted between /generate and the browser's fetch.
+
+Configuration:
+  - JANITOR=0                  disable the background sweeper
+  - JANITOR_DIRS=a,b           managed directories (default generated_images,outputs)
+  - JANITOR_MAX_BYTES          quota over all managed directories (default 200 MB)
+  - JANITOR_MAX_AGE_S          maximum idle time (default 7 days, 0 = no limit)
+  - JANITOR_MIN_AGE_S          grace period for new files (default 60)
+  - JANITOR_INTERVAL_S         seconds between sweeps (default 300)
+
+Usage:
+    python janitor.py --dry-run      # report what one sweep would delete
+"""
+
+import argparse
+import fcntl
+import os
+import stat
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from metrics import JANITOR_EVICTIONS, JANITOR_BYTES
+
+DEFAULT_DIRS = ("generated_images", "outputs")
+
+
+class FileEntry(NamedTuple):
+    directory: str
+    size: int
+    last_access: float
+
+
+class Pin:
+    """Shared lock on a file while it is served; release() when the response closes."""
+
+    def __init__(self, path: str):
+        self._fd = None
+        try:
+            self._fd = os.open(path, os.O_RDONLY)
+            st = os.fstat(self._fd)
+            if not stat.S_ISREG(st.st_mode):
+                self.release()
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            # Record the access for the LRU order (mtime unchanged, so ETags stay valid)
+            os.utime(self._fd, ns=(time.time_ns(), st.st_mtime_ns))
+        except OSError:
+            # Missing file: the view returns 404; read-only mount: pin without the touch
+            pass
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # closing drops the flock
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def pin(path: str) -> Pin:
+    """Protect a file from eviction while serving it (see Pin)."""
+    return Pin(path)
+
+
+def _env_dirs() -> List[str]:
+    configured = os.getenv("JANITOR_DIRS")
+    if configured:
+        return [d.strip() for d in configured.split(",") if d.strip()]
+    return list(DEFAULT_DIRS)
+
+
+class Janitor:
+    """
+    Enforces a byte quota and a maximum idle age over a set of directories.
+
+    Args:
+        directories: Folders to manage (files directly inside them only)
+        max_bytes: Quota over all directories together; LRU files go first
+        max_age_s: Delete files not accessed for this long (0 disables)
+        min_age_s: Never delete files modified more recently than this
+        interval_s: Seconds between background sweeps
+    """
+
+    def __init__(self, directories: Sequence[str] = DEFAULT_DIRS, max_bytes: int = 200 * 1024 * 1024,
+                 max_age_s: float = 7 * 24 * 3600, min_age_s: float = 60.0, interval_s: float = 300.0):
+        self.directories = list(directories)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.min_age_s = min_age_s
+        self.interval_s = interval_s
+        self.index: Dict[str, FileEntry] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "Janitor":
+        return cls(
+            directories=_env_dirs(),
+            max_bytes=int(os.getenv("JANITOR_MAX_BYTES", str(200 * 1024 * 1024))),
+            max_age_s=float(os.getenv("JANITOR_MAX_AGE_S", str(7 * 24 * 3600))),
+            min_age_s=float(os.getenv("JANITOR_MIN_AGE_S", "60")),
+            interval_s=float(os.getenv("JANITOR_INTERVAL_S", "300")),
+        )
+
+    def scan(self) -> Dict[str, FileEntry]:
+        """Rebuild the index from the filesystem."""
+        index = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                index[entry.path] = FileEntry(directory, st.st_size, max(st.st_atime, st.st_mtime))
+        with self._lock:
+            self.index = index
+        return index
+
+    def _evict(self, path: str, now: float) -> bool:
+        """Unlink path unless it is pinned or was rewritten during the grace period."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return True
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False  # being served
+            if now - os.fstat(fd).st_mtime < self.min_age_s:
+                return False  # regenerated since the scan
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return True
+        finally:
+            os.close(fd)
+
+    def sweep(self, dry_run: bool = False) -> dict:
+        """
+        One pass: age-based eviction, then LRU eviction down to the quota.
+
+        Returns:
+            {"files", "bytes", "evicted": {"age": n, "quota": n}, "freed_bytes", "skipped_pinned"}
+        """
+        now = time.time()
+        index = self.scan()
+        evicted = {"age": 0, "quota": 0}
+        freed = 0
+        pinned = 0
+        total = sum(entry.size for entry in index.values())
+        # Oldest access first
+        order = sorted(index.items(), key=lambda item: item[1].last_access)
+        for path, entry in order:
+            idle = now - entry.last_access
+            if idle < self.min_age_s:
+                continue
+            if self.max_age_s and idle > self.max_age_s:
+                reason = "age"
+            elif total > self.max_bytes:
+                reason = "quota"
+            else:
+                continue
+            if not dry_run and not self._evict(path, now):
+                pinned += 1
+                continue
+            if not dry_run:
+                JANITOR_EVICTIONS.inc(directory=entry.directory, reason=reason)
+                with self._lock:
+                    self.index.pop(path, None)
+            evicted[reason] += 1
+            freed += entry.size
+            total -= entry.size
+
+        per_dir: Dict[str, int] = {d: 0 for d in self.directories}
+        with self._lock:
+            files = len(self.index) - (sum(evicted.values()) if dry_run else 0)
+            for entry in self.index.values():
+                per_dir[entry.directory] += entry.size
+        if not dry_run:
+            for directory, size in per_dir.items():
+                JANITOR_BYTES.set(size, directory=directory)
+        return {
+            "files": files,
+            "bytes": total,
+            "evicted": evicted,
+            "freed_bytes": freed,
+            "skipped_pinned": pinned,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = self.sweep()
+                if result["freed_bytes"]:
+                    print(f"Janitor freed {result['freed_bytes'] / 1024:.0f} KB "
+                          f"(age {result['evicted']['age']}, quota {result['evicted']['quota']}); "
+                          f"{result['bytes'] / 1024:.0f} KB in {result['files']} files")
+            except Exception as e:
+                print(f"⚠️  Janitor sweep failed: {e}")
+            self._stop.wait(self.interval_s)
+
+    def start(self) -> threading.Thread:
+        """Sweep now and then every interval_s in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="janitor", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_JANITOR: Optional[Janitor] = None
+
+
+def start_background() -> Optional[Janitor]:
+    """Start the process-wide janitor (once); None when JANITOR=0."""
+    global _JANITOR
+    if os.getenv("JANITOR", "1") == "0":
+        return None
+    if _JANITOR is None:
+        _JANITOR = Janitor.from_env()
+        _JANITOR.start()
+    return _JANITOR
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report without deleting")
+    args = parser.parse_args(argv)
+    janitor = Janitor.from_env()
+    result = janitor.sweep(dry_run=args.dry_run)
+    verb = "Would free" if args.dry_run else "Freed"
+    print(f"{verb} {result['freed_bytes'] / 1024:.0f} KB: {result['evicted']['age']} by age, "
+          f"{result['evicted']['quota']} over quota, {result['skipped_pinned']} pinned; "
+          f"{result['bytes'] / 1024:.0f} KB left")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Local Stand-in LLM Server for Offline Load Testing
+
+Implements the two APIs the simplifiers call:
+  - POST /v1/chat/completions   (chat-completion API used by InferenceClient in text_simplifier.py)
+  - POST /models/<model_id>     (text-generation API used by app/text-simplifier/text_simplifier.py)
+
+Usage:
+    python llm_stub_server.py --port 8081 --policy rule --latency lognormal:-0.7,0.5 --error-rate 0.02
+
+Then point the simplifiers at it:
+    LLM_BASE_URL=http://127.0.0.1:8081                          (text_simplifier.TextSimplifier)
+    LLM_API_URL=http://127.0.0.1:8081/models/stub               (app/text-simplifier)
+
+Latency distributions:
+    fixed:<seconds>            e.g. fixed:0.8
+    uniform:<low>,<high>       e.g. uniform:0.2,1.5
+    normal:<mean>,<std>        e.g. normal:0.8,0.2  (clipped at 0)
+    lognormal:<mu>,<sigma>     e.g. lognormal:-0.7,0.5  (of seconds)
+
+Output policies:
+    echo     return the original question unchanged
+    rule     return simplifier_engine.simplify_text(question, aggression)
+    canned   return one of the --canned responses in rotation
+
+Output length (whitespace-separated words stand in for tokens):
+    When the prompt asks for prompts.END_MARKER, the answer is followed by the
+    marker and --trailing-tokens filler words, like a model that keeps going.
+    `stop` sequences cut the output, max_tokens (max_new_tokens) truncates it
+    with finish_reason "length", and --token-latency adds a per-token delay.
+"""
+
+import argparse
+import itertools
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from flask import Flask, request, jsonify
+
+from prompts import END_MARKER
+
+_ORIGINAL_RE = re.compile(
+    r"ORIGINAL QUESTION:\s*\n(.*?)\n\s*\n(?:SIMPLIFIED QUESTION|PREVIOUS SIMPLIFIED VERSION)",
+    re.DOTALL,
+)
+
+DEFAULT_CANNED = ["Find the answer to the question using the given values."]
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Build a sampler from a latency spec such as "uniform:0.2,1.0".
+
+    Returns:
+        Zero-argument function returning a delay in seconds
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()] if params else []
+
+    if kind == "fixed":
+        delay = values[0] if values else 0.0
+        return lambda: delay
+    if kind == "uniform":
+        low, high = values
+        return lambda: random.uniform(low, high)
+    if kind == "normal":
+        mean, std = values
+        return lambda: max(0.0, random.gauss(mean, std))
+    if kind == "lognormal":
+        mu, sigma = values
+        return lambda: random.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def apply_limits(content: str, max_tokens: Optional[int], stop: Optional[List[str]]):
+    """
+    Apply stop sequences, then the token budget, to a generated text.
+
+    Returns:
+        (content, completion_tokens, finish_reason)
+    """
+    if isinstance(stop, str):
+        stop = [stop]
+    for sequence in stop or []:
+        index = content.find(sequence)
+        if index != -1:
+            content = content[:index]
+    tokens = content.split()
+    if max_tokens is not None and len(tokens) > max_tokens:
+        return " ".join(tokens[:max_tokens]), max_tokens, "length"
+    return content.strip(), len(tokens), "stop"
+
+
+def extract_question(prompt: str) -> str:
+    """Pull the original question back out of a prompts.py prompt (falls back to the whole prompt)."""
+    match = _ORIGINAL_RE.search(prompt)
+    if match:
+        return match.group(1).strip()
+    return prompt.strip()
+
+
+class StubPolicy:
+    """
+    Decides latency, failures and output text for each request.
+
+    Args:
+        policy: "echo", "rule" or "canned"
+        latency: Sampler returning seconds to sleep before answering
+        error_rate: Fraction of requests answered with error_status
+        canned: Responses used by the "canned" policy
+        aggression: simplify_text aggression for the "rule" policy
+    """
+
+    def __init__(
+        self,
+        policy: str = "echo",
+        latency: Callable[[], float] = lambda: 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        canned: Optional[List[str]] = None,
+        aggression: int = 2,
+        token_latency: float = 0.0,
+        trailing_tokens: int = 0,
+    ):
+        if policy not in ("echo", "rule", "canned"):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.policy = policy
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.aggression = aggression
+        self.token_latency = token_latency
+        self.trailing_tokens = trailing_tokens
+        self._canned = itertools.cycle(canned or DEFAULT_CANNED)
+        self._lock = threading.Lock()
+        self._simplify_text = None
+        if policy == "rule":
+            from simplifier_engine import simplify_text
+            self._simplify_text = simplify_text
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+    def respond(self, prompt: str) -> str:
+        question = extract_question(prompt)
+        if self.policy == "rule":
+            answer = self._simplify_text(question, aggression=self.aggression)
+        elif self.policy == "canned":
+            with self._lock:
+                answer = next(self._canned)
+        else:
+            answer = question
+        if END_MARKER in prompt:
+            answer = " ".join([answer, END_MARKER] + ["continued"] * self.trailing_tokens)
+        return answer
+
+    def generate(self, prompt: str, max_tokens: Optional[int], stop: Optional[List[str]]):
+        """Respond, apply stop/max_tokens and sleep for the generated tokens."""
+        content, completion_tokens, finish_reason = apply_limits(self.respond(prompt), max_tokens, stop)
+        if self.token_latency:
+            time.sleep(self.token_latency * completion_tokens)
+        return content, completion_tokens, finish_reason
+
+
+def create_app(policy: StubPolicy) -> Flask:
+    app = Flask(__name__)
+
+    def _error():
+        return jsonify({"error": "stub: injected failure"}), policy.error_status
+
+    @app.route("/health", methods=["GET"])
+    def health():
+        return jsonify({"status": "online", "policy": policy.policy}), 200
+
+    @app.route("/v1/chat/completions", methods=["POST"])
+    def chat_completions():
+        data = request.json or {}
+        time.sleep(policy.latency())
+        if policy.should_fail():
+            return _error()
+
+        messages = data.get("messages", [])
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        content, completion_tokens, finish_reason = policy.generate(
+            prompt, data.get("max_tokens"), data.get("stop")
+        )
+        prompt_tokens = len(prompt.split())
+
+        return jsonify({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": data.get("model", "stub"),
+            "system_fingerprint": "llm-stub",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+                "logprobs": None,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    @app.route("/models/<path:model_id>", methods=["POST"])
+    def text_generation(model_id):
+        data = request.json or {}
+        time.sleep(policy.latency())
+        if policy.should_fail():
+            return _error()
+
+        prompt = data.get("inputs", "")
+        parameters = data.get("parameters") or {}
+        content, _, _ = policy.generate(prompt, parameters.get("max_new_tokens"), parameters.get("stop"))
+        if parameters.get("return_full_text", True):
+            content = prompt + "\n" + content
+        return jsonify([{"generated_text": content}])
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--policy", choices=["echo", "rule", "canned"], default="echo")
+    parser.add_argument("--latency", default="fixed:0", help="latency distribution spec")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--canned", action="append", help="canned response (repeatable)")
+    parser.add_argument("--aggression", type=int, default=2, choices=[1, 2, 3],
+                        help="simplify_text aggression for the rule policy")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="extra seconds per generated token")
+    parser.add_argument("--trailing-tokens", type=int, default=0,
+                        help="filler tokens emitted after the end marker (cut by `stop`)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    policy = StubPolicy(
+        policy=args.policy,
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        canned=args.canned,
+        aggression=args.aggression,
+        token_latency=args.token_latency,
+        trailing_tokens=args.trailing_tokens,
+    )
+    print(f"Starting LLM stub server ({args.policy}, latency={args.latency}, error_rate={args.error_rate})...")
+    create_app(policy).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Traffic Replay Load Generator
+
+Replays a JSONL traffic log (see traffic_log.py) against the running API
+and reports throughput, p50/p95/p99 latency and error rate per route.
+
+Usage:
+    # Record live traffic while the API runs
+    TRAFFIC_RECORD_PATH=traffic.jsonl python app.py
+
+    # Replay it: 8 concurrent workers, open-loop Poisson arrivals at 20 req/s
+    python loadgen.py traffic.jsonl --concurrency 8 --rate 20
+
+    # Replay with the recorded inter-arrival times, twice as fast
+    python loadgen.py traffic.jsonl --replay-timing --speed 2
+
+    # Closed loop (as fast as the workers allow), 500 requests, only /simplify
+    python loadgen.py traffic.jsonl --count 500 --routes /simplify
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from traffic_log import read_records, REPLAYABLE_ROUTES
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Results:
+    """Thread-safe per-route latency and error collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, route: str, latency_ms: float, status: str, ok: bool) -> None:
+        with self._lock:
+            self.latencies[route].append(latency_ms)
+            self.statuses[route][status] += 1
+            if not ok:
+                self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            count = len(values)
+            routes[route] = {
+                "requests": count,
+                "throughput_rps": round(count / elapsed, 3) if elapsed else 0.0,
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "p99_ms": round(_percentile(values, 99), 2),
+                "errors": self.errors[route],
+                "error_rate": round(self.errors[route] / count, 4) if count else 0.0,
+                "statuses": dict(self.statuses[route]),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 3) if elapsed else 0.0,
+            "error_rate": round(total_errors / total, 4) if total else 0.0,
+            "routes": routes,
+        }
+
+
+def send(base_url: str, record: dict, timeout: float, results: Results,
+         intended: Optional[float] = None) -> None:
+    """
+    Send one recorded request and record its latency.
+
+    Args:
+        intended: perf_counter() time the request was scheduled for; latency
+            is measured from it, so time spent queued behind busy workers
+            counts (no coordinated omission). None: measure from the send.
+    """
+    route = record["route"]
+    data = None
+    headers = {}
+    if record["method"].upper() != "GET":
+        data = json.dumps(record.get("body") or {}).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    req = urllib.request.Request(base_url + route, data=data, headers=headers, method=record["method"].upper())
+
+    start = time.perf_counter() if intended is None else intended
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status, ok = str(response.status), 200 <= response.status < 400
+    except urllib.error.HTTPError as e:
+        status, ok = str(e.code), False
+    except Exception as e:
+        status, ok = type(e).__name__, False
+    results.add(route, (time.perf_counter() - start) * 1000, status, ok)
+
+
+def schedule(records: List[dict], args) -> List[Optional[float]]:
+    """Send offsets (seconds from start) for each record; None entries mean "as soon as possible"."""
+    if args.replay_timing:
+        first = records[0].get("ts", 0.0)
+        return [max(0.0, (r.get("ts", first) - first) / args.speed) for r in records]
+    if args.rate > 0:
+        offsets, t = [], 0.0
+        for _ in records:
+            offsets.append(t)
+            t += random.expovariate(args.rate)
+        return offsets
+    return [None] * len(records)
+
+
+def run(args) -> dict:
+    records = list(read_records(args.log, routes=args.routes))
+    if not records:
+        raise SystemExit(f"No replayable records for {args.routes} in {args.log}")
+    if args.count:
+        records = list(itertools.islice(itertools.cycle(records), args.count))
+
+    offsets = schedule(records, args)
+    results = Results()
+    base_url = args.url.rstrip("/")
+
+    if args.replay_timing:
+        mode = f"recorded timing x{args.speed}"
+    else:
+        mode = f"rate={args.rate} req/s" if args.rate > 0 else "closed loop"
+    print(f"Replaying {len(records)} requests against {base_url} "
+          f"(concurrency={args.concurrency}, {mode})...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for record, offset in zip(records, offsets):
+            intended = None
+            if offset is not None:
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(send, base_url, record, args.timeout, results, intended)
+    elapsed = time.perf_counter() - start
+    return results.summary(elapsed)
+
+
+def print_report(summary: dict) -> None:
+    print(f"\n{'Route':<12} {'reqs':>6} {'rps':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'err %':>7}")
+    for route, r in summary["routes"].items():
+        print(f"{route:<12} {r['requests']:>6} {r['throughput_rps']:>8.2f} {r['p50_ms']:>10.1f} "
+              f"{r['p95_ms']:>10.1f} {r['p99_ms']:>10.1f} {r['error_rate'] * 100:>6.1f}%")
+    print(f"\nTotal: {summary['requests']} requests in {summary['elapsed_s']:.1f}s "
+          f"({summary['throughput_rps']:.2f} req/s), error rate {summary['error_rate'] * 100:.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", nargs="?", default="requests.jsonl", help="JSONL traffic log to replay")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel in-flight requests")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="open-loop Poisson arrival rate in req/s (0 = closed loop)")
+    parser.add_argument("--replay-timing", action="store_true", help="use recorded inter-arrival times")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed-up factor for --replay-timing")
+    parser.add_argument("--count", type=int, default=0, help="total requests (cycles the log; 0 = once)")
+    parser.add_argument("--routes", nargs="+", default=list(REPLAYABLE_ROUTES), help="routes to replay")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for arrival times")
+    parser.add_argument("--json-out", default="", help="also write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    summary = run(args)
+    print_report(summary)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
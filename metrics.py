@@ -0,0 +1,336 @@
+"""
+Prometheus-style Metrics for the Assessment Pipeline
+Exposed in the Prometheus text format by the /metrics endpoint in app.py
+
+Kept dependency-free on purpose: a tiny in-process registry is enough for
+per-stage latency histograms, counters and gauges, and it avoids adding
+prometheus_client to requirements.txt.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (seconds) wide enough for textstat calls and LLM round-trips
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_REGISTRY: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], labelvalues: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a named metric with optional labels, registered on creation."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        _REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (attempts, passes, cache hits...)."""
+
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (queue depth, requests in flight)."""
+
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class _Timer:
+    """Context manager returned by Histogram.time()."""
+
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self._histogram = histogram
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+        return False
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram, one series per label set."""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def time(self, **labels) -> _Timer:
+        """Time a block: `with STAGE_LATENCY.time(stage="generation"): ...`"""
+        self._key(labels)
+        return _Timer(self, labels)
+
+    def mean(self, **labels) -> Optional[float]:
+        series = self._values.get(self._key(labels))
+        if not series or not series["count"]:
+            return None
+        return series["sum"] / series["count"]
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(series["counts"]), series["sum"], series["count"])
+                for key, series in self._values.items()
+            )
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    return "\n\n".join(metric.render() for metric in _REGISTRY) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# =====================================================
+# Pipeline metrics
+# =====================================================
+
+# stage: generation, semantic_check, difficulty, concept, braille
+STAGE_LATENCY = Histogram(
+    "pipeline_stage_duration_seconds",
+    "Latency of each pipeline stage in seconds.",
+    ("stage",),
+)
+
+RENDER_LATENCY = Histogram(
+    "render_duration_seconds",
+    "Latency of text_to_image per detected shape in seconds.",
+    ("shape",),
+)
+
+SIMPLIFY_ATTEMPTS = Counter(
+    "simplify_attempts_total",
+    "LLM generation attempts made by TextSimplifier.simplify.",
+)
+
+# finish_reason: stop, length (truncated by max_tokens), ...; truncation rate = length / total
+LLM_COMPLETIONS = Counter(
+    "llm_completions_total",
+    "LLM chat completions by finish reason.",
+    ("finish_reason",),
+)
+
+# outcome: passed, unresolved; strategy: feedback (get_regeneration_prompt) or resend.
+# Mean LLM calls per validated item = _sum / _count for outcome="passed".
+# Only items that reached the LLM tier: reuse and rule-tier hits (SIMPLIFY_TIER)
+# would add zero-call "passed" samples and blur feedback vs. resend
+LLM_CALLS_PER_ITEM = Histogram(
+    "simplify_llm_calls_per_item",
+    "LLM calls made by one TextSimplifier.simplify call that reached the LLM tier.",
+    ("outcome", "strategy"),
+    buckets=(0, 1, 2, 3, 4, 5),
+)
+
+# tier: reuse, rule-1, rule-2, rule-3, llm, unresolved (hit rate = tier / sum over tiers)
+SIMPLIFY_TIER = Counter(
+    "simplify_tier_total",
+    "Simplify requests resolved per generation tier.",
+    ("tier",),
+)
+
+# result: reused, no_match, rejected (matched but failed re-validation)
+REUSE_LOOKUPS = Counter(
+    "reuse_lookups_total",
+    "Nearest-neighbour reuse lookups by outcome.",
+    ("result",),
+)
+
+REUSE_LATENCY_SAVED = Counter(
+    "reuse_latency_saved_seconds_total",
+    "Estimated LLM latency avoided by reuse (mean generation latency minus reuse path time).",
+)
+
+VALIDATIONS = Counter(
+    "validations_total",
+    "Validation outcomes per validator (text_simplifier, equivalence_engine).",
+    ("validator", "result"),
+)
+
+VALIDATION_SKIPPED = Counter(
+    "validation_metrics_skipped_total",
+    "Metrics not computed because a cheaper check already failed.",
+    ("validator", "metric"),
+)
+
+CACHE_HITS = Counter(
+    "cache_hits_total",
+    "Cache hits per cache.",
+    ("cache",),
+)
+
+CACHE_MISSES = Counter(
+    "cache_misses_total",
+    "Cache misses per cache.",
+    ("cache",),
+)
+
+ENCODE_QUEUE_DEPTH = Gauge(
+    "encode_queue_depth",
+    "Encode requests waiting for the micro-batching worker.",
+    ("batcher",),
+)
+
+ENCODE_BATCH_SIZE = Histogram(
+    "encode_batch_size",
+    "Distinct texts per batched encode call.",
+    ("batcher",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+PLOT_EVALUATIONS = Histogram(
+    "plot_function_evaluations",
+    "Function evaluations per adaptively sampled curve (visuals/sampling.py).",
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096),
+)
+
+# result: ok, or the rejection reason: syntax, not_allowed, too_complex,
+# timeout, memory, invalid, busy, worker (see visuals/safe_expr.py)
+PLOT_EXPRESSIONS = Counter(
+    "plot_expressions_total",
+    "User expressions evaluated for function and derivative plots, by outcome.",
+    ("result",),
+)
+
+# reason: age (older than JANITOR_MAX_AGE_S), quota (LRU, over JANITOR_MAX_BYTES)
+JANITOR_EVICTIONS = Counter(
+    "janitor_evictions_total",
+    "Generated files deleted by the janitor.",
+    ("directory", "reason"),
+)
+
+JANITOR_BYTES = Gauge(
+    "janitor_directory_bytes",
+    "Bytes held in each janitor-managed directory after the last sweep.",
+    ("directory",),
+)
+
+QUEUE_DEPTH = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled (or waiting for a worker) per route.",
+    ("route",),
+)
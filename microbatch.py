@@ -0,0 +1,119 @@
+"""
+Micro-batching Scheduler for Sentence-BERT Inference
+
+Request threads (Flask threaded=True) submit small encode calls; one worker
+thread collects everything that arrives within a short window (or until the
+batch is full), runs a single batched encode and hands each caller its rows.
+One encode at a time also means PyTorch's intra-op threads are no longer
+oversubscribed by several concurrent encodes.
+
+The worker thread is started lazily and restarted after fork(), so the
+batcher is safe to create before a pre-fork server forks its workers.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from metrics import ENCODE_QUEUE_DEPTH, ENCODE_BATCH_SIZE
+
+
+class _Request:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Collects concurrent encode calls into batched ones.
+
+    Args:
+        encode_fn: Encodes a list of texts, returns an array with one row per text
+        max_batch: Flush once this many texts are queued
+        window_ms: Longest time the first queued request waits for company
+        name: Label for the queue-depth gauge and batch-size histogram
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], np.ndarray], max_batch: int = 32,
+                 window_ms: float = 2.0, name: str = "sbert"):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self.name = name
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        # A forked child inherits the queue objects but not the worker thread
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = deque()
+            self._cond = threading.Condition()
+            thread = threading.Thread(target=self._run, name=f"microbatch-{self.name}", daemon=True)
+            thread.start()
+            self._pid = os.getpid()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode texts as part of the next batch (blocks until its rows are ready)."""
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        self._ensure_worker()
+        request = _Request(texts)
+        with self._cond:
+            self._queue.append(request)
+            ENCODE_QUEUE_DEPTH.inc(batcher=self.name)
+            self._cond.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _collect(self) -> List[_Request]:
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            batch = [self._queue.popleft()]
+            size = len(batch[0].texts)
+            deadline = time.perf_counter() + self.window
+            while size < self.max_batch:
+                if not self._queue:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    continue
+                request = self._queue.popleft()
+                batch.append(request)
+                size += len(request.texts)
+            ENCODE_QUEUE_DEPTH.dec(len(batch), batcher=self.name)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # Identical texts across requests (e.g. the same original) are encoded once
+            texts = list(dict.fromkeys(text for request in batch for text in request.texts))
+            ENCODE_BATCH_SIZE.observe(len(texts), batcher=self.name)
+            try:
+                rows = np.asarray(self.encode_fn(texts))
+                index = {text: i for i, text in enumerate(texts)}
+                for request in batch:
+                    request.result = rows[[index[text] for text in request.texts]]
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            for request in batch:
+                request.done.set()
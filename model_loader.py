@@ -0,0 +1,161 @@
+"""
+Shared Model Loader
+One cached instance per model, concurrent preloading and optional disk snapshots
+
+Every module used to call spacy.load("en_core_web_sm") on its own (nlp_engine,
+simplifier_engine, equivalence_engine, concept_checker, DifficultyScorer).
+get_spacy() loads it once per process; encoders.get_encoder() does the same
+for Sentence-BERT. preload() starts the independent loads concurrently, so
+later imports only hit the caches.
+
+Snapshots (MODEL_SNAPSHOT_DIR, written by `python model_loader.py --save-snapshots`):
+  - <dir>/spacy/<name>.pkl    pickled spaCy pipeline (skips package lookup
+                               and per-component construction)
+  - <dir>/sbert/<name>/       SentenceTransformer.save() output (no Hub lookups)
+Only point MODEL_SNAPSHOT_DIR at a directory you trust: spaCy snapshots are pickles.
+"""
+
+import argparse
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+SPACY_MODEL = "en_core_web_sm"
+
+_SPACY: Dict[str, object] = {}
+_LOCKS: Dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+_LOAD_TIMES: Dict[str, float] = {}
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(key, threading.Lock())
+
+
+def _record(key: str, start: float) -> None:
+    _LOAD_TIMES[key] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def load_times() -> Dict[str, float]:
+    """Milliseconds spent loading each model in this process."""
+    return dict(_LOAD_TIMES)
+
+
+def snapshot_path(kind: str, name: str) -> Optional[str]:
+    """Existing snapshot for a model, or None (also None when MODEL_SNAPSHOT_DIR is unset)."""
+    root = os.getenv("MODEL_SNAPSHOT_DIR")
+    if not root:
+        return None
+    safe_name = name.replace("/", "__")
+    path = os.path.join(root, kind, safe_name + (".pkl" if kind == "spacy" else ""))
+    return path if os.path.exists(path) else None
+
+
+def get_spacy(name: str = SPACY_MODEL):
+    """
+    Shared spaCy pipeline, loaded once per process.
+
+    Raises:
+        ImportError / OSError exactly like spacy.load, so callers keep their fallbacks
+    """
+    nlp = _SPACY.get(name)
+    if nlp is not None:
+        return nlp
+    with _lock_for(f"spacy:{name}"):
+        nlp = _SPACY.get(name)
+        if nlp is None:
+            start = time.perf_counter()
+            snapshot = snapshot_path("spacy", name)
+            if snapshot:
+                with open(snapshot, "rb") as f:
+                    nlp = pickle.load(f)
+            else:
+                import spacy
+                nlp = spacy.load(name)
+            _record(f"spacy:{name}", start)
+            _SPACY[name] = nlp
+    return nlp
+
+
+def _timed_encoder(model_name: Optional[str] = None, backend: Optional[str] = None):
+    from encoders import DEFAULT_MODEL, default_backend, get_encoder
+    model_name = model_name or DEFAULT_MODEL
+    backend = backend or default_backend()
+    start = time.perf_counter()
+    encoder = get_encoder(model_name, backend)
+    _LOAD_TIMES.setdefault(f"sbert:{model_name}/{backend}", round((time.perf_counter() - start) * 1000, 1))
+    return encoder
+
+
+DEFAULT_JOBS: Dict[str, Callable[[], object]] = {
+    "spacy": get_spacy,
+    "sbert": _timed_encoder,
+}
+
+
+def preload(jobs: Optional[Dict[str, Callable[[], object]]] = None) -> Dict[str, object]:
+    """
+    Load independent models concurrently (MODEL_PRELOAD=0 disables).
+
+    Loads release the GIL for most of their time (file reads, torch/numpy
+    deserialisation), so threads overlap them well.
+
+    Returns:
+        {job name: milliseconds, or the error message if the load failed}
+    """
+    if os.getenv("MODEL_PRELOAD", "1") == "0":
+        return {}
+    jobs = jobs or DEFAULT_JOBS
+    results: Dict[str, object] = {}
+    start = time.perf_counter()
+
+    def run(name, fn):
+        job_start = time.perf_counter()
+        fn()
+        return round((time.perf_counter() - job_start) * 1000, 1)
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="preload") as pool:
+        futures = {name: pool.submit(run, name, fn) for name, fn in jobs.items()}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = f"failed: {e}"
+
+    total = round((time.perf_counter() - start) * 1000, 1)
+    timings = ", ".join(f"{name} {value} ms" if isinstance(value, float) else f"{name} {value}"
+                        for name, value in results.items())
+    print(f"Preloaded models in {total} ms ({timings})")
+    return results
+
+
+def save_snapshots(root: str, spacy_name: str = SPACY_MODEL, sbert_name: Optional[str] = None) -> None:
+    """Write spaCy and SBERT snapshots under root (see module docstring)."""
+    import spacy
+    from encoders import DEFAULT_MODEL
+    from sentence_transformers import SentenceTransformer
+
+    sbert_name = sbert_name or DEFAULT_MODEL
+    os.makedirs(os.path.join(root, "spacy"), exist_ok=True)
+    spacy_path = os.path.join(root, "spacy", spacy_name.replace("/", "__") + ".pkl")
+    with open(spacy_path, "wb") as f:
+        pickle.dump(spacy.load(spacy_name), f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Saved {spacy_path}")
+
+    sbert_path = os.path.join(root, "sbert", sbert_name.replace("/", "__"))
+    SentenceTransformer(sbert_name, device="cpu").save(sbert_path)
+    print(f"Saved {sbert_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preload models or write startup snapshots")
+    parser.add_argument("--save-snapshots", metavar="DIR", help="write snapshots to DIR")
+    args = parser.parse_args()
+    if args.save_snapshots:
+        save_snapshots(args.save_snapshots)
+    else:
+        print(preload())
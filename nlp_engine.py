@@ -3,6 +3,8 @@ try:
 except ImportError:
     spacy = None
 
+import hashlib
+import json
 import os
 import re
 
@@ -26,13 +28,20 @@ from visuals.graphs import (
 from visuals.derivative import draw_derivative
 from visuals.scenario_viz import draw_flowchart
 from visuals.general import generate_concept_card
+from visuals.worksheet import render_worksheet, expand_specs
+from visuals.sampling import split_domain
+from visuals import static_cache
+
+from metrics import RENDER_LATENCY
+from tracing import trace, span
 
 
 
 
 try:
     if spacy:
-        nlp = spacy.load("en_core_web_sm")
+        from model_loader import get_spacy
+        nlp = get_spacy()
     else:
         nlp = None
 except Exception:
@@ -96,13 +105,30 @@ def detect_shape(text):
 
 def text_to_image(text, output_folder="generated_images"):
 
-    print(f"DEBUG: text_to_image called with '{text}'")
-    
-    os.makedirs(output_folder, exist_ok=True)
-    shape = detect_shape(text)
-    numbers = extract_numbers(text)
-    
-    print(f"DEBUG: Detected shape='{shape}', numbers={numbers}")
+    with trace("text_to_image", input_chars=len(text)) as scope:
+        os.makedirs(output_folder, exist_ok=True)
+        shape = detect_shape(text)
+        numbers = extract_numbers(text)
+        scope.set(shape=shape)
+
+        print(f"DEBUG: Detected shape='{shape}', numbers={numbers}")
+
+        with span("render", shape=shape), RENDER_LATENCY.time(shape=shape or "concept_card"):
+            return _render(text, output_folder, shape, numbers)
+
+
+# Shared by _render and worksheet_spec, so the static cache serves exactly
+# the image text_to_image would draw
+def _force_direction(text):
+    t = text.lower()
+    return next((d for d in ("left", "right", "down") if d in t), "up")
+
+
+def _motion_direction(text):
+    return "left" if "left" in text.lower() else "right"
+
+
+def _render(text, output_folder, shape, numbers):
 
     if not shape:
         # UNIVERSAL FALLBACK: Generate a Concept Card
@@ -133,20 +159,12 @@ def text_to_image(text, output_folder="generated_images"):
 
     if shape == "force":
         value = numbers[0] if numbers else 10
-        direction = "up"
-
-        if "left" in text:
-            direction = "left"
-        elif "right" in text:
-            direction = "right"
-        elif "down" in text:
-            direction = "down"
-
+        direction = _force_direction(text)
         path = os.path.join(output_folder, "force.png")
         return draw_force_diagram(force_value=value, direction=direction, output_path=path)
 
     if shape == "motion":
-        direction = "left" if "left" in text else "right"
+        direction = _motion_direction(text)
         path = os.path.join(output_folder, "motion.png")
         return draw_motion_vector(direction=direction, output_path=path)
 
@@ -186,9 +204,11 @@ def text_to_image(text, output_folder="generated_images"):
         expr = text.lower()
         if "plot" in expr:
             expr = expr.split("plot")[1].strip()
+        # "plot tan(x) from -pi to pi" -> expression "tan(x)", domain (-pi, pi)
+        expr, domain = split_domain(expr)
         
         path = os.path.join(output_folder, "function_plot.png")
-        return draw_generic_function(expr, output_path=path)
+        return draw_generic_function(expr, output_path=path, domain=domain)
 
 
     # =================== DERIVATIVE ===================
@@ -199,10 +219,10 @@ def text_to_image(text, output_folder="generated_images"):
             if len(parts) < 2:
                 print("DEBUG: Could not split 'of' in derivative query")
                 return None
-            expr = parts[1].strip()
-            print(f"DEBUG: Extracting derivative for expression '{expr}'")
+            expr, domain = split_domain(parts[1].strip())
+            print(f"DEBUG: Extracting derivative for expression '{expr}' on {domain or 'default domain'}")
             path = os.path.join(output_folder, "derivative.png")
-            result = draw_derivative(expr, path)
+            result = draw_derivative(expr, path, domain=domain)
             print(f"DEBUG: draw_derivative returned '{result}'")
             return result
         except Exception as e:
@@ -269,3 +289,95 @@ def text_to_image(text, output_folder="generated_images"):
     path = os.path.join(output_folder, "concept_card.png")
     return generate_concept_card(text, output_path=path)
 
+
+
+
+# =====================================================
+# Worksheets (many visuals, one figure)
+# =====================================================
+
+def _pairs(numbers):
+    return [(numbers[i], numbers[i+1]) for i in range(0, len(numbers)-1, 2)]
+
+
+def worksheet_spec(text):
+    """
+    Map one question to a worksheet spec, with the same defaults as text_to_image.
+    Several numbers become a sweep, e.g. "circles of radius 2, 4 and 6".
+
+    Raises:
+        ValueError: the question is not a visual the worksheet can draw
+    """
+    shape = detect_shape(text)
+    numbers = extract_numbers(text)
+    t = text.lower()
+
+    if shape == "triangle":
+        return {"type": "triangle"}
+    if shape == "circle":
+        return {"type": "circle", "radius": numbers if len(numbers) > 1 else (numbers[0] if numbers else 5)}
+    if shape == "rectangle":
+        return {"type": "rectangle",
+                "length": numbers[0] if len(numbers) > 0 else 6,
+                "width": numbers[1] if len(numbers) > 1 else 4}
+    if shape == "force":
+        return {"type": "force", "force_value": numbers[0] if numbers else 10,
+                "direction": _force_direction(text)}
+    if shape == "motion":
+        return {"type": "motion", "direction": _motion_direction(text)}
+    if shape == "projectile":
+        # velocity first, then one or more launch angles
+        angles = numbers[1:] if len(numbers) > 1 else [45]
+        return {"type": "projectile",
+                "velocity": numbers[0] if numbers else 20,
+                "angle": angles if len(angles) > 1 else angles[0]}
+    if shape == "circuit":
+        return {"type": "circuit"}
+    if shape in ("function", "derivative"):
+        if shape == "function":
+            expr = t.split("plot")[1].strip() if "plot" in t else t
+        else:
+            parts = t.split("of")
+            if len(parts) < 2:
+                raise ValueError(f"no expression found in {text!r}")
+            expr = parts[1].strip()
+        expr, domain = split_domain(expr)
+        spec = {"type": shape, "expression": expr}
+        if domain:
+            spec["domain"] = list(domain)
+        return spec
+    if shape == "graph":
+        if "parabola" in t:
+            return {"type": "parabola", "points": _pairs(numbers)}
+        return {"type": "line", "points": _pairs(numbers)}
+    raise ValueError(f"no worksheet visual for {text!r}")
+
+
+def text_to_worksheet(items, output_folder="generated_images", title=None, columns=None):
+    """
+    Render questions and/or specs (see visuals/worksheet.py) into one image.
+    The file name is derived from the content, so concurrent worksheets never
+    overwrite each other.
+
+    Raises:
+        ValueError: invalid specs or unsupported questions
+    """
+    with trace("text_to_worksheet", items=len(items)) as scope:
+        specs = [worksheet_spec(item) if isinstance(item, str) else item for item in items]
+        panels = expand_specs(specs)
+        scope.set(panels=len(panels))
+        key = json.dumps([panels, title, columns], sort_keys=True, default=str)
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        os.makedirs(output_folder, exist_ok=True)
+        path = os.path.join(output_folder, f"worksheet_{digest}.png")
+        with span("render", shape="worksheet"), RENDER_LATENCY.time(shape="worksheet"):
+            return render_worksheet(specs, output_path=path, title=title, columns=columns)
+
+
+def static_visual(text):
+    """Name of the pre-rendered visual (visuals/static_cache.py) text_to_image would draw, or None."""
+    try:
+        spec = worksheet_spec(text)
+    except ValueError:
+        return None
+    return static_cache.lookup(spec)
@@ -3,6 +3,53 @@ Prompt Engineering for Controlled Text Simplification
 Ensures simplification preserves assessment validity
 """
 
+import re
+
+# Generation ends at this marker; it is also passed as the `stop` sequence
+END_MARKER = "<END>"
+
+# Output budget relative to input tokens per simplification level
+# ("significant" splits into more, shorter sentences, so it gets more room)
+LEVEL_TOKEN_FACTOR = {
+    "minimal": 1.3,
+    "moderate": 1.6,
+    "significant": 2.0
+}
+MIN_MAX_TOKENS = 48
+MAX_MAX_TOKENS = 500
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough LLM token count without loading a tokenizer.
+
+    Llama-style tokenizers produce ~1.3 tokens per English word and split
+    punctuation and symbols, so words and symbols are counted separately.
+    """
+    pieces = _TOKEN_RE.findall(text)
+    words = sum(1 for p in pieces if p[0].isalnum() or p[0] == "_")
+    return int(words * 1.3 + (len(pieces) - words) + 0.5)
+
+
+def get_max_tokens(text: str, level: str = "moderate", scale: float = 1.0) -> int:
+    """
+    Output token budget for simplifying text.
+
+    Args:
+        text: Original assessment question
+        level: "minimal", "moderate", or "significant" simplification
+        scale: Multiplier, e.g. 2.0 when a previous attempt was truncated
+
+    Returns:
+        max_tokens clamped to [MIN_MAX_TOKENS, MAX_MAX_TOKENS]
+    """
+    factor = LEVEL_TOKEN_FACTOR.get(level, LEVEL_TOKEN_FACTOR["moderate"])
+    # + a few tokens for the end marker and stray whitespace
+    budget = int(estimate_tokens(text) * factor * scale) + 8
+    return max(MIN_MAX_TOKENS, min(MAX_MAX_TOKENS, budget))
+
+
 def get_simplification_prompt(
     text: str,
     level: str = "moderate",
@@ -52,7 +99,7 @@ SIMPLIFICATION LEVEL: {level_guidance.get(level, level_guidance['moderate'])}
 ORIGINAL QUESTION:
 {text}
 
-SIMPLIFIED QUESTION (provide only the simplified text, no explanations):"""
+SIMPLIFIED QUESTION (provide only the simplified text, no explanations, then write {END_MARKER}):"""
     
     return prompt
 
@@ -109,6 +156,6 @@ PREVIOUS SIMPLIFIED VERSION (which failed):
 
 {adjustment}
 
-Provide a NEW simplified version that addresses these issues:"""
+Provide a NEW simplified version that addresses these issues, then write {END_MARKER}:"""
     
     return prompt
@@ -0,0 +1,210 @@
+"""
+Single-Pass Readability Engine
+Native replacement for the textstat + spaCy work in DifficultyScorer
+
+One call computes every input of composite_difficulty with plain regex
+scans (no spaCy pipeline, no repeated textstat passes):
+  - Flesch Reading Ease / Flesch-Kincaid Grade share one word list and one
+    syllable count, with textstat's (0.7.13) formulas, punctuation handling
+    and sentence counting; like textstat, nothing is rounded
+  - average word / sentence length mirror spaCy's non-punctuation tokens
+    and sentence boundaries
+
+Syllables come from a memoized per-word cache, looked up the way textstat
+does: NLTK's CMU Pronouncing Dictionary (corpora/cmudict) first, then Pyphen
+hyphenation. textstat downloads cmudict on first use; this module never
+downloads, so install it up front (python -m nltk.downloader cmudict) or the
+counts fall back to Pyphen alone. A vowel-group heuristic is the last resort
+when Pyphen is missing too.
+"""
+
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# ---------------- textstat-compatible text handling ----------------
+
+# textstat.remove_punctuation (apostrophes inside contractions are kept)
+_QUOTE_RE = re.compile(r"'(?![tsd]|ve|ll|re)")
+_PUNCT_RE = re.compile(r"[^\w\s']")
+
+# textstat.sentence_count
+_TEXTSTAT_SENTENCE_RE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+
+# ---------------- spaCy-like tokenization ----------------
+
+_UNITS = r"(?:km|cm|mm|m|kg|mg|g|ms|s|h|ml|l|kmh|mph|ft|in)"
+_TOKEN_RE = re.compile(
+    rf"""
+      \d+(?:[.,]\d+)*(?={_UNITS}\b)      # 6cm -> 6 | cm
+    | \d+(?:[.,]\d+)+                    # 3.5, 1,000
+    | \w+(?=n't\b)                       # do | n't
+    | n't\b
+    | '(?:s|re|ve|ll|d|m)\b              # clitics: 's 're 've 'll 'd 'm
+    | \w+(?:\^\w+)?                      # words, numbers, x^2
+    | \S                                 # any other single character
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+# spaCy-style sentence boundary: terminal punctuation (and closing quotes or
+# brackets) followed by whitespace, or a blank line. A period after an
+# abbreviation or an initial, or one followed by a lower-case word, does not
+# end the sentence; decimals (3.5) never match because no space follows.
+_SENTENCE_END_RE = re.compile(r"(\w*)([.!?]+)[\"')\]]*\s+(?=(\S?))|\n{2,}")
+_ABBREVIATIONS = frozenset("""
+    mr mrs ms dr prof sr jr st mt vs etc eg ie cf al approx ca fig figs eq eqs
+    no nos vol pp ch sec dept est min max avg deg temp jan feb mar apr jun jul
+    aug sep sept oct nov dec inc ltd co corp
+""".split())
+
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+# ---------------- syllable sources (optional dependencies) ----------------
+
+_CMU: Optional[dict] = None
+_PYPHEN = None
+_SOURCES_LOADED = False
+_SOURCES_LOCK = threading.Lock()
+
+
+def _load_sources() -> None:
+    """Load NLTK's cmudict and the Pyphen hyphenator once (both optional)."""
+    global _CMU, _PYPHEN, _SOURCES_LOADED
+    with _SOURCES_LOCK:
+        if _SOURCES_LOADED:
+            return
+        try:
+            import nltk
+            nltk.data.find("corpora/cmudict")
+            _CMU = nltk.corpus.cmudict.dict()
+        except Exception:
+            _CMU = None
+        try:
+            import pyphen
+            _PYPHEN = pyphen.Pyphen(lang="en_US")
+        except Exception:
+            _PYPHEN = None
+        _SOURCES_LOADED = True
+
+
+def _heuristic_syllables(word: str) -> int:
+    groups = _VOWEL_GROUP_RE.findall(word)
+    count = len(groups)
+    if word.endswith("e") and not word.endswith("le") and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+@lru_cache(maxsize=65536)
+def word_syllables(word: str) -> int:
+    """
+    Syllables in one lower-cased, punctuation-free word (memoized).
+
+    Args:
+        word: Word as produced by textstat's punctuation removal
+
+    Returns:
+        Syllable count (CMU stress markers, else Pyphen positions + 1)
+    """
+    if not _SOURCES_LOADED:
+        _load_sources()
+    if _CMU is not None:
+        phones = _CMU.get(word)
+        if phones:
+            return sum(1 for phone in phones[0] if phone[-1].isdigit())
+    if _PYPHEN is not None:
+        return len(_PYPHEN.positions(word)) + 1
+    return _heuristic_syllables(word)
+
+
+def syllable_cache_info():
+    """lru_cache statistics for the per-word syllable cache."""
+    return word_syllables.cache_info()
+
+
+# ---------------- helpers ----------------
+
+def split_sentences(text: str) -> List[str]:
+    """Sentence segments the way spaCy's parser usually bounds them."""
+    segments = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        if match.group(2) == ".":
+            word, following = match.group(1).lower(), match.group(3)
+            if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()) or following.islower():
+                continue
+            # e.g. / i.e. end in "g." / "e." after another period
+            if text[max(0, match.start() - 2):match.start()].endswith("."):
+                continue
+        segments.append(text[start:match.end()])
+        start = match.end()
+    segments.append(text[start:])
+    return segments
+
+
+def _remove_punctuation(text: str) -> str:
+    return _PUNCT_RE.sub("", _QUOTE_RE.sub("", text))
+
+
+def _lexicon(text: str) -> List[str]:
+    return _remove_punctuation(text).split()
+
+
+def _is_punct(token: str) -> bool:
+    return len(token) == 1 and unicodedata.category(token).startswith("P")
+
+
+# ---------------- public API ----------------
+
+def text_statistics(text: str) -> Dict[str, float]:
+    """
+    Compute every difficulty input in one pass over the text.
+
+    Returns:
+        Dictionary with flesch_reading_ease, flesch_kincaid_grade,
+        avg_word_length and avg_sentence_length (all unrounded)
+    """
+    # textstat side: words with punctuation removed, syllables from the cache
+    words = _lexicon(text)
+    num_lexicon = len(words)
+    syllables = sum(word_syllables(word.lower()) for word in words)
+
+    sentences = _TEXTSTAT_SENTENCE_RE.findall(text)
+    ignored = sum(1 for sentence in sentences if len(_lexicon(sentence)) <= 2)
+    num_textstat_sentences = max(1, len(sentences) - ignored) if text else 0
+
+    asl = num_lexicon / num_textstat_sentences if num_textstat_sentences else 0.0
+    asw = syllables / num_lexicon if num_lexicon else 0.0
+
+    if asl == 0 or asw == 0:
+        flesch_reading_ease = flesch_kincaid_grade = 0.0
+    else:
+        flesch_reading_ease = 206.835 - 1.015 * asl - 84.6 * asw
+        flesch_kincaid_grade = 0.39 * asl + 11.8 * asw - 15.59
+
+    # spaCy side: non-punctuation tokens and sentence boundaries
+    num_words = 0
+    total_chars = 0
+    num_sentences = 0
+    for segment in split_sentences(text):
+        segment_words = [tok for tok in _TOKEN_RE.findall(segment) if not _is_punct(tok)]
+        if not segment_words:
+            continue
+        num_sentences += 1
+        num_words += len(segment_words)
+        total_chars += sum(len(tok) for tok in segment_words)
+
+    return {
+        "flesch_reading_ease": flesch_reading_ease,
+        "flesch_kincaid_grade": flesch_kincaid_grade,
+        "avg_word_length": total_chars / num_words if num_words > 0 else 0,
+        "avg_sentence_length": num_words / num_sentences if num_sentences > 0 else 0,
+    }
+
+
+def flesch_reading_ease(text: str) -> float:
+    """Drop-in for textstat.flesch_reading_ease."""
+    return text_statistics(text)["flesch_reading_ease"]
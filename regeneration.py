@@ -1,54 +1,102 @@
-from equivalence_engine import validate
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-MAX_ATTEMPTS = 3
+from equivalence_engine import validate_batch, complete_batch
+from tracing import trace, span
 
-def regenerate(original_text, generator_fn):
-    best_output = None
-    best_score = 0
-    last_metrics = None
+# Candidates requested from generator_fn per regenerate() call (run concurrently)
+MAX_ATTEMPTS = max(1, int(os.getenv("REGEN_CANDIDATES", "3")))
 
-    print("\n🔁 Starting Regeneration Loop")
+def regenerate(original_text, generator_fn, n_candidates=MAX_ATTEMPTS):
+    n_candidates = max(1, int(n_candidates))
+    with trace("regenerate", input_chars=len(original_text), candidates=n_candidates):
+        return _regenerate(original_text, generator_fn, n_candidates)
+
+
+def _safe_metrics(metrics):
+    # ✅ CONVERT NUMPY → PYTHON FLOATS (skipped metrics stay None)
+    def _num(value):
+        return None if value is None else float(value)
 
-    for attempt in range(1, MAX_ATTEMPTS + 1):
-        print(f"\nAttempt {attempt}")
+    return {
+        "semantic_score": _num(metrics["semantic_score"]),
+        "difficulty_change": _num(metrics["difficulty_change"]),
+        "concept_overlap": _num(metrics["concept_overlap"]),
+        "pass": bool(metrics["pass"]),
+        "skipped": list(metrics.get("skipped", []))
+    }
 
-        generated = original_text + " in simple words"
 
-        metrics = validate(original_text, generated)
+def _generate_candidates(original_text, generator_fn, n_candidates):
+    """Call generator_fn n_candidates times concurrently; failed calls are dropped."""
+    with span("generate_candidates", n=n_candidates), \
+            ThreadPoolExecutor(max_workers=n_candidates) as pool:
+        # Each worker runs in a copy of the caller's context so spans join this trace
+        futures = [
+            pool.submit(contextvars.copy_context().run, generator_fn, original_text)
+            for _ in range(n_candidates)
+        ]
+        outputs = []
+        for future in futures:
+            try:
+                outputs.append(future.result())
+            except Exception as e:
+                print(f"⚠ Candidate generation failed: {e}")
+    return outputs
 
-        # ✅ CONVERT NUMPY → PYTHON FLOATS
-        safe_metrics = {
-            "semantic_score": float(metrics["semantic_score"]),
-            "difficulty_change": float(metrics["difficulty_change"]),
-            "concept_overlap": float(metrics["concept_overlap"]),
-            "pass": bool(metrics["pass"])
-        }
 
-        print("Similarity:", safe_metrics["semantic_score"])
-        print("Difficulty Δ:", safe_metrics["difficulty_change"])
-        print("Concept overlap:", safe_metrics["concept_overlap"])
+def _unique(outputs):
+    """Drop empty and duplicate candidates, keeping first-seen order."""
+    seen = set()
+    unique = []
+    for output in outputs:
+        if not output:
+            continue
+        key = output.strip()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(output)
+    return unique
+
+
+def _regenerate(original_text, generator_fn, n_candidates):
+    print("\n🔁 Starting Regeneration Loop")
+
+    outputs = _generate_candidates(original_text, generator_fn, n_candidates)
+    candidates = _unique(outputs)
+    print(f"Generated {len(outputs)} candidates ({len(candidates)} unique)")
+
+    if not candidates:
+        return {
+            "output": None,
+            "validated": False,
+            "attempts": n_candidates,
+            "metrics": None
+        }
 
-        if safe_metrics["pass"]:
-            print("✅ Validation Passed")
-            return {
-                "output": generated,
-                "validated": True,
-                "attempts": attempt,
-                "metrics": safe_metrics
-            }
+    metrics_list = validate_batch(original_text, candidates)
 
-        if safe_metrics["semantic_score"] > best_score:
-            best_score = safe_metrics["semantic_score"]
-            best_output = generated
-            last_metrics = safe_metrics
+    passing = [i for i, metrics in enumerate(metrics_list) if metrics["pass"]]
+    if passing:
+        print("✅ Validation Passed")
+    else:
+        print("\n⚠ No candidate passed. Returning best result.")
+        # Best candidate is chosen by semantic score, so fill in any skipped metrics now
+        complete_batch(original_text, candidates, metrics_list)
 
-        print("❌ Validation failed. Retrying...")
+    pool = passing or range(len(candidates))
+    best = max(pool, key=lambda i: metrics_list[i]["semantic_score"])
+    safe_metrics = _safe_metrics(metrics_list[best])
 
-    print("\n⚠ Max attempts reached. Returning best result.")
+    print("Similarity:", safe_metrics["semantic_score"])
+    print("Difficulty Δ:", safe_metrics["difficulty_change"])
+    print("Concept overlap:", safe_metrics["concept_overlap"])
 
     return {
-        "output": best_output,
-        "validated": False,
-        "attempts": MAX_ATTEMPTS,
-        "metrics": last_metrics
+        "output": candidates[best],
+        "validated": bool(passing),
+        "attempts": n_candidates,
+        "metrics": safe_metrics
     }
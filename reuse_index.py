@@ -0,0 +1,225 @@
+"""
+Nearest-Neighbour Reuse of Validated Simplifications
+
+Keeps the embeddings of originals whose simplification passed validation.
+A new question reuses a stored simplification only when the two differ in
+nothing but their numbers: the word template (lowercased tokens with every
+number masked) must match exactly, so "area" vs "circumference" or one name
+for another is never reused. The numbers are then re-substituted (via
+nlp_engine.extract_numbers), and the caller re-validates the adapted text.
+The embedding similarity ranks the matches and guards the threshold.
+
+Configuration:
+  - REUSE_INDEX=1          enable reuse (off by default)
+  - REUSE_THRESHOLD        minimum cosine similarity (default 0.9)
+  - REUSE_INDEX_PATH       optional JSONL file the index is persisted to
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.9
+
+# Same pattern as nlp_engine.extract_numbers, used to locate numbers in place
+_NUMBER_RE = re.compile(r"[-+]?\d*\.\d+|\d+")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+INITIAL_CAPACITY = 64
+
+
+def template(text: str) -> Tuple[str, ...]:
+    """Lowercased tokens of text with every number replaced by '#'."""
+    return tuple(_TOKEN_RE.findall(_NUMBER_RE.sub(" # ", text.lower())))
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def adapt_numbers(source_original: str, source_simplified: str, new_original: str) -> Optional[str]:
+    """
+    Re-substitute numbers so a stored simplification fits a new question.
+
+    The stored simplification must carry the source question's numbers as
+    digits, in the same order and count; the i-th of them is replaced by the
+    new question's i-th number. A simplification that spelled a number out,
+    dropped it or reordered it cannot be adapted safely (re-validation does
+    not check quantities), so it is a miss. Identical numbers need no
+    substitution and always fit.
+
+    Args:
+        source_original: Question the stored simplification was made for
+        source_simplified: Its validated simplification
+        new_original: Incoming question
+
+    Returns:
+        Adapted simplification, or None if the numbers cannot be mapped
+    """
+    from nlp_engine import extract_numbers
+
+    old_numbers = extract_numbers(source_original)
+    new_numbers = extract_numbers(new_original)
+    if old_numbers == new_numbers:
+        return source_simplified
+    if len(old_numbers) != len(new_numbers) or extract_numbers(source_simplified) != old_numbers:
+        return None
+
+    replacements = iter(new_numbers)
+    return _NUMBER_RE.sub(lambda match: _format_number(next(replacements)), source_simplified)
+
+
+class _Bucket:
+    """Unit vectors in a buffer grown by doubling, plus their entries and templates."""
+
+    __slots__ = ("vectors", "size", "entries", "templates")
+
+    def __init__(self, dim: int):
+        self.vectors = np.empty((INITIAL_CAPACITY, dim), dtype=np.float32)
+        self.size = 0
+        self.entries: List[Tuple[str, str]] = []
+        self.templates: Dict[Tuple[str, ...], List[int]] = {}
+
+    def append(self, vector: np.ndarray, original: str, simplified: str) -> None:
+        if self.size == len(self.vectors):
+            grown = np.empty((2 * len(self.vectors), self.vectors.shape[1]), dtype=np.float32)
+            grown[:self.size] = self.vectors[:self.size]
+            self.vectors = grown
+        self.vectors[self.size] = vector
+        self.templates.setdefault(template(original), []).append(self.size)
+        self.entries.append((original, simplified))
+        self.size += 1
+
+
+class ReuseIndex:
+    """
+    Cosine nearest-neighbour index over validated originals.
+
+    Entries are bucketed by (simplification_level, preserve_math) so a
+    "minimal" simplification is never reused for a "significant" request.
+
+    Args:
+        encode: Function mapping a list of texts to an embedding matrix
+        threshold: Minimum cosine similarity for a reuse candidate
+        path: Optional JSONL file to load from and append to
+    """
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], threshold: float = DEFAULT_THRESHOLD,
+                 path: Optional[str] = None):
+        self.encode = encode
+        self.threshold = threshold
+        self.path = path
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, bool], _Bucket] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self) -> int:
+        return sum(bucket.size for bucket in self._buckets.values())
+
+    @staticmethod
+    def _normalise(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _bucket(self, key: Tuple[str, bool], dim: int) -> _Bucket:
+        if key not in self._buckets:
+            self._buckets[key] = _Bucket(dim)
+        return self._buckets[key]
+
+    def _load(self, path: str) -> None:
+        grouped: Dict[Tuple[str, bool], List[Tuple[str, str]]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = (entry["level"], bool(entry["preserve_math"]))
+                    grouped.setdefault(key, []).append((entry["original"], entry["simplified"]))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        for key, entries in grouped.items():
+            vectors = self._normalise(self.encode([original for original, _ in entries]))
+            bucket = self._bucket(key, vectors.shape[1])
+            for vector, (original, simplified) in zip(vectors, entries):
+                bucket.append(vector, original, simplified)
+        print(f"Reuse index: loaded {len(self)} validated simplifications from {path}")
+
+    def has_candidates(self, original: str, level: str, preserve_math: bool) -> bool:
+        """True if a stored question has the same template (so encoding original is worth it)."""
+        bucket = self._buckets.get((level, bool(preserve_math)))
+        return bucket is not None and template(original) in bucket.templates
+
+    def add(self, original: str, simplified: str, level: str, preserve_math: bool,
+            vector: Optional[np.ndarray] = None) -> None:
+        """
+        Record a simplification that passed validation.
+
+        Args:
+            vector: Embedding of original, if already computed
+        """
+        if vector is None:
+            vector = self.encode([original])[0]
+        vector = self._normalise(vector).reshape(-1)
+        key = (level, bool(preserve_math))
+        with self._lock:
+            bucket = self._bucket(key, vector.shape[0])
+            if any(bucket.entries[row][0] == original for row in bucket.templates.get(template(original), ())):
+                return
+            bucket.append(vector, original, simplified)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({
+                        "original": original,
+                        "simplified": simplified,
+                        "level": level,
+                        "preserve_math": bool(preserve_math)
+                    }, ensure_ascii=False) + "\n")
+
+    def query(self, original: str, level: str, preserve_math: bool,
+              vector: Optional[np.ndarray] = None) -> Optional[Dict[str, object]]:
+        """
+        Find a reusable simplification for original.
+
+        Only stored questions with the same template are considered.
+
+        Returns:
+            Dictionary with simplified_text (numbers adapted), similarity and
+            source, or None when nothing is close enough or adaptable
+        """
+        with self._lock:
+            bucket = self._buckets.get((level, bool(preserve_math)))
+            rows = list(bucket.templates.get(template(original), ())) if bucket else []
+            if not rows:
+                return None
+            vectors = bucket.vectors[rows]
+            entries = [bucket.entries[row] for row in rows]
+        if vector is None:
+            vector = self.encode([original])[0]
+        similarities = vectors @ self._normalise(vector).reshape(-1)
+
+        # Nearest first; fall through to the next neighbour if numbers don't map
+        for row in np.argsort(-similarities)[:3]:
+            similarity = float(similarities[row])
+            if similarity < self.threshold:
+                break
+            source_original, source_simplified = entries[row]
+            adapted = adapt_numbers(source_original, source_simplified, original)
+            if adapted:
+                return {
+                    "simplified_text": adapted,
+                    "similarity": similarity,
+                    "source": source_original
+                }
+        return None
+
+
+def from_env(encode: Callable[[List[str]], np.ndarray]) -> Optional[ReuseIndex]:
+    """Build the index configured by REUSE_INDEX / REUSE_THRESHOLD / REUSE_INDEX_PATH."""
+    if os.getenv("REUSE_INDEX", "0") != "1":
+        return None
+    threshold = float(os.getenv("REUSE_THRESHOLD", DEFAULT_THRESHOLD))
+    return ReuseIndex(encode, threshold=threshold, path=os.getenv("REUSE_INDEX_PATH") or None)
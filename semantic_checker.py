@@ -3,26 +3,72 @@ Semantic Similarity Checker using Sentence-BERT
 Internal validator for text simplification module
 """
 
-from sentence_transformers import SentenceTransformer
+from typing import Sequence, Union
+
 import numpy as np
 
+import embedding_store
+import encoders
+from encoders import DEFAULT_MODEL, default_backend, get_encoder
+
 class SemanticChecker:
     """
     Validates that simplified text preserves original meaning.
     Uses Sentence-BERT for semantic similarity computation.
     """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = DEFAULT_MODEL, backend: str = None):
         """
         Initialize with Sentence-BERT model.
         
         Args:
             model_name: HuggingFace model ID for sentence embeddings
+            backend: "torch", "quantized" or "onnx" (defaults to SEMANTIC_BACKEND)
         """
-        print(f"Loading Sentence-BERT model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.backend = backend or default_backend()
+        self.model = get_encoder(model_name, self.backend)
+        # Optional on-disk cache of question-bank embeddings (EMBEDDING_STORE_PATH)
+        self.store = embedding_store.from_env(
+            self.model.get_sentence_embedding_dimension(), f"{model_name}/{self.backend}"
+        )
         print("Subject: Semantic checker ready")
     
+    def encode(self, texts: Sequence[str], persist: Union[bool, Sequence[bool]] = True) -> np.ndarray:
+        """
+        Embed texts, reusing vectors from the embedding store when configured.
+        
+        Args:
+            texts: Texts to embed
+            persist: Whether newly encoded texts are added to the store
+                     (one flag for all texts, or one per text)
+            
+        Returns:
+            float32 matrix of shape (len(texts), dim)
+        """
+        texts = list(texts)
+        if self.store is None:
+            return self._encode(texts)
+
+        if isinstance(persist, bool):
+            persist = [persist] * len(texts)
+        vectors = self.store.lookup(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = self._encode([texts[i] for i in missing])
+            # Round to float16 so a text scores the same whether or not it was stored
+            encoded = np.asarray(encoded, dtype=np.float16).astype(np.float32)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+            kept = [(texts[i], vector) for i, vector in zip(missing, encoded) if persist[i]]
+            if kept:
+                self.store.add([t for t, _ in kept], np.stack([v for _, v in kept]))
+        return np.stack(vectors)
+    
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Encoder call shared with other threads' requests (micro-batched)"""
+        return encoders.encode(texts, self.model_name, self.backend)
+    
     def check_similarity(self, text1: str, text2: str) -> float:
         """
         Compute cosine similarity between two texts.
@@ -34,8 +80,8 @@ class SemanticChecker:
         Returns:
             Similarity score between 0 and 1 (higher = more similar)
         """
-        # Generate embeddings
-        embeddings = self.model.encode([text1, text2])
+        # Generate embeddings (only the original is worth persisting)
+        embeddings = self.encode([text1, text2], persist=[True, False])
         
         # Compute cosine similarity
         similarity = np.dot(embeddings[0], embeddings[1]) / (
@@ -58,8 +104,17 @@ class SemanticChecker:
         if len(original_texts) != len(simplified_texts):
             raise ValueError("Lists must have same length")
         
-        scores = []
-        for orig, simp in zip(original_texts, simplified_texts):
-            scores.append(self.check_similarity(orig, simp))
+        if not original_texts:
+            return []
+        
+        # One encode call for every text; originals are persisted
+        texts = list(original_texts) + list(simplified_texts)
+        persist = [True] * len(original_texts) + [False] * len(simplified_texts)
+        embeddings = self.encode(texts, persist=persist)
+        originals = embeddings[:len(original_texts)]
+        simplified = embeddings[len(original_texts):]
         
-        return scores
+        similarities = np.sum(originals * simplified, axis=1) / (
+            np.linalg.norm(originals, axis=1) * np.linalg.norm(simplified, axis=1)
+        )
+        return [float(score) for score in similarities]
@@ -0,0 +1,240 @@
+"""
+Pre-fork Production Server
+Loads every model once in a master process, then forks N workers
+
+The master imports app.py (SBERT, spaCy, TextSimplifier...), runs a full
+garbage collection and gc.freeze()s everything it loaded, then forks.
+Workers share the model weights copy-on-write: frozen objects are never
+visited by the collector, so GC passes in the workers do not write to (and
+copy) the pages holding them. Tensor storage is not made of Python objects,
+so it stays shared whatever the workers do.
+
+All workers accept() on one listening socket created by the master. Each
+worker runs its own warm-up (PyTorch thread pools are not fork-safe once
+used, so no inference runs in the master) and its own micro-batcher. The
+generated-file janitor runs once, in the master.
+
+On SIGTERM (or Ctrl-C on the master) a worker stops accepting, lets the
+requests it is already serving finish for up to --graceful-timeout seconds,
+then exits; connections it has not accepted stay queued for the others.
+
+Usage:
+    python serve_prefork.py --workers 4 --port 5000
+    python serve_prefork.py --workers 2 --report-interval 30   # USS table every 30 s
+
+The master prints per-worker RSS / PSS / USS (unique set size = memory that
+would be freed if that worker exited) from /proc/<pid>/smaps_rollup.
+"""
+
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+_SMAPS_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def memory_usage(pid="self") -> Optional[Dict[str, int]]:
+    """
+    RSS, PSS and USS in bytes for a process (Linux only).
+
+    Returns:
+        {"rss": ..., "pss": ..., "uss": ...} or None if smaps_rollup is unavailable
+    """
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in _SMAPS_FIELDS:
+                    values[key] = int(rest.split()[0]) * 1024
+    except OSError:
+        return None
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def _mb(value: int) -> str:
+    return f"{value / (1024 * 1024):8.1f}"
+
+
+def report_memory(workers: Dict[int, int]) -> None:
+    print(f"\n{'worker':<8} {'pid':>8} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9}")
+    master = memory_usage()
+    if master:
+        print(f"{'master':<8} {os.getpid():>8} {_mb(master['rss'])} {_mb(master['pss'])} {_mb(master['uss'])}")
+    for pid, index in sorted(workers.items(), key=lambda item: item[1]):
+        usage = memory_usage(pid)
+        if usage:
+            print(f"{index:<8} {pid:>8} {_mb(usage['rss'])} {_mb(usage['pss'])} {_mb(usage['uss'])}")
+    sys.stdout.flush()
+
+
+def create_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class _InFlight:
+    """Count of connections a worker is serving, so shutdown can wait for them."""
+
+    def __init__(self):
+        self.count = 0
+        self._cond = threading.Condition()
+
+    def enter(self) -> None:
+        with self._cond:
+            self.count += 1
+
+    def leave(self) -> None:
+        with self._cond:
+            self.count -= 1
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.count == 0, timeout=timeout)
+
+
+def run_worker(index: int, sock: socket.socket, host: str, port: int, graceful_timeout: float = 30.0) -> None:
+    """Child process: warm up, then serve requests from the shared socket until SIGTERM."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    import app as app_module
+    import warmup
+
+    gc.enable()
+    random.seed()  # forked children would otherwise share the master's random state
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    in_flight = _InFlight()
+
+    class CountingHandler(WSGIRequestHandler):
+        def handle(self):
+            in_flight.enter()
+            try:
+                super().handle()
+            finally:
+                in_flight.leave()
+
+    warmup.start_background(app_module._GLOBAL_SIMPLIFIER)
+    server = make_server(host, port, app_module.app, threaded=True, fd=sock.fileno(),
+                         request_handler=CountingHandler)
+
+    def terminate(signum, frame):
+        # shutdown() waits for serve_forever() to return, which runs in this
+        # (the signal-handling) thread: stop it from another thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, terminate)
+    print(f"Worker {index} (pid {os.getpid()}) serving on {host}:{port}")
+    sys.stdout.flush()
+    server.serve_forever()
+
+    # No longer accepting; queued connections go to the remaining workers
+    server.socket.close()
+    if in_flight.count:
+        print(f"Worker {index} (pid {os.getpid()}) draining {in_flight.count} in-flight request(s)")
+        sys.stdout.flush()
+    if not in_flight.wait_idle(graceful_timeout):
+        print(f"⚠️  Worker {index} exiting with {in_flight.count} request(s) still running "
+              f"after {graceful_timeout:g}s")
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", "2")))
+    parser.add_argument("--backlog", type=int, default=128)
+    parser.add_argument("--report-interval", type=float, default=60.0,
+                        help="seconds between per-worker memory reports (0 = only at startup)")
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("GRACEFUL_TIMEOUT_S", "30")),
+                        help="seconds a stopping worker waits for in-flight requests")
+    args = parser.parse_args(argv)
+
+    # Objects allocated while loading go straight to the permanent generation
+    gc.disable()
+    os.environ["WARMUP_DEFERRED"] = "1"
+    # Each worker runs its own micro-batcher; split the cores between them
+    os.environ.setdefault("TORCH_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+
+    start = time.perf_counter()
+    import app  # noqa: F401  (loads every model in the master)
+    gc.collect()
+    gc.freeze()
+    print(f"Master (pid {os.getpid()}) loaded models in {time.perf_counter() - start:.1f}s; "
+          f"{gc.get_freeze_count()} objects frozen")
+
+    sock = create_socket(args.host, args.port, args.backlog)
+    workers: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(index, sock, args.host, args.port, args.graceful_timeout)
+            finally:
+                os._exit(1)
+        workers[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(args.workers):
+        spawn(index)
+    # One janitor for all workers, started after fork; workers pin files with flock
+    import janitor
+    janitor.start_background()
+
+    next_report = time.monotonic() + min(args.report_interval or 10.0, 10.0)
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            index = workers.pop(pid, None)
+            if index is not None and not stopping:
+                print(f"⚠️  Worker {index} (pid {pid}) exited with status {status}; restarting")
+                spawn(index)
+            continue
+        if not stopping and time.monotonic() >= next_report:
+            report_memory(workers)
+            if args.report_interval <= 0:
+                next_report = float("inf")
+            else:
+                next_report = time.monotonic() + args.report_interval
+        time.sleep(0.2)
+
+    sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,10 @@
 import spacy
 import re
 
-# Load Spacy
+# Load Spacy (shared instance, see model_loader.py)
 try:
-    nlp = spacy.load("en_core_web_sm")
+    from model_loader import get_spacy
+    nlp = get_spacy()
 except:
     nlp = None
 
@@ -0,0 +1,120 @@
+"""
+Tests for the native difficulty engine (readability.py)
+Sentence splitting, Flesch parity with textstat on the benchmark corpus, and
+parity with the spaCy engine when spaCy, en_core_web_sm and textstat's
+cmudict data are installed.
+Usage: python -m pytest test_difficulty_parity.py  (or python test_difficulty_parity.py)
+"""
+
+import contextlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import readability
+from difficulty_scorer import DifficultyScorer
+
+# benchmarks/difficulty_parity.py DEFAULT_TOLERANCE
+TOLERANCE = 2.0
+
+EDGE_CASES = [
+    "Mr Smith buys 3.5 kg of apples at the market and pays 12 dollars for the whole bag.",
+    "Mr. Smith buys 3.5 kg of apples at the market and pays 12 dollars for the whole bag.",
+    "Dr. Watson measured approx. 4.2 m, i.e. the length of the ramp. Find its slope.",
+    "A car travels 2.5 km in 3.75 minutes. What is its speed in km/h?",
+]
+
+
+def test_abbreviations_do_not_split():
+    assert readability.split_sentences(EDGE_CASES[2]) == [
+        "Dr. Watson measured approx. 4.2 m, i.e. the length of the ramp. ",
+        "Find its slope.",
+    ]
+
+
+def test_decimals_do_not_split():
+    assert len(readability.split_sentences(EDGE_CASES[3])) == 2
+
+
+def test_abbreviation_period_does_not_change_score():
+    scorer = DifficultyScorer(engine="native")
+    without_period = scorer.calculate_difficulty(EDGE_CASES[0])
+    with_period = scorer.calculate_difficulty(EDGE_CASES[1])
+    assert with_period["avg_sentence_length"] == without_period["avg_sentence_length"]
+    assert abs(with_period["composite_difficulty"] - without_period["composite_difficulty"]) <= TOLERANCE
+
+
+@contextlib.contextmanager
+def _same_syllable_data():
+    """
+    Give textstat and readability the same syllable source.
+
+    Without NLTK's cmudict installed textstat would try to download it, so
+    both engines are pointed at Pyphen alone; with it, both use it as is.
+    """
+    from textstat.backend.counts import _count_syllables
+    from textstat.backend.metrics import (
+        _flesch_kincaid_grade, _flesch_reading_ease, _syllables_per_word,
+    )
+    cached = (_count_syllables.count_syllables, _syllables_per_word.syllables_per_word,
+              _flesch_reading_ease.flesch_reading_ease, _flesch_kincaid_grade.flesch_kincaid_grade)
+    get_cmudict = _count_syllables.get_cmudict
+    readability._load_sources()
+    cmu = readability._CMU
+    if cmu is None:
+        _count_syllables.get_cmudict = lambda lang: None
+    for func in cached:
+        func.cache_clear()
+    readability.word_syllables.cache_clear()
+    try:
+        yield
+    finally:
+        _count_syllables.get_cmudict = get_cmudict
+        readability._CMU = cmu
+        for func in cached:
+            func.cache_clear()
+        readability.word_syllables.cache_clear()
+
+
+def test_flesch_parity_with_textstat():
+    import textstat
+    from corpus import PAIRS, QUESTIONS
+
+    texts = list(QUESTIONS) + [b for _, b in PAIRS] + EDGE_CASES + ["", "Hi.", "Don't 'quote' me."]
+    with _same_syllable_data():
+        for text in texts:
+            stats = readability.text_statistics(text)
+            assert abs(stats["flesch_reading_ease"] - textstat.flesch_reading_ease(text)) < 1e-9, text
+            assert abs(stats["flesch_kincaid_grade"] - textstat.flesch_kincaid_grade(text)) < 1e-9, text
+
+
+def _spacy_engine_available() -> bool:
+    try:
+        import spacy
+        import textstat
+        spacy.load("en_core_web_sm")
+        textstat.flesch_reading_ease("Check the syllable data.")
+        return True
+    except Exception:
+        return False
+
+
+def test_parity_with_spacy_engine():
+    if not _spacy_engine_available():
+        import pytest
+        pytest.skip("spaCy en_core_web_sm or textstat cmudict data not installed")
+    import difficulty_parity
+    assert difficulty_parity.main(EDGE_CASES) == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            if name == "test_parity_with_spacy_engine" and not _spacy_engine_available():
+                print(f"- {name} (skipped: spaCy model or cmudict data not installed)")
+                continue
+            test()
+            print(f"✓ {name}")
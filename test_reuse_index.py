@@ -0,0 +1,97 @@
+"""
+Tests for reuse_index: only questions differing in their numbers are reused
+Usage: python -m pytest test_reuse_index.py  (or python test_reuse_index.py)
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reuse_index
+from reuse_index import ReuseIndex, template
+
+
+def bag_of_words(texts):
+    """Deterministic stand-in for SBERT: near-duplicates score far above 0.9."""
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for token in template(text):
+            vectors[i, hash(token) % 64] += 1.0
+    return vectors
+
+
+AREA = "Find the area of a circle with radius 5 cm."
+AREA_SIMPLE = "What is the area of a circle? The radius is 5 cm."
+
+
+def make_index(threshold=0.5):
+    index = ReuseIndex(bag_of_words, threshold=threshold)
+    index.add(AREA, AREA_SIMPLE, "moderate", True)
+    return index
+
+
+def test_reuses_numeric_variant():
+    match = make_index().query("Find the area of a circle with radius 8 cm.", "moderate", True)
+    assert match is not None
+    assert match["simplified_text"] == "What is the area of a circle? The radius is 8 cm."
+
+
+def test_adapts_numbers_by_position():
+    adapted = reuse_index.adapt_numbers(
+        "A box is 2 m long and 2 m wide.", "The box: 2 m long, 2 m wide.", "A box is 3 m long and 4 m wide.")
+    assert adapted == "The box: 3 m long, 4 m wide."
+
+
+def test_numbers_missing_from_simplification_are_a_miss():
+    new = "A car drives 7 km in 2 hours."
+    # spelled out, dropped, reordered
+    for simplified in ("A car drives five km in 3 hours.", "A car drives some km in 3 hours.",
+                       "In 3 hours a car drives 5 km."):
+        assert reuse_index.adapt_numbers("A car drives 5 km in 3 hours.", simplified, new) is None
+
+
+def test_rejects_changed_key_term():
+    # Same numbers, one term changed: the stored answer would be wrong
+    question = "Find the circumference of a circle with radius 5 cm."
+    index = make_index(threshold=0.0)
+    assert not index.has_candidates(question, "moderate", True)
+    assert index.query(question, "moderate", True) is None
+
+
+def test_rejects_changed_name():
+    index = ReuseIndex(bag_of_words, threshold=0.0)
+    index.add("Alice has 3 apples and eats 1.", "Alice has 3 apples. She eats 1.", "moderate", True)
+    assert index.query("Bob has 3 apples and eats 1.", "moderate", True) is None
+
+
+def test_buckets_by_level():
+    assert make_index().query(AREA, "significant", True) is None
+
+
+def test_buffer_growth_keeps_entries():
+    index = ReuseIndex(bag_of_words, threshold=0.5)
+    count = reuse_index.INITIAL_CAPACITY * 2 + 3
+    for i in range(count):
+        index.add(f"Question number {i} about topic {i} ?", f"Simple {i}, topic {i}", "moderate", True)
+    assert len(index) == count
+    match = index.query(f"Question number {count - 1} about topic {count - 1} ?", "moderate", True)
+    assert match is not None and match["simplified_text"] == f"Simple {count - 1}, topic {count - 1}"
+
+
+def test_disabled_by_default():
+    previous = os.environ.pop("REUSE_INDEX", None)
+    try:
+        assert reuse_index.from_env(bag_of_words) is None
+    finally:
+        if previous is not None:
+            os.environ["REUSE_INDEX"] = previous
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,142 @@
+"""
+Tests for visuals/safe_expr.py: whitelist parser, budgets, sandbox timeouts
+Usage: python -m pytest test_safe_expr.py  (or python test_safe_expr.py)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from visuals import safe_expr
+from visuals.safe_expr import ExpressionError, SandboxPool, check, evaluate, normalize, plot_data
+
+# Differentiating this takes far longer than the short limits used below
+HEAVY = "((x+1)**50*(x-1)**50*(x+2)**50*(x-3)**50)*sin(x)**40*cos(x)**40"
+
+
+def _reason(func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except ExpressionError as e:
+        return e.reason
+    return "ok"
+
+
+def test_whitelist_rejections():
+    rejected = {
+        "__import__('os').system('id')": "not_allowed",
+        "x.__class__": "not_allowed",
+        "lambda: 0": "not_allowed",
+        "[x for x in range(9)]": "not_allowed",
+        "'x'": "not_allowed",
+        "foo(x)": "not_allowed",
+        "sin": "not_allowed",
+        "y + 1": "not_allowed",
+        "sin(x, key=1)": "not_allowed",
+        "9**9**9": "too_complex",
+        "x**1000": "too_complex",
+        "1234567890123*x": "too_complex",
+        "sin(" * 25 + "x" + ")" * 25: "too_complex",
+        "x+" * 150 + "x": "too_complex",
+        "": "syntax",
+        "x +* 2": "syntax",
+    }
+    for text, reason in rejected.items():
+        # evaluate runs check first; computed exponents (9**9**9) are caught while building
+        assert _reason(evaluate, text) == reason, text
+
+
+def test_accepted_expressions():
+    for text in ("x**2 - 4", "y = x^3", "f(x) = sin(10*x)", "log(x, 2)", "+".join(["x"] * 30), "2**-3*pi*e"):
+        assert _reason(check, text) == "ok", text
+
+
+def test_implicit_multiplication():
+    assert normalize("x^3 - 2x") == "x**3 - 2*x"
+    assert normalize("3(x+1)") == "3*(x+1)"
+    assert normalize("(x+1)(x-1)") == "(x+1)*(x-1)"
+    assert normalize("(x+1)x") == "(x+1)*x"
+    assert normalize("2.5sin(x)") == "2.5*sin(x)"
+    assert normalize("1e-3*x") == "1e-3*x"
+    assert normalize("x2") == "x2"
+
+
+def test_piecewise_functions_differentiate():
+    for text, expected in (("abs(x)", "sign(x)"), ("floor(x)", "0"), ("ceil(x)", "0"), ("sign(x)", "0")):
+        result = evaluate(text, derivative=True)
+        assert result["derivative"] == expected, text
+        assert len(result["curves"]) == 2
+
+
+def test_timeout_kills_and_replaces_worker():
+    pool = SandboxPool(size=1, timeout_s=5)
+    assert pool.run({"text": "x", "derivative": False, "domain": None, "budget": None})["ok"]
+    worker = pool._idle.get_nowait()
+    pool._idle.put(worker)
+
+    pool.timeout_s = 0.01
+
+    try:
+        pool.run({"text": HEAVY, "derivative": True, "domain": None, "budget": None})
+        raise AssertionError("expected a timeout")
+    except ExpressionError as e:
+        assert e.reason == "timeout"
+    assert worker.proc.poll() is not None  # killed
+
+    # Replaced in the background; the next expression runs normally
+    pool.timeout_s = 5
+    assert pool.run({"text": "sin(x)", "derivative": False, "domain": None, "budget": None})["ok"]
+    assert pool._started == 1
+
+
+def test_worker_dead_while_idle_is_retried():
+    pool = SandboxPool(size=1, timeout_s=5)
+    assert pool.run({"text": "x", "derivative": False, "domain": None, "budget": None})["ok"]
+    worker = pool._idle.get_nowait()
+    worker.kill()
+    pool._idle.put(worker)
+    assert pool.run({"text": "x**2", "derivative": False, "domain": None, "budget": None})["ok"]
+
+
+def test_failure_memo_only_keeps_repeated_failures():
+    safe_expr._FAILURES.clear()
+    safe_expr._remember_failure("k:worker", "worker")
+    assert safe_expr._known_failure("k:worker") is None
+
+    safe_expr._remember_failure("k:timeout", "timeout")
+    assert safe_expr._known_failure("k:timeout") is None  # one overrun may be load
+    safe_expr._remember_failure("k:timeout", "timeout")
+    assert safe_expr._known_failure("k:timeout") == "timeout"
+
+    safe_expr._remember_failure("k:memory", "memory")
+    assert safe_expr._known_failure("k:memory") == "memory"
+
+
+def test_failure_memo_expires():
+    safe_expr._FAILURES.clear()
+    ttl = safe_expr.FAILURE_TTL_S
+    safe_expr.FAILURE_TTL_S = 0.05
+    try:
+        safe_expr._remember_failure("k", "too_complex")
+        assert safe_expr._known_failure("k") == "too_complex"
+        time.sleep(0.1)
+        assert safe_expr._known_failure("k") is None
+    finally:
+        safe_expr.FAILURE_TTL_S = ttl
+
+
+def test_plot_data_end_to_end():
+    safe_expr._FAILURES.clear()
+    data = plot_data("x^3 - 2x", derivative=True, domain=(-2, 2))
+    assert data.expression == "x**3 - 2*x"
+    assert data.derivative == "3*x**2 - 2"
+    assert len(data.curves) == 2 and data.curves[0].x[0] == -2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,81 @@
+"""
+Tests for visuals/sampling.py: adaptive sampling and domains from question text
+Usage: python -m pytest test_sampling.py  (or python test_sampling.py)
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from visuals.sampling import sample_function, split_domain
+
+
+def test_split_domain_forms():
+    cases = {
+        "x**2 for x in [-1,1]": ("x**2", (-1.0, 1.0)),
+        "plot x**2 for x in [-1, 1]": ("plot x**2", (-1.0, 1.0)),
+        "plot x^2, x ∈ [0, 1]": ("plot x^2", (0.0, 1.0)),
+        "plot x on [0, 5]": ("plot x", (0.0, 5.0)),
+        "plot x**2 over (-1, 1)": ("plot x**2", (-1.0, 1.0)),
+        "plot x from 0 to 5": ("plot x", (0.0, 5.0)),
+        "plot sin(x) for x from -pi to pi": ("plot sin(x)", (-math.pi, math.pi)),
+        "plot x**2 from x = -2 to x = 2": ("plot x**2", (-2.0, 2.0)),
+        "plot x**2 for x between -3 and 3": ("plot x**2", (-3.0, 3.0)),
+        "-2 <= x <= 5 plot x**2": ("plot x**2", (-2.0, 5.0)),
+        "plot information": ("plot information", None),
+    }
+    for text, expected in cases.items():
+        assert split_domain(text) == expected, text
+
+
+def test_worksheet_spec_for_x_in():
+    import nlp_engine
+    spec = nlp_engine.worksheet_spec("plot x**2 for x in [-1, 1]")
+    assert spec == {"type": "function", "expression": "x**2", "domain": [-1.0, 1.0]}
+
+
+def test_pole_is_broken_not_bridged():
+    sampled = sample_function(lambda x: 1 / x, (-1, 1))
+    assert sampled.breaks >= 1
+    finite = np.isfinite(sampled.y)
+    jumps = np.abs(np.diff(sampled.y))[finite[:-1] & finite[1:]]
+    assert jumps.max() < 0.5 * (sampled.ylim[1] - sampled.ylim[0])
+
+
+def test_smooth_curve_stays_cheap():
+    sampled = sample_function(lambda x: 2 * x + 1, (-10, 10))
+    assert sampled.breaks == 0
+    assert sampled.evaluations < 300
+
+
+def test_invalid_domain():
+    for domain in ((1, 1), (2, -2), (0, float("inf"))):
+        try:
+            sample_function(np.sin, domain)
+            raise AssertionError(f"accepted {domain}")
+        except ValueError:
+            pass
+
+
+def test_plot_evaluations_metric_is_observed():
+    from metrics import PLOT_EVALUATIONS
+    from visuals.safe_expr import plot_data
+
+    def count():
+        series = PLOT_EVALUATIONS._values.get(PLOT_EVALUATIONS._key({}))
+        return series["count"] if series else 0
+
+    before = count()
+    plot_data("sin(x)", derivative=True)
+    assert count() == before + 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,62 @@
+"""
+Tests for visuals/static_cache.py: a cache hit serves exactly the image
+text_to_image would have drawn for the same question
+Usage: python -m pytest test_static_visuals.py  (or python test_static_visuals.py)
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+import matplotlib.image as mpimg
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nlp_engine
+from visuals import static_cache
+
+QUESTIONS = [
+    "Draw a triangle",
+    "Show a simple circuit",
+    "Draw a circle",
+    "Draw a rectangle",
+    "Force to the LEFT",
+    "A force pushes the box to the right",
+    "Draw a force pushing DOWN",
+    "Show the force on a block",
+    "Show the motion of a car moving Left",
+    "Show the motion of a car",
+]
+
+
+def _pixels(data_or_path):
+    return mpimg.imread(data_or_path if isinstance(data_or_path, str) else io.BytesIO(data_or_path))
+
+
+def test_cache_hits_match_rendered_images():
+    static_cache.prerender()
+    hits = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for question in QUESTIONS:
+            name = nlp_engine.static_visual(question)
+            if name is None:
+                continue
+            hits += 1
+            rendered = nlp_engine.text_to_image(question, output_folder=folder)
+            assert np.array_equal(_pixels(static_cache.get(name).data), _pixels(rendered)), question
+    assert hits >= 6
+
+
+def test_direction_is_case_insensitive():
+    assert nlp_engine.worksheet_spec("Force to the LEFT")["direction"] == "left"
+    assert nlp_engine._force_direction("Force to the LEFT") == "left"
+    assert nlp_engine._motion_direction("car moving Left") == "left"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,49 @@
+"""
+Tests for visuals/worksheet.py: spec validation before anything is drawn
+Usage: python -m pytest test_worksheet.py  (or python test_worksheet.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from visuals.worksheet import MAX_PANELS, MAX_SWEEP, expand_specs
+
+
+def _rejected(specs) -> bool:
+    try:
+        expand_specs(specs)
+        return False
+    except ValueError:
+        return True
+
+
+def test_list_parameters_expand_into_panels():
+    panels = expand_specs([{"type": "circle", "radius": [2, 4, 6]}])
+    assert [p["params"]["radius"] for p in panels] == [2, 4, 6]
+    assert _rejected([{"type": "circle", "radius": list(range(MAX_PANELS + 1))}])
+
+
+def test_projectile_sweep_is_one_panel_but_capped():
+    panels = expand_specs([{"type": "projectile", "angle": list(range(1, MAX_SWEEP + 1))}])
+    assert len(panels) == 1
+    assert _rejected([{"type": "projectile", "angle": list(range(1, 5000))}])
+    assert _rejected([{"type": "projectile", "angle": 45, "velocity": list(range(MAX_SWEEP + 1))}])
+
+
+def test_invalid_columns_are_rejected():
+    from visuals.worksheet import render_worksheet
+    for columns in ([2], "abc", "2", 0, -1, 1.5, True):
+        try:
+            render_worksheet([{"type": "circle"}], output_path="unused.png", columns=columns)
+            raise AssertionError(f"accepted columns={columns!r}")
+        except ValueError as e:
+            assert str(e) == "columns must be a positive integer"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✓ {name}")
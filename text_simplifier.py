@@ -14,12 +14,19 @@ This module:
 """
 
 from huggingface_hub import InferenceClient
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Import models for compatibility
 from models import AssessmentItem, ConversionResult, ValidationStatus, ValidationMetrics
+from metrics import (
+    STAGE_LATENCY, SIMPLIFY_ATTEMPTS, SIMPLIFY_TIER, VALIDATIONS, VALIDATION_SKIPPED,
+    REUSE_LOOKUPS, REUSE_LATENCY_SAVED, LLM_CALLS_PER_ITEM, LLM_COMPLETIONS
+)
+from tracing import trace, span
 
 # Load environment variables
 load_dotenv()
@@ -30,12 +37,23 @@ class TextSimplifier:
     Uses hybrid validation: internal checks first, then common validation if needed.
     """
     
-    def __init__(self, hf_token: Optional[str] = None):
-        """Initialize with Hugging Face token from environment or parameter"""
+    def __init__(self, hf_token: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        Initialize with Hugging Face token from environment or parameter.
+
+        Args:
+            hf_token: Hugging Face API key (defaults to HUGGINGFACE_API_KEY)
+            base_url: OpenAI-compatible endpoint to use instead of the hosted model,
+                      e.g. llm_stub_server.py (defaults to LLM_BASE_URL)
+        """
         self.hf_token = hf_token or os.getenv('HUGGINGFACE_API_KEY')
+        self.base_url = base_url or os.getenv('LLM_BASE_URL')
         
         # Initialize Llama model client
-        if self.hf_token:
+        if self.base_url:
+            # Local/self-hosted endpoint (e.g. the load-testing stub); no key required
+            self.client = InferenceClient(base_url=self.base_url, token=self.hf_token)
+        elif self.hf_token:
             self.client = InferenceClient(token=self.hf_token)
         else:
             print("WARNING: No HUGGINGFACE_API_KEY found. Simplification checks will fail.")
@@ -46,14 +64,37 @@ class TextSimplifier:
         # Import validators (these are INTERNAL to this module)
         from semantic_checker import SemanticChecker
         from difficulty_scorer import DifficultyScorer
+        from simplifier_engine import simplify_text
+        import reuse_index
         
-        self.semantic_checker = SemanticChecker()
-        self.difficulty_scorer = DifficultyScorer()
+        # Independent model loads run concurrently (SBERT and, if used, spaCy)
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="load") as pool:
+            semantic_checker = pool.submit(SemanticChecker)
+            difficulty_scorer = pool.submit(DifficultyScorer)
+            self.semantic_checker = semantic_checker.result()
+            self.difficulty_scorer = difficulty_scorer.result()
+        self.rule_simplifier = simplify_text
+        # Validated simplifications of questions differing only in numbers (REUSE_INDEX=1 enables)
+        self.reuse_index = reuse_index.from_env(self.semantic_checker.encode)
         
         # Validation thresholds
         self.SEMANTIC_THRESHOLD = 0.85
         self.DIFFICULTY_THRESHOLD = 10.0  # Max 10% change
         self.MAX_INTERNAL_ATTEMPTS = 3
+
+        # Retries send get_regeneration_prompt with the failed metric and the
+        # failing candidate. SIMPLIFIER_FEEDBACK_PROMPTS=0 re-sends the original prompt.
+        self.USE_FEEDBACK_PROMPTS = os.getenv('SIMPLIFIER_FEEDBACK_PROMPTS', '1') != '0'
+        self.retry_strategy = "feedback" if self.USE_FEEDBACK_PROMPTS else "resend"
+
+        # Tiered generation: rule-based simplify_text aggression levels tried
+        # (in order) before any LLM call. SIMPLIFIER_RULE_TIERS=0 disables it.
+        self.USE_RULE_TIERS = os.getenv('SIMPLIFIER_RULE_TIERS', '1') != '0'
+        self.RULE_TIERS = {
+            "minimal": (1,),
+            "moderate": (1, 2, 3),
+            "significant": (1, 2, 3)
+        }
     
     def simplify(
         self, 
@@ -76,42 +117,85 @@ class TextSimplifier:
                 - semantic_score: Similarity score
                 - difficulty_change: Percentage change in difficulty
                 - needs_regeneration: True if failed and needs adaptive regeneration
+                - tier: "reuse", "rule-<aggression>" or "llm" (which generator produced the text)
+                - skipped_metrics: validators skipped by early exit (empty once completed)
                 - metadata: Additional info
         """
-        import sys
-        
-        print(f"\n{'='*80}", flush=True)
-        print(f"TEXT SIMPLIFIER - Internal Validation Mode", flush=True)
-        print(f"{'='*80}\n", flush=True)
-        print(f"Input: {text[:100]}...", flush=True)
-        
+        with trace("simplify", level=simplification_level, input_chars=len(text)):
+            return self._simplify(text, preserve_math, simplification_level)
+
+    def _simplify(
+        self,
+        text: str,
+        preserve_math: bool,
+        simplification_level: str
+    ) -> Dict[str, Any]:
         # Calculate original difficulty
-        original_difficulty = self.difficulty_scorer.calculate_difficulty(text)
-        original_score = original_difficulty['composite_difficulty']
-        print(f"Original Difficulty Score: {original_score}", flush=True)
-        
-        best_result = None
-        best_validation_score = -1
+        with span("difficulty.original") as sp, STAGE_LATENCY.time(stage="difficulty"):
+            original_difficulty = self.difficulty_scorer.calculate_difficulty(text)
+            original_score = original_difficulty['composite_difficulty']
+            sp.set(score=original_score)
         
-        # Internal validation loop (max 3 attempts)
+        # Failed candidates as (text, validation, attempt, tier); the best one is
+        # only scored at the end, so skipped metrics are computed only if needed
+        candidates = []
+
+        # Tier 0: validated simplification of the same question with other numbers
+        query_vector = None
+        if self.reuse_index is not None:
+            reused, query_vector = self._try_reuse(
+                text, preserve_math, simplification_level, original_score, candidates
+            )
+            if reused:
+                return reused
+
+        # Tier 1: local rule-based simplifier at rising aggression (no LLM call)
+        rule_levels = self.RULE_TIERS.get(simplification_level, (1, 2, 3)) if self.USE_RULE_TIERS else ()
+        tried = {text.strip()}
+        for aggression in rule_levels:
+            with span("rule_tier", aggression=aggression):
+                candidate = self.rule_simplifier(text, aggression=aggression)
+            # Unchanged or repeated output is not a new candidate
+            if not candidate or candidate in tried:
+                continue
+            tried.add(candidate)
+
+            tier = f"rule-{aggression}"
+            validation = self._validate_internally(text, candidate, original_score)
+
+            if validation['passed']:
+                SIMPLIFY_TIER.inc(tier=tier)
+                print(f"[Passed] Rule-based tier (aggression {aggression}) - LLM call skipped")
+                self._remember(text, candidate, simplification_level, preserve_math, query_vector)
+                return self._build_result(candidate, validation, attempt=0, tier=tier)
+            candidates.append((candidate, validation, 0, tier))
+
+        # Tier 2: LLM internal validation loop (max 3 attempts)
+        llm_calls = 0
+        feedback = None  # (failing candidate, failed metric) from the previous attempt
+        token_scale = 1.0  # doubled after a truncated generation
         for attempt in range(1, self.MAX_INTERNAL_ATTEMPTS + 1):
-            print(f"\n[Attempt] Internal Attempt {attempt}/{self.MAX_INTERNAL_ATTEMPTS}", flush=True)
-            
             # Generate simplified version
             if self.client:
-                simplified = self._generate_simplified(
+                SIMPLIFY_ATTEMPTS.inc()
+                llm_calls += 1
+                simplified, finish_reason = self._generate_simplified(
                     text, 
                     preserve_math, 
                     simplification_level,
-                    attempt
+                    attempt,
+                    feedback=feedback if self.USE_FEEDBACK_PROMPTS else None,
+                    token_scale=token_scale
                 )
+                if finish_reason == "length":
+                    token_scale *= 2
             else:
                 simplified = None
                 print("  [Error] No API Client available.")
             
             if not simplified:
                 print("  [Failed] Generation failed")
-                if not self.client: return self._create_failure_result(text, original_score, attempt)
+                if not self.client: break
                 continue
             
             # Run internal validation
@@ -121,38 +205,23 @@ class TextSimplifier:
                 original_score
             )
             
-            # Track best result
-            difficulty_preservation = (100 - min(validation['difficulty_change'], 100)) / 100
-            combined_score = (
-                validation['semantic_score'] * 0.7 + 
-                difficulty_preservation * 0.3
-            )
-            
-            current_result = {
-                'simplified_text': simplified,
-                'passed_internal_validation': validation['passed'],
-                'semantic_score': validation['semantic_score'],
-                'difficulty_change': validation['difficulty_change'],
-                'semantic_passed': validation['semantic_passed'],
-                'difficulty_passed': validation['difficulty_passed'],
-                'attempt': attempt,
-                'needs_regeneration': False
-            }
-
-            if combined_score > best_validation_score:
-                best_validation_score = combined_score
-                best_result = current_result
-            
             # If validation passed, return immediately
             if validation['passed']:
-                print(f"\n[Passed] INTERNAL VALIDATION")
-                print(f"   Semantic: {validation['semantic_score']:.3f} [OK]")
-                print(f"   Difficulty: {validation['difficulty_change']:.1f}% change [OK]")
-                print(f"\n[Evid] Sending to Evidence Dashboard\n")
-                return best_result
+                SIMPLIFY_TIER.inc(tier="llm")
+                self._remember(text, simplified, simplification_level, preserve_math, query_vector)
+                LLM_CALLS_PER_ITEM.observe(llm_calls, outcome="passed", strategy=self.retry_strategy)
+                return self._build_result(simplified, validation, attempt=attempt, tier="llm")
+
+            # Track for best-candidate selection and tell the next attempt what failed
+            candidates.append((simplified, validation, attempt, "llm"))
+            feedback = (simplified, self._failed_metric(validation))
         
         # If we're here, internal validation failed after all attempts
+        SIMPLIFY_TIER.inc(tier="unresolved")
+        if llm_calls:
+            LLM_CALLS_PER_ITEM.observe(llm_calls, outcome="unresolved", strategy=self.retry_strategy)
         print(f"\n[Failed] INTERNAL VALIDATION after {self.MAX_INTERNAL_ATTEMPTS} attempts")
+        best_result = self._select_best(text, candidates)
         if best_result:
             print(f"   Best semantic: {best_result['semantic_score']:.3f}")
             print(f"   Best difficulty change: {best_result['difficulty_change']:.1f}%")
@@ -161,6 +230,55 @@ class TextSimplifier:
         else:
              return self._create_failure_result(text, original_score, self.MAX_INTERNAL_ATTEMPTS)
 
+    def _try_reuse(
+        self,
+        text: str,
+        preserve_math: bool,
+        level: str,
+        original_score: float,
+        candidates: List
+    ):
+        """
+        Reuse (and re-validate) the simplification of the nearest validated question.
+
+        Returns:
+            (result or None, embedding of text for later _remember)
+        """
+        start = time.perf_counter()
+        if not self.reuse_index.has_candidates(text, level, preserve_math):
+            # Nothing with this template is stored: skip the encode
+            REUSE_LOOKUPS.inc(result="no_match")
+            return None, None
+        with span("reuse_lookup") as sp:
+            query_vector = self.semantic_checker.encode([text])[0]
+            match = self.reuse_index.query(text, level, preserve_math, vector=query_vector)
+            sp.set(matched=match is not None)
+        if not match:
+            REUSE_LOOKUPS.inc(result="no_match")
+            return None, query_vector
+
+        print(f"[Reuse] Nearest validated question (similarity {match['similarity']:.3f})")
+        candidate = match['simplified_text']
+        validation = self._validate_internally(text, candidate, original_score)
+        if not validation['passed']:
+            REUSE_LOOKUPS.inc(result="rejected")
+            candidates.append((candidate, validation, 0, "reuse"))
+            return None, query_vector
+
+        REUSE_LOOKUPS.inc(result="reused")
+        SIMPLIFY_TIER.inc(tier="reuse")
+        # Saved time is estimated from the mean LLM call latency seen so far
+        llm_latency = STAGE_LATENCY.mean(stage="generation")
+        if llm_latency is not None:
+            REUSE_LATENCY_SAVED.inc(max(0.0, llm_latency - (time.perf_counter() - start)))
+        print("[Passed] Reused validated simplification - LLM call skipped")
+        return self._build_result(candidate, validation, attempt=0, tier="reuse"), query_vector
+
+    def _remember(self, text, simplified, level, preserve_math, query_vector=None):
+        """Add a passing simplification to the reuse index"""
+        if self.reuse_index is not None:
+            self.reuse_index.add(text, simplified, level, preserve_math, vector=query_vector)
+
     def _create_failure_result(self, text, original_score, attempt):
         return {
             'simplified_text': text, # Fallback to original
@@ -170,75 +288,197 @@ class TextSimplifier:
             'semantic_passed': True,
             'difficulty_passed': True,
             'attempt': attempt,
-            'needs_regeneration': True
+            'needs_regeneration': True,
+            'tier': None,
+            'skipped_metrics': []
         }
+
+    def _build_result(self, simplified, validation, attempt, tier):
+        return {
+            'simplified_text': simplified,
+            'passed_internal_validation': validation['passed'],
+            'semantic_score': validation['semantic_score'],
+            'difficulty_change': validation['difficulty_change'],
+            'semantic_passed': validation['semantic_passed'],
+            'difficulty_passed': validation['difficulty_passed'],
+            'attempt': attempt,
+            'needs_regeneration': False,
+            'tier': tier,
+            'skipped_metrics': list(validation['skipped'])
+        }
+
+    def _combined_score(self, validation):
+        """
+        Best-candidate score: 70% meaning preservation, 30% difficulty preservation.
+        A skipped semantic score counts as 1.0, so the result is an upper bound.
+        """
+        semantic_score = validation['semantic_score']
+        if semantic_score is None:
+            semantic_score = 1.0
+        difficulty_preservation = (100 - min(validation['difficulty_change'], 100)) / 100
+        return (
+            semantic_score * 0.7 + 
+            difficulty_preservation * 0.3
+        )
+
+    def _select_best(self, original, candidates):
+        """
+        Pick the best failed candidate by combined score.
+
+        Candidates are visited by upper-bound score; skipped semantic checks are
+        run only for candidates that could still beat the best exact score.
+        """
+        ordered = sorted(candidates, key=lambda c: self._combined_score(c[1]), reverse=True)
+        best, best_score = None, -1
+        for simplified, validation, attempt, tier in ordered:
+            if self._combined_score(validation) <= best_score:
+                break
+            self._complete_validation(original, simplified, validation)
+            score = self._combined_score(validation)
+            if score > best_score:
+                best_score = score
+                best = self._build_result(simplified, validation, attempt=attempt, tier=tier)
+        return best
     
+    def _failed_metric(self, validation: Dict[str, Any]) -> str:
+        """
+        Map a failed validation to get_regeneration_prompt's failed_metric.
+
+        A semantic check skipped by early exit is unknown, not failed, so it
+        only counts the difficulty failure.
+        """
+        semantic_failed = validation['semantic_score'] is not None and not validation['semantic_passed']
+        if not validation['difficulty_passed']:
+            return "both" if semantic_failed else "difficulty"
+        return "semantic"
+
     def _generate_simplified(
         self, 
         text: str, 
         preserve_math: bool,
         level: str,
-        attempt: int
-    ) -> str:
-        """Generate simplified text using Llama 3.2"""
-        from prompts import get_simplification_prompt
+        attempt: int,
+        feedback: Optional[tuple] = None,
+        token_scale: float = 1.0
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate simplified text using Llama 3.2
+
+        Args:
+            feedback: (failing candidate, failed metric) from the previous attempt;
+                      when given, the targeted regeneration prompt is used
+            token_scale: Multiplier on the adaptive max_tokens budget
+
+        Returns:
+            (simplified text or None on error, finish_reason)
+        """
+        from prompts import get_simplification_prompt, get_regeneration_prompt, get_max_tokens, END_MARKER
         
         # Adjust temperature based on attempt (more conservative each time)
         temperature = max(0.3, 0.7 - (attempt * 0.1))
+        # Output budget follows the input length and level instead of a flat 500
+        max_tokens = get_max_tokens(text, level, scale=token_scale)
         
-        prompt = get_simplification_prompt(text, level, preserve_math)
+        if feedback:
+            failed_candidate, failed_metric = feedback
+            with span("prompt_build", level=level, failed_metric=failed_metric):
+                prompt = get_regeneration_prompt(text, failed_metric, failed_candidate, level)
+            print(f"  [Retry] Regenerating with feedback: {failed_metric} failed")
+        else:
+            with span("prompt_build", level=level):
+                prompt = get_simplification_prompt(text, level, preserve_math)
         
         try:
             messages = [
                 {"role": "user", "content": prompt}
             ]
-            response = self.client.chat_completion(
-                messages,
-                model=self.model_id,
-                max_tokens=500,
-                temperature=temperature,
-                top_p=0.9
-            )
-            return response.choices[0].message.content.strip()
+            with span("llm_call", model=self.model_id, attempt=attempt, temperature=temperature,
+                      max_tokens=max_tokens) as sp, \
+                    STAGE_LATENCY.time(stage="generation"):
+                response = self.client.chat_completion(
+                    messages,
+                    model=self.model_id,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=0.9,
+                    stop=[END_MARKER]
+                )
+                finish_reason = response.choices[0].finish_reason or "unknown"
+                sp.set(finish_reason=finish_reason)
+            LLM_COMPLETIONS.inc(finish_reason=finish_reason)
+            if finish_reason == "length":
+                print(f"  [Warn] Generation truncated at max_tokens={max_tokens}")
+            # Endpoints that ignore `stop` return the marker (and whatever follows)
+            content = response.choices[0].message.content.split(END_MARKER)[0]
+            return content.strip(), finish_reason
         except Exception as e:
             print(f"  [Error] Generation error: {str(e)}")
-            return None
+            return None, None
     
     def _validate_internally(
         self, 
         original: str, 
         simplified: str, 
-        original_difficulty_score: float
+        original_difficulty_score: float,
+        early_exit: bool = True
     ) -> Dict[str, Any]:
-        """Run internal semantic and difficulty validation"""
-        
-        # Semantic similarity check
-        semantic_score = self.semantic_checker.check_similarity(original, simplified)
-        semantic_passed = semantic_score >= self.SEMANTIC_THRESHOLD
+        """
+        Run internal difficulty and semantic validation, cheapest check first.
+
+        The difficulty check (textstat + spaCy) runs before the SBERT encode.
+        With early_exit, a difficulty failure skips the semantic check: its
+        score is None and "semantic" is listed in 'skipped'.
+        """
         
         # Difficulty change check
-        simplified_difficulty = self.difficulty_scorer.calculate_difficulty(simplified)
-        simplified_score = simplified_difficulty['composite_difficulty']
-        
-        difficulty_change = (
-            abs(simplified_score - original_difficulty_score) / original_difficulty_score * 100
-            if original_difficulty_score > 0 else 0
-        )
-        difficulty_passed = difficulty_change <= self.DIFFICULTY_THRESHOLD
-        
-        # Overall pass/fail
-        passed = semantic_passed and difficulty_passed
-        
-        print(f"  [Metric] Semantic: {semantic_score:.3f} {'[OK]' if semantic_passed else '[FAIL] (threshold: 0.85)'}")
-        print(f"  [Metric] Difficulty: {difficulty_change:.1f}% change {'[OK]' if difficulty_passed else '[FAIL] (max: 10%)'}")
-        
-        return {
-            'semantic_score': semantic_score,
-            'semantic_passed': semantic_passed,
+        with span("validate.difficulty") as sp, STAGE_LATENCY.time(stage="difficulty"):
+            simplified_difficulty = self.difficulty_scorer.calculate_difficulty(simplified)
+            simplified_score = simplified_difficulty['composite_difficulty']
+
+            difficulty_change = (
+                abs(simplified_score - original_difficulty_score) / original_difficulty_score * 100
+                if original_difficulty_score > 0 else 0
+            )
+            difficulty_passed = difficulty_change <= self.DIFFICULTY_THRESHOLD
+            sp.set(change_pct=round(difficulty_change, 2), passed=difficulty_passed)
+
+        validation = {
+            'semantic_score': None,
+            'semantic_passed': False,
             'difficulty_change': difficulty_change,
             'difficulty_passed': difficulty_passed,
-            'passed': passed
+            'passed': False,
+            'skipped': []
         }
+
+        # Semantic similarity check (skipped once a hard threshold has failed)
+        if difficulty_passed or not early_exit:
+            self._semantic_check(original, simplified, validation)
+        else:
+            validation['skipped'].append('semantic')
+            VALIDATION_SKIPPED.inc(validator="text_simplifier", metric="semantic")
+        
+        # Overall pass/fail
+        validation['passed'] = validation['semantic_passed'] and difficulty_passed
+        VALIDATIONS.inc(validator="text_simplifier", result="pass" if validation['passed'] else "fail")
+        
+        return validation
+
+    def _semantic_check(self, original: str, simplified: str, validation: Dict[str, Any]) -> None:
+        """Compute the semantic score into an existing validation dict"""
+        with span("validate.semantic") as sp, STAGE_LATENCY.time(stage="semantic_check"):
+            semantic_score = self.semantic_checker.check_similarity(original, simplified)
+            semantic_passed = semantic_score >= self.SEMANTIC_THRESHOLD
+            sp.set(score=round(semantic_score, 4), passed=semantic_passed)
+        validation['semantic_score'] = semantic_score
+        validation['semantic_passed'] = semantic_passed
+
+    def _complete_validation(self, original: str, simplified: str, validation: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in metrics that early exit skipped (pass/fail is unchanged: it already failed)"""
+        if 'semantic' in validation['skipped']:
+            self._semantic_check(original, simplified, validation)
+            validation['skipped'].remove('semantic')
+        return validation
     
     def get_validation_summary(self, result: Dict[str, Any]) -> str:
         """Generate human-readable validation summary for dashboard"""
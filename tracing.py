@@ -0,0 +1,190 @@
+"""
+Lightweight Request Tracing
+Per-request ids and timed spans emitted as structured JSON log lines
+
+Usage:
+    with trace("simplify"):            # joins the current request or starts one
+        with span("llm_call", model=model_id):
+            ...
+
+Sampling is controlled by TRACE_SAMPLE_RATE (0 = off, 1 = every request).
+With tracing off, span() returns a shared no-op object, so the cost in the
+hot paths is one global check per call.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+_logger = logging.getLogger("tracing")
+
+_SAMPLE_RATE = 0.0
+_ENABLED = False
+
+_current_trace: ContextVar[Optional["_Trace"]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+
+def configure(sample_rate: float) -> None:
+    """
+    Set the fraction of requests whose spans are logged.
+
+    Args:
+        sample_rate: 0.0 (tracing off) to 1.0 (trace every request)
+    """
+    global _SAMPLE_RATE, _ENABLED
+    _SAMPLE_RATE = max(0.0, min(1.0, float(sample_rate)))
+    _ENABLED = _SAMPLE_RATE > 0
+    if _ENABLED and not _logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+
+
+configure(os.getenv("TRACE_SAMPLE_RATE", "0"))
+
+
+class _Trace:
+    __slots__ = ("trace_id", "sampled")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+
+
+class _NoopSpan:
+    """Returned when the current request is not sampled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed, named stage of a request. Logged as one JSON line on exit."""
+
+    __slots__ = ("trace", "name", "attrs", "span_id", "parent_id", "_start", "_wall", "_token")
+
+    def __init__(self, trace: _Trace, name: str, attrs: dict):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = None
+        self._start = 0.0
+        self._wall = 0.0
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        """Attach attributes discovered while the span is running."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current_span.set(self)
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+        record = {
+            "ts": round(self._wall, 6),
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "duration_ms": round(duration_ms, 3),
+            "status": "error" if exc_type else "ok",
+        }
+        if exc_type is not None:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        if self.attrs:
+            record["attrs"] = self.attrs
+        _logger.info(json.dumps(record, default=str))
+        return False
+
+
+class _TraceScope:
+    """Root of a request: owns the trace id and the root span."""
+
+    __slots__ = ("_trace", "_span", "_token")
+
+    def __init__(self, trace: _Trace, name: str, attrs: dict):
+        self._trace = trace
+        self._span = Span(trace, name, attrs) if trace.sampled else _NOOP_SPAN
+        self._token = None
+
+    @property
+    def request_id(self) -> str:
+        return self._trace.trace_id
+
+    def set(self, **attrs) -> None:
+        self._span.set(**attrs)
+
+    def __enter__(self):
+        self._token = _current_trace.set(self._trace)
+        self._span.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._span.__exit__(exc_type, exc, tb)
+        _current_trace.reset(self._token)
+        return False
+
+
+def start_request(name: str, request_id: Optional[str] = None, **attrs) -> _TraceScope:
+    """
+    Begin a new trace (one per incoming request).
+
+    Args:
+        name: Root span name, e.g. the route
+        request_id: Id to reuse (e.g. an incoming X-Request-ID header)
+
+    Returns:
+        Context manager exposing .request_id
+    """
+    sampled = _ENABLED and random.random() < _SAMPLE_RATE
+    return _TraceScope(_Trace(request_id or uuid.uuid4().hex, sampled), name, attrs)
+
+
+def trace(name: str, **attrs):
+    """Span inside the current request, or a new sampled-or-not request if none is active."""
+    if _current_trace.get() is None:
+        return start_request(name, **attrs)
+    return span(name, **attrs)
+
+
+def span(name: str, **attrs):
+    """Timed child span of the current request; a no-op when not sampled."""
+    if not _ENABLED:
+        return _NOOP_SPAN
+    current = _current_trace.get()
+    if current is None or not current.sampled:
+        return _NOOP_SPAN
+    return Span(current, name, attrs)
+
+
+def current_request_id() -> Optional[str]:
+    current = _current_trace.get()
+    return current.trace_id if current is not None else None
@@ -0,0 +1,82 @@
+"""
+Traffic Log (JSONL) shared by the API recorder and loadgen.py
+
+One JSON object per line:
+    {"ts": 1760000000.123, "method": "POST", "route": "/simplify",
+     "body": {"text": "..."}, "status": 200, "latency_ms": 812.4}
+
+"status" and "latency_ms" are informational; replay only needs ts, method,
+route and body. Lines without a "route" are ignored by the reader.
+"""
+
+import json
+import threading
+import time
+from typing import Iterator, Optional
+
+REPLAYABLE_ROUTES = ("/generate", "/simplify", "/validate", "/braille")
+
+
+class TrafficRecorder:
+    """
+    Appends live requests to a JSONL traffic log (thread-safe).
+
+    Args:
+        path: JSONL file to append to
+        routes: Only requests to these routes are recorded
+    """
+
+    def __init__(self, path: str, routes=REPLAYABLE_ROUTES):
+        self.path = path
+        self.routes = set(routes)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(
+        self,
+        method: str,
+        route: str,
+        body: Optional[dict],
+        status: Optional[int] = None,
+        latency_ms: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        if route not in self.routes:
+            return
+        entry = {
+            "ts": round(ts if ts is not None else time.time(), 6),
+            "method": method,
+            "route": route,
+            "body": body,
+        }
+        if status is not None:
+            entry["status"] = status
+        if latency_ms is not None:
+            entry["latency_ms"] = round(latency_ms, 3)
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_records(path: str, routes=REPLAYABLE_ROUTES) -> Iterator[dict]:
+    """Yield replayable records from a traffic log, skipping malformed or unrelated lines."""
+    allowed = set(routes)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(entry, dict) or entry.get("route") not in allowed:
+                continue
+            entry.setdefault("method", "POST")
+            entry.setdefault("body", {})
+            yield entry
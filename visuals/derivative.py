@@ -1,4 +1,3 @@
-import numpy as np
 import matplotlib
 matplotlib.use('Agg') # Non-interactive backend
 import matplotlib.pyplot as plt
@@ -6,9 +5,29 @@ try:
     import sympy as sp
 except ImportError:
     sp = None
+from visuals.output import save_figure
+from visuals.safe_expr import plot_data
 
 
-def draw_derivative(function_str, output_path="derivative.png"):
+def draw_derivative_on(ax, function_str, domain=None):
+    """Plot f and f' on ax; raises ExpressionError for rejected or failing expressions."""
+    # Parsing, differentiation, lambdify and sampling run in a time- and
+    # memory-limited sandbox process (visuals/safe_expr.py)
+    data = plot_data(function_str, derivative=True, domain=domain)
+    curve, slope = data.curves
+
+    # Plot
+    ax.plot(curve.x, curve.y, label=f"f(x) = {data.expression}")
+    ax.plot(slope.x, slope.y, '--', label=f"f'(x) = {data.derivative}")
+    ax.set_ylim(min(curve.ylim[0], slope.ylim[0]), max(curve.ylim[1], slope.ylim[1]))
+    ax.axhline(0, color='black')
+    ax.axvline(0, color='black')
+    ax.legend()
+    ax.grid(True)
+    ax.set_title("Function and its Derivative")
+
+
+def draw_derivative(function_str, output_path="derivative.png", domain=None):
     if sp is None:
         print("Sympy not installed, skipping derivative")
         return None
@@ -18,46 +37,15 @@ def draw_derivative(function_str, output_path="derivative.png"):
     Example input: "2*x**2 + 5"
     """
 
-    x = sp.symbols('x')
-
     try:
-        # Convert string → symbolic expression
-        expr = sp.sympify(function_str)
-
-        # Derivative
-        derivative = sp.diff(expr, x)
-
-        # Convert to numerical functions
-        f = sp.lambdify(x, expr, "numpy")
-        df = sp.lambdify(x, derivative, "numpy")
-
-        # Generate values
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals = f(x_vals)
-        dy_vals = df(x_vals)
-
-        # Fix: If function returns scalar (e.g. for constant derivative), broadcast to array
-        if np.isscalar(y_vals):
-            y_vals = np.full_like(x_vals, y_vals)
-        if np.isscalar(dy_vals):
-            dy_vals = np.full_like(x_vals, dy_vals)
-
-
-        # Plot
         plt.figure(figsize=(7,5))
-        plt.plot(x_vals, y_vals, label=f"f(x) = {expr}")
-        plt.plot(x_vals, dy_vals, '--', label=f"f'(x) = {derivative}")
-        plt.axhline(0, color='black')
-        plt.axvline(0, color='black')
-        plt.legend()
-        plt.grid(True)
-        plt.title("Function and its Derivative")
-
-        plt.savefig(output_path)
-        plt.close()
+        draw_derivative_on(plt.gca(), function_str, domain)
+
+        save_figure(output_path)
 
         return output_path
 
     except Exception as e:
+        plt.close()
         print("Derivative error:", e)
         return None
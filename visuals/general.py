@@ -1,6 +1,7 @@
 
 import matplotlib.pyplot as plt
 import textwrap
+from visuals.output import save_figure
 
 def generate_concept_card(text, output_path="concept_card.png"):
     """
@@ -30,6 +31,5 @@ def generate_concept_card(text, output_path="concept_card.png"):
              
     plt.axis('off')
     
-    plt.savefig(output_path, bbox_inches='tight', dpi=100)
-    plt.close()
+    save_figure(output_path, bbox_inches='tight', dpi=100)
     return output_path
@@ -1,41 +1,49 @@
 import matplotlib.pyplot as plt
 import os
 import numpy as np
+from visuals.output import save_figure
 
-def generate_triangle(output_path="triangle.png"):
-    fig, ax = plt.subplots()
+# draw_*_on(ax, ...) draws onto an existing axes (used by visuals/worksheet.py);
+# generate_*(...) wraps it in its own figure and writes one PNG.
+
+def draw_triangle_on(ax):
     triangle = plt.Polygon([[0, 0], [1, 0], [0.5, 1]], fill=False, linewidth=2)
     ax.add_patch(triangle)
     ax.set_aspect('equal')
-    plt.title("Triangle")
-    plt.savefig(output_path)
-    plt.close()
-    return output_path
+    ax.set_title("Triangle")
 
-def generate_circle(radius=5, output_path="circle.png"):
+def generate_triangle(output_path="triangle.png"):
     fig, ax = plt.subplots()
+    draw_triangle_on(ax)
+    save_figure(output_path)
+    return output_path
+
+def draw_circle_on(ax, radius=5):
     circle = plt.Circle((0, 0), radius, fill=False, linewidth=2)
     ax.add_patch(circle)
-    
+
     ax.set_xlim(-radius - 1, radius + 1)
     ax.set_ylim(-radius - 1, radius + 1)
     ax.set_aspect('equal')
+    ax.set_title(f"Circle (r={radius})")
 
-    plt.title(f"Circle (r={radius})")
-    plt.savefig(output_path)
-    plt.close()
+def generate_circle(radius=5, output_path="circle.png"):
+    fig, ax = plt.subplots()
+    draw_circle_on(ax, radius)
+    save_figure(output_path)
     return output_path
 
-def generate_rectangle(length=6, width=4, output_path="rectangle.png"):
-    fig, ax = plt.subplots()
+def draw_rectangle_on(ax, length=6, width=4):
     rectangle = plt.Rectangle((0, 0), length, width, fill=False, linewidth=2)
     ax.add_patch(rectangle)
-    
+
     ax.set_xlim(0, length + 1)
     ax.set_ylim(0, width + 1)
     ax.set_aspect('equal')
+    ax.set_title(f"Rectangle ({length} x {width})")
 
-    plt.title(f"Rectangle ({length} x {width})")
-    plt.savefig(output_path)
-    plt.close()
+def generate_rectangle(length=6, width=4, output_path="rectangle.png"):
+    fig, ax = plt.subplots()
+    draw_rectangle_on(ax, length, width)
+    save_figure(output_path)
     return output_path
@@ -1,10 +1,13 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import sympy as sp
+from visuals.output import save_figure
+from visuals.safe_expr import plot_data
+
+# draw_*_on(ax, ...) draws onto an existing axes (used by visuals/worksheet.py);
+# draw_*(..., output_path) wraps it in its own figure and writes one PNG.
 
 # ---------------- Linear Graph ----------------
-def draw_linear_graph(points=None, output_path="linear_graph.png"):
-    plt.figure()
+def draw_linear_graph_on(ax, points=None):
     if points and len(points) >= 2:
         # Fit a line through points
         x_coords = [p[0] for p in points]
@@ -19,28 +22,30 @@ def draw_linear_graph(points=None, output_path="linear_graph.png"):
         x = np.linspace(x_min, x_max, 100)
         y = m * x + c
         
-        plt.plot(x, y, label=f"y = {m:.2f}x + {c:.2f}")
-        plt.scatter(x_coords, y_coords, color='red', zorder=5) # Plot original points
-        plt.title(f"Line through ({points[0][0]},{points[0][1]}) and ({points[1][0]},{points[1][1]})")
+        ax.plot(x, y, label=f"y = {m:.2f}x + {c:.2f}")
+        ax.scatter(x_coords, y_coords, color='red', zorder=5) # Plot original points
+        ax.set_title(f"Line through ({points[0][0]},{points[0][1]}) and ({points[1][0]},{points[1][1]})")
     else:
         # Default example
         x = np.linspace(-10, 10, 200)
         y = 2 * x + 1 
-        plt.plot(x, y, label="y=2x+1")
-        plt.title("Linear Graph")
+        ax.plot(x, y, label="y=2x+1")
+        ax.set_title("Linear Graph")
 
-    plt.xlabel("x")
-    plt.ylabel("y")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig(output_path)
-    plt.close()
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.legend()
+    ax.grid(True)
+
+def draw_linear_graph(points=None, output_path="linear_graph.png"):
+    plt.figure()
+    draw_linear_graph_on(plt.gca(), points)
+    save_figure(output_path)
     return output_path
 
 
 # ---------------- Parabola ----------------
-def draw_parabola(points=None, output_path="parabola.png"):
-    plt.figure()
+def draw_parabola_on(ax, points=None):
     if points is None or len(points) < 2:
         # default parabola
         x = np.linspace(-10, 10, 200)
@@ -54,21 +59,24 @@ def draw_parabola(points=None, output_path="parabola.png"):
         x = np.linspace(min(x_coords)-1, max(x_coords)+1, 200)
         y = a*x**2 + b*x + c
 
-    plt.plot(x, y, label="Parabola")
+    ax.plot(x, y, label="Parabola")
     
     if points is not None:
         # Plot points for reference
         px = [p[0] for p in points]
         py = [p[1] for p in points]
-        plt.scatter(px, py, color='red', label='Points')
+        ax.scatter(px, py, color='red', label='Points')
 
-    plt.xlabel("x")
-    plt.ylabel("y")
-    plt.title("Parabola")
-    plt.legend()
-    plt.grid(True)
-    plt.savefig(output_path)
-    plt.close()
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_title("Parabola")
+    ax.legend()
+    ax.grid(True)
+
+def draw_parabola(points=None, output_path="parabola.png"):
+    plt.figure()
+    draw_parabola_on(plt.gca(), points)
+    save_figure(output_path)
     return output_path
 
 
@@ -83,8 +91,7 @@ def draw_hyperbola(output_path="hyperbola.png"):
     plt.title("Hyperbola")
     plt.legend()
     plt.grid(True)
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
 
 # ---------------- Bar Graph ----------------
@@ -96,8 +103,7 @@ def draw_bar_graph(data=[5,3,7,2], output_path="bar_graph.png"):
     plt.ylabel("Value")
     plt.title("Bar Graph")
     plt.grid(True, axis='y')
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
 
 # ---------------- Pie Chart ----------------
@@ -108,8 +114,7 @@ def draw_pie_chart(data=[30, 20, 50], labels=None, output_path="pie_chart.png"):
     
     plt.pie(data, labels=labels, autopct='%1.1f%%', startangle=90)
     plt.title("Pie Chart")
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
 
 # ---------------- Histogram ----------------
@@ -123,35 +128,31 @@ def draw_histogram(data, output_path="histogram.png"):
     plt.title("Histogram")
     plt.xlabel("Value")
     plt.ylabel("Frequency")
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
 
 # ---------------- General Function Plotter ----------------
-def draw_generic_function(expression_str, output_path="function_plot.png"):
-    try:
-        x = sp.symbols('x')
-        expr = sp.sympify(expression_str)
-        f = sp.lambdify(x, expr, "numpy")
-        
-        x_vals = np.linspace(-10, 10, 400)
-        y_vals = f(x_vals)
+def draw_generic_function_on(ax, expression_str, domain=None):
+    # Parsed, sampled and time-limited in a sandbox process (visuals/safe_expr.py);
+    # adaptive points with NaN breaks at poles (visuals/sampling.py)
+    curve = plot_data(expression_str, domain=domain).curves[0]
 
-        # Broadcast if scalar
-        if np.isscalar(y_vals):
-           y_vals = np.full_like(x_vals, y_vals)
+    ax.plot(curve.x, curve.y, label=f"y = {expression_str}")
+    ax.set_ylim(*curve.ylim)
+    ax.axhline(0, color='black', linewidth=0.5)
+    ax.axvline(0, color='black', linewidth=0.5)
+    ax.set_title(f"Plot of {expression_str}")
+    ax.legend()
+    ax.grid(True)
 
+def draw_generic_function(expression_str, output_path="function_plot.png", domain=None):
+    try:
         plt.figure()
-        plt.plot(x_vals, y_vals, label=f"y = {expression_str}")
-        plt.axhline(0, color='black', linewidth=0.5)
-        plt.axvline(0, color='black', linewidth=0.5)
-        plt.title(f"Plot of {expression_str}")
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(output_path)
-        plt.close()
+        draw_generic_function_on(plt.gca(), expression_str, domain)
+        save_figure(output_path)
         return output_path
     except Exception as e:
+        plt.close()
         print(f"Function plot error: {e}")
         return None
 
@@ -165,6 +166,5 @@ def plot_points(output_path="points.png"):
     plt.ylabel("y")
     plt.title("Scatter Points")
     plt.grid(True)
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
@@ -0,0 +1,18 @@
+import matplotlib.pyplot as plt
+
+from tracing import span
+
+# Bump whenever a drawer's output changes (colours, sizes, titles...):
+# pre-rendered visuals (visuals/static_cache.py) from another version are discarded.
+STYLE_VERSION = "1"
+
+
+def save_figure(output_path, **savefig_kwargs):
+    """
+    Save the current figure and close it.
+    Shared by every visual so the encode/write step is timed as one "save" span.
+    output_path may also be a binary file object (e.g. io.BytesIO).
+    """
+    with span("save", path=str(output_path)):
+        plt.savefig(output_path, **savefig_kwargs)
+    plt.close()
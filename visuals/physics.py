@@ -1,15 +1,14 @@
 import matplotlib.pyplot as plt
 import numpy as np
+from visuals.output import save_figure
 
-# ---------- Force Diagram ----------
-def draw_force_diagram(force_value=10, direction="up", output_path="force.png"):
-    """
-    Draw a box with a force arrow applied in a given direction.
-    direction: 'up', 'down', 'left', 'right'
-    """
-    plt.figure(figsize=(5,5))
-    ax = plt.gca()
+# draw_*_on(ax, ...) draws onto an existing axes (used by visuals/worksheet.py);
+# draw_*(..., output_path) wraps it in its own figure and writes one PNG.
+
+G = 9.8
 
+# ---------- Force Diagram ----------
+def draw_force_diagram_on(ax, force_value=10, direction="up"):
     # Draw box
     box_width = 1
     box_height = 1
@@ -41,21 +40,21 @@ def draw_force_diagram(force_value=10, direction="up", output_path="force.png"):
     ax.set_xlim(-2, 5)
     ax.set_ylim(-2, 5)
     ax.set_aspect('equal')
-    plt.title(f"Force applied to a box ({direction})")
-    plt.axis('off')
-
-    plt.savefig(output_path)
-    plt.close()
-    return output_path
+    ax.set_title(f"Force applied to a box ({direction})")
+    ax.axis('off')
 
-# ---------- Motion Vector ----------
-def draw_motion_vector(direction="right", output_path="motion.png"):
+def draw_force_diagram(force_value=10, direction="up", output_path="force.png"):
     """
-    Draw a motion arrow (left or right) with a box
+    Draw a box with a force arrow applied in a given direction.
+    direction: 'up', 'down', 'left', 'right'
     """
-    plt.figure(figsize=(5,3))
-    ax = plt.gca()
+    plt.figure(figsize=(5,5))
+    draw_force_diagram_on(plt.gca(), force_value, direction)
+    save_figure(output_path)
+    return output_path
 
+# ---------- Motion Vector ----------
+def draw_motion_vector_on(ax, direction="right"):
     # Draw box
     box_width = 1
     box_height = 1
@@ -73,65 +72,91 @@ def draw_motion_vector(direction="right", output_path="motion.png"):
     ax.set_xlim(-2, 3)
     ax.set_ylim(0, 2)
     ax.set_aspect('equal')
-    plt.title("Motion Vector")
-    plt.axis('off')
+    ax.set_title("Motion Vector")
+    ax.axis('off')
 
-    plt.savefig(output_path)
-    plt.close()
+def draw_motion_vector(direction="right", output_path="motion.png"):
+    """
+    Draw a motion arrow (left or right) with a box
+    """
+    plt.figure(figsize=(5,3))
+    draw_motion_vector_on(plt.gca(), direction)
+    save_figure(output_path)
     return output_path
 
 # ---------- Projectile Motion ----------
+def projectile_trajectories(angles, velocities, samples=100):
+    """
+    Every trajectory of a parameter sweep in one vectorized computation.
+    angles (degrees) and velocities (m/s) are scalars or sequences, broadcast
+    against each other.
+
+    Returns:
+        x, y arrays of shape (samples, n_trajectories), one column per trajectory
+    """
+    theta, velocity = np.broadcast_arrays(
+        np.radians(np.atleast_1d(np.asarray(angles, dtype=float))),
+        np.atleast_1d(np.asarray(velocities, dtype=float)),
+    )
+    t_flight = 2 * velocity * np.sin(theta) / G
+    t = np.linspace(0, 1, samples)[:, None] * t_flight
+
+    x = velocity * np.cos(theta) * t
+    y = velocity * np.sin(theta) * t - 0.5 * G * t**2
+    return x, y
+
+def draw_projectile_motion_on(ax, angle=45, velocity=20):
+    x, y = projectile_trajectories(angle, velocity)
+    # One plot call draws every column as its own line
+    lines = ax.plot(x, y)
+    if len(lines) == 1:
+        lines[0].set_label("Trajectory")
+        ax.set_title(f"Projectile Motion (v={velocity}m/s, angle={angle}°)")
+    else:
+        angles, velocities = np.broadcast_arrays(np.atleast_1d(angle), np.atleast_1d(velocity))
+        for line, a, v in zip(lines, angles, velocities):
+            line.set_label(f"{a:g}°, {v:g} m/s")
+        ax.set_title(f"Projectile Motion ({len(lines)} launches)")
+    ax.set_xlabel("Distance (m)")
+    ax.set_ylabel("Height (m)")
+    ax.axhline(0, color='black')
+    ax.grid(True)
+    ax.legend()
+
 def draw_projectile_motion(angle=45, velocity=20, output_path="projectile.png"):
+    """angle and velocity may be sequences: every trajectory is drawn on one plot."""
     plt.figure(figsize=(6,4))
-    
-    g = 9.8
-    theta = np.radians(angle)
-    t_flight = 2 * velocity * np.sin(theta) / g
-    t = np.linspace(0, t_flight, 100)
-    
-    x = velocity * np.cos(theta) * t
-    y = velocity * np.sin(theta) * t - 0.5 * g * t**2
-    
-    plt.plot(x, y, label="Trajectory")
-    plt.title(f"Projectile Motion (v={velocity}m/s, angle={angle}°)")
-    plt.xlabel("Distance (m)")
-    plt.ylabel("Height (m)")
-    plt.axhline(0, color='black')
-    plt.grid(True)
-    plt.legend()
-    
-    plt.savefig(output_path)
-    plt.close()
+    draw_projectile_motion_on(plt.gca(), angle, velocity)
+    save_figure(output_path)
     return output_path
 
 # ---------- Simple Circuit ----------
-def draw_circuit(components=None, output_path="circuit.png"):
+def draw_circuit_on(ax, components=None):
     # Mock simple circuit diagram
-    plt.figure(figsize=(6,4))
-    ax = plt.gca()
-    
     # Draw wire rectangle
     rect = plt.Rectangle((1, 1), 4, 3, fill=False, edgecolor='black', linewidth=2)
     ax.add_patch(rect)
-    
+
     # Battery symbol (left side)
-    plt.plot([1, 1], [2.2, 2.8], color='white', linewidth=5) # eraser
-    plt.plot([0.8, 1.2], [2.6, 2.6], color='black', linewidth=2) # long plate
-    plt.plot([0.9, 1.1], [2.4, 2.4], color='black', linewidth=2) # short plate
-    plt.text(0.5, 2.5, "V", fontsize=12)
+    ax.plot([1, 1], [2.2, 2.8], color='white', linewidth=5) # eraser
+    ax.plot([0.8, 1.2], [2.6, 2.6], color='black', linewidth=2) # long plate
+    ax.plot([0.9, 1.1], [2.4, 2.4], color='black', linewidth=2) # short plate
+    ax.text(0.5, 2.5, "V", fontsize=12)
 
     # Resistor symbol (top side)
-    plt.plot([2.5, 3.5], [4, 4], color='white', linewidth=5) # eraser
+    ax.plot([2.5, 3.5], [4, 4], color='white', linewidth=5) # eraser
     x_zag = [2.5, 2.6, 2.7, 2.8, 2.9, 3.0, 3.1, 3.2, 3.3, 3.4, 3.5]
     y_zag = [4, 4.2, 3.8, 4.2, 3.8, 4.2, 3.8, 4.2, 3.8, 4.2, 4]
-    plt.plot(x_zag, y_zag, color='black', linewidth=1.5)
-    plt.text(2.9, 4.5, "R", fontsize=12)
-    
-    plt.xlim(0, 6)
-    plt.ylim(0, 5)
-    plt.axis('off')
-    plt.title("Simple Circuit Diagram")
-    
-    plt.savefig(output_path)
-    plt.close()
+    ax.plot(x_zag, y_zag, color='black', linewidth=1.5)
+    ax.text(2.9, 4.5, "R", fontsize=12)
+
+    ax.set_xlim(0, 6)
+    ax.set_ylim(0, 5)
+    ax.axis('off')
+    ax.set_title("Simple Circuit Diagram")
+
+def draw_circuit(components=None, output_path="circuit.png"):
+    plt.figure(figsize=(6,4))
+    draw_circuit_on(plt.gca(), components)
+    save_figure(output_path)
     return output_path
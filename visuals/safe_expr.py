@@ -0,0 +1,547 @@
+"""
+Sandboxed Expression Evaluation for Function Plots
+
+User text from "plot ..." and "derivative of ..." questions used to go
+through sp.sympify (which runs eval) in the request thread, where an input
+like 9**9**9 or a deeply nested term could block a worker for minutes.
+
+  1. Whitelist parser: the text is parsed with ast (never evaluated) and
+     only numbers, x, pi, e, + - * / ** and a fixed set of functions are
+     accepted; the sympy expression is built node by node from the tree.
+  2. Complexity budget: length, node count, nesting depth, exponent size
+     and sympy operation counts (of f and f') are capped.
+  3. Sandbox: parsing, differentiation, lambdify and sampling run in a
+     separate worker process with an address-space limit (RLIMIT_AS) and a
+     wall-clock timeout; a worker that overruns is killed and replaced.
+  4. Fail fast: the parse and budget checks run in the caller before any
+     worker is involved. Deterministic failures (over budget, out of memory,
+     or a second timeout in a row) are remembered for SAFE_EXPR_FAILURE_TTL_S
+     and rejected immediately; a single timeout under load or a crashed
+     worker is not held against the expression.
+
+Failures raise ExpressionError (a ValueError) with a short reason.
+
+Configuration:
+  - SAFE_EXPR_SANDBOX=0       evaluate in-process (parser and budgets still apply)
+  - SAFE_EXPR_WORKERS         worker processes per server process (default 2)
+  - SAFE_EXPR_TIMEOUT_S       wall-clock limit per expression (default 2)
+  - SAFE_EXPR_MEMORY_MB       address-space limit per worker (default 1024)
+  - SAFE_EXPR_FAILURE_TTL_S   how long a failure is remembered (default 300)
+"""
+
+import ast
+import json
+import os
+import re
+import select
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from queue import Empty, LifoQueue
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from metrics import PLOT_EVALUATIONS, PLOT_EXPRESSIONS
+from tracing import span
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKERS = int(os.getenv("SAFE_EXPR_WORKERS", "2"))
+TIMEOUT_S = float(os.getenv("SAFE_EXPR_TIMEOUT_S", "2"))
+MEMORY_MB = int(os.getenv("SAFE_EXPR_MEMORY_MB", "1024"))
+FAILURE_TTL_S = float(os.getenv("SAFE_EXPR_FAILURE_TTL_S", "300"))
+STARTUP_TIMEOUT_S = 60.0
+
+# Complexity budget
+MAX_CHARS = 200
+MAX_NODES = 120
+MAX_DEPTH = 20
+MAX_EXPONENT = 50
+MAX_INT_DIGITS = 12
+MAX_OPS = 150            # sympy count_ops of f; f' may use DERIVATIVE_OPS_FACTOR times as many
+DERIVATIVE_OPS_FACTOR = 4
+
+FUNCTIONS = {
+    # name -> allowed argument counts
+    "sin": (1,), "cos": (1,), "tan": (1,), "cot": (1,), "sec": (1,), "csc": (1,),
+    "asin": (1,), "acos": (1,), "atan": (1,), "arcsin": (1,), "arccos": (1,), "arctan": (1,),
+    "sinh": (1,), "cosh": (1,), "tanh": (1,),
+    "exp": (1,), "log": (1, 2), "ln": (1,), "sqrt": (1,),
+    "abs": (1,), "floor": (1,), "ceil": (1,), "sign": (1,),
+}
+NAMES = {"x", "pi", "e", "E"}
+_BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+
+# Recently failed expensive inputs: normalized text -> (reason, count, expires at)
+_FAILURES: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+# Failures that repeat for the same input; a timeout only counts from the second
+_DETERMINISTIC = {"too_complex": 1, "memory": 1, "timeout": 2}
+_FAILURES_MAX = 256
+_FAILURES_LOCK = threading.Lock()
+
+
+class ExpressionError(ValueError):
+    """An expression was rejected or could not be evaluated; reason is a short code."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Curve(NamedTuple):
+    x: np.ndarray
+    y: np.ndarray
+    ylim: Tuple[float, float]
+    evaluations: int
+
+
+class PlotData(NamedTuple):
+    expression: str                 # sympy's rendering of f
+    derivative: Optional[str]       # and of f', when requested
+    curves: List[Curve]             # f, then f'
+
+
+# =====================================================
+# Whitelist parser and budget (no sympy, no eval)
+# =====================================================
+
+_NUMBER_FACTOR = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)\s*(?=[A-Za-z(])(?!e[+-]?\d)")
+_GROUP_FACTOR = re.compile(r"\)\s*(?=[\w(])")
+
+
+def normalize(text: str) -> str:
+    text = text.strip().rstrip(".?!;,").strip()
+    # "y = x^2", "f(x) = ..." -> right-hand side
+    text = re.sub(r"^(?:y|f\s*\(\s*x\s*\))\s*=", "", text).strip()
+    text = text.replace("^", "**").replace("−", "-").replace("π", "pi")
+    # Implicit multiplication: 2x, 3(x+1), (x+1)(x-1), (x+1)x; 1e-3 stays a number
+    text = _NUMBER_FACTOR.sub(r"\1*", text)
+    return _GROUP_FACTOR.sub(")*", text)
+
+
+def _reject(reason: str, message: str):
+    PLOT_EXPRESSIONS.inc(result=reason)
+    raise ExpressionError(reason, message)
+
+
+def _literal_value(node: ast.AST) -> Optional[float]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPS):
+        value = _literal_value(node.operand)
+        if value is not None:
+            return -value if isinstance(node.op, ast.USub) else value
+    return None
+
+
+def _same_precedence(child: ast.AST, op: ast.operator) -> bool:
+    groups = ((ast.Add, ast.Sub), (ast.Mult, ast.Div))
+    return isinstance(child, ast.BinOp) and any(
+        isinstance(op, group) and isinstance(child.op, group) for group in groups
+    )
+
+
+def check(text: str) -> ast.Expression:
+    """
+    Parse text and enforce the whitelist and complexity budget.
+
+    Returns:
+        The validated syntax tree
+
+    Raises:
+        ExpressionError: syntax, not_allowed or too_complex
+    """
+    text = normalize(text)
+    if not text:
+        _reject("syntax", "empty expression")
+    if len(text) > MAX_CHARS:
+        _reject("too_complex", f"expression longer than {MAX_CHARS} characters")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        _reject("syntax", f"could not parse {text!r}")
+
+    nodes = 0
+    stack = [(tree.body, 1)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if nodes > MAX_NODES:
+            _reject("too_complex", f"expression has more than {MAX_NODES} terms")
+        if depth > MAX_DEPTH:
+            _reject("too_complex", f"expression nested deeper than {MAX_DEPTH}")
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, _BINARY_OPS):
+            if isinstance(node.op, ast.Pow):
+                exponent = _literal_value(node.right)
+                if exponent is not None and abs(exponent) > MAX_EXPONENT:
+                    _reject("too_complex", f"exponent {exponent:g} larger than {MAX_EXPONENT}")
+            # a + b + c parses as ((a + b) + c); a flat chain is not nesting
+            left_depth = depth if _same_precedence(node.left, node.op) else depth + 1
+            stack.extend([(node.left, left_depth), (node.right, depth + 1)])
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY_OPS):
+            stack.append((node.operand, depth + 1))
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                _reject("not_allowed", "only numbers are allowed as constants")
+            if isinstance(node.value, int) and len(str(abs(node.value))) > MAX_INT_DIGITS:
+                _reject("too_complex", f"number with more than {MAX_INT_DIGITS} digits")
+        elif isinstance(node, ast.Name):
+            if node.id not in NAMES and node.id not in FUNCTIONS:
+                _reject("not_allowed", f"unknown name {node.id!r} (only x, pi, e)")
+            if node.id in FUNCTIONS:
+                _reject("not_allowed", f"{node.id} must be called, e.g. {node.id}(x)")
+        elif isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in FUNCTIONS:
+                _reject("not_allowed", f"function {name or '?'} is not allowed")
+            if node.keywords or len(node.args) not in FUNCTIONS[name]:
+                _reject("not_allowed", f"wrong arguments for {name}")
+            stack.extend((arg, depth + 1) for arg in node.args)
+        else:
+            _reject("not_allowed", f"{type(node).__name__} is not allowed in expressions")
+    return tree
+
+
+# =====================================================
+# Evaluation (runs inside the sandbox worker)
+# =====================================================
+
+def _to_sympy(node, sp, x):
+    if isinstance(node, ast.Expression):
+        return _to_sympy(node.body, sp, x)
+    if isinstance(node, ast.Constant):
+        return sp.Integer(node.value) if isinstance(node.value, int) else sp.Float(repr(node.value))
+    if isinstance(node, ast.Name):
+        return {"x": x, "pi": sp.pi, "e": sp.E, "E": sp.E}[node.id]
+    if isinstance(node, ast.UnaryOp):
+        operand = _to_sympy(node.operand, sp, x)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.Call):
+        args = [_to_sympy(arg, sp, x) for arg in node.args]
+        functions = {
+            "sin": sp.sin, "cos": sp.cos, "tan": sp.tan, "cot": sp.cot, "sec": sp.sec, "csc": sp.csc,
+            "asin": sp.asin, "acos": sp.acos, "atan": sp.atan,
+            "arcsin": sp.asin, "arccos": sp.acos, "arctan": sp.atan,
+            "sinh": sp.sinh, "cosh": sp.cosh, "tanh": sp.tanh,
+            "exp": sp.exp, "log": sp.log, "ln": sp.log, "sqrt": sp.sqrt,
+            "abs": sp.Abs, "floor": sp.floor, "ceil": sp.ceiling, "sign": sp.sign,
+        }
+        return functions[node.func.id](*args)
+    left, right = _to_sympy(node.left, sp, x), _to_sympy(node.right, sp, x)
+    op = node.op
+    if isinstance(op, ast.Add):
+        return left + right
+    if isinstance(op, ast.Sub):
+        return left - right
+    if isinstance(op, ast.Mult):
+        return left * right
+    if isinstance(op, ast.Div):
+        return left / right
+    # Pow: computed exponents (e.g. 9**9**9) are checked before sympy evaluates them
+    if right.is_number:
+        exponent = abs(complex(right.evalf(15)))
+        if exponent > MAX_EXPONENT and not (left.is_number and abs(complex(left.evalf(15))) <= 1):
+            raise ExpressionError("too_complex", f"exponent larger than {MAX_EXPONENT}")
+    return left ** right
+
+
+def _curve(sp, x, expr, domain, budget) -> dict:
+    from visuals.sampling import sample_function
+    f = sp.lambdify(x, expr, "numpy")
+    sampled = sample_function(f, domain, budget)
+    return {
+        "x": sampled.x.tolist(),
+        "y": sampled.y.tolist(),
+        "ylim": list(sampled.ylim),
+        "evaluations": sampled.evaluations,
+    }
+
+
+def evaluate(text: str, derivative: bool = False, domain=None, budget=None) -> dict:
+    """Parse, differentiate, lambdify and sample (the work done in the sandbox)."""
+    import sympy as sp
+    tree = check(text)
+    x = sp.Symbol("x", real=True)
+    expr = _to_sympy(tree, sp, x)
+    if sp.count_ops(expr) > MAX_OPS:
+        raise ExpressionError("too_complex", f"expression has more than {MAX_OPS} operations")
+    result = {"expression": str(expr), "derivative": None, "curves": [_curve(sp, x, expr, domain, budget)]}
+    if derivative:
+        # floor/ceil/sign are piecewise constant: their derivative (an unevaluated
+        # Derivative, or DiracDelta at the jumps) is 0 wherever it can be plotted
+        d_expr = sp.diff(expr, x).replace(
+            lambda e: isinstance(e, (sp.Derivative, sp.Subs, sp.DiracDelta)), lambda e: sp.S.Zero
+        )
+        if sp.count_ops(d_expr) > MAX_OPS * DERIVATIVE_OPS_FACTOR:
+            raise ExpressionError("too_complex", "derivative is too large to plot")
+        result["derivative"] = str(d_expr)
+        result["curves"].append(_curve(sp, x, d_expr, domain, budget))
+    return result
+
+
+def _worker_main() -> int:
+    """Sandbox process: one JSON request per line on stdin, one JSON response per line on stdout."""
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    sys.stdout = sys.stderr  # stray prints must not corrupt the protocol
+    import sympy  # noqa: F401  (import before the memory limit, then report ready)
+    import visuals.sampling  # noqa: F401
+    try:
+        import resource
+        limit = int(os.getenv("SAFE_EXPR_MEMORY_MB", str(MEMORY_MB))) * 1024 * 1024
+        with open("/proc/self/statm") as f:
+            in_use = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        # Never below what the imports already mapped, plus headroom
+        resource.setrlimit(resource.RLIMIT_AS, (max(limit, in_use + 256 * 1024 * 1024),) * 2)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"⚠️  Expression sandbox without memory limit: {e}", file=sys.stderr)
+    protocol.write('{"ready": true}\n')
+    protocol.flush()
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            response = {"ok": True, **evaluate(
+                request["text"], request.get("derivative", False), request.get("domain"), request.get("budget")
+            )}
+        except ExpressionError as e:
+            response = {"ok": False, "reason": e.reason, "error": str(e)}
+        except MemoryError:
+            response = {"ok": False, "reason": "memory", "error": "expression needs too much memory"}
+        except Exception as e:
+            response = {"ok": False, "reason": "invalid", "error": f"{type(e).__name__}: {e}"}
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+    return 0
+
+
+# =====================================================
+# Worker pool (caller side)
+# =====================================================
+
+class _Worker:
+    def __init__(self):
+        env = dict(os.environ, PYTHONPATH=ROOT, OMP_NUM_THREADS="1", OPENBLAS_NUM_THREADS="1", MKL_NUM_THREADS="1")
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=ROOT, env=env,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        if self._read(STARTUP_TIMEOUT_S) is None:
+            self.kill()
+            raise ExpressionError("worker", "expression sandbox did not start")
+
+    def _read(self, timeout: float) -> Optional[dict]:
+        ready, _, _ = select.select([self.proc.stdout], [], [], max(0.0, timeout))
+        if not ready:
+            return None
+        line = self.proc.stdout.readline()
+        if not line:
+            raise ExpressionError("worker", "expression sandbox exited")
+        return json.loads(line)
+
+    def request(self, payload: dict, timeout: float) -> Optional[dict]:
+        """Response dict, or None on timeout (the caller kills the worker)."""
+        try:
+            self.proc.stdin.write(json.dumps(payload) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise ExpressionError("worker", "expression sandbox exited")
+        return self._read(timeout)
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+class SandboxPool:
+    """
+    Persistent sandbox processes shared by request threads.
+
+    Args:
+        size: Number of worker processes
+        timeout_s: Wall-clock limit per expression
+    """
+
+    def __init__(self, size: int = WORKERS, timeout_s: float = TIMEOUT_S):
+        self.size = max(1, size)
+        self.timeout_s = timeout_s
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> None:
+        # Forked server workers start their own sandboxes
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._idle = LifoQueue()
+                    self._started = 0
+                    self._pid = os.getpid()
+
+    def _acquire(self, deadline: float) -> _Worker:
+        self._ensure()
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            spawn = self._started < self.size
+            if spawn:
+                self._started += 1
+        if spawn:
+            try:
+                return _Worker()
+            except Exception:
+                with self._lock:
+                    self._started -= 1
+                raise
+        try:
+            return self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+        except Empty:
+            raise ExpressionError("busy", "all expression sandboxes are busy")
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self._started -= 1
+        # Replace it off the request path so the next plot does not pay the start-up
+        threading.Thread(target=self._replenish, daemon=True).start()
+
+    def _replenish(self) -> None:
+        with self._lock:
+            if self._started >= self.size:
+                return
+            self._started += 1
+        try:
+            self._idle.put(_Worker())
+        except Exception as e:
+            print(f"⚠️  Could not restart expression sandbox: {e}")
+            with self._lock:
+                self._started -= 1
+
+    def run(self, payload: dict) -> dict:
+        # A sandbox that died while idle is replaced and the request retried once
+        for attempt in range(2):
+            # Waiting for a free sandbox is bounded by the same limit as evaluating
+            worker = self._acquire(time.monotonic() + self.timeout_s)
+            if worker.proc.poll() is not None:
+                self._discard(worker)
+                continue
+            try:
+                response = worker.request(payload, self.timeout_s)
+            except ExpressionError as e:
+                self._discard(worker)
+                if attempt == 0 and e.reason == "worker":
+                    continue
+                raise
+            if response is None:
+                # Overran the wall-clock limit: the only safe stop is to kill it
+                self._discard(worker)
+                raise ExpressionError("timeout", f"expression took longer than {self.timeout_s:g}s")
+            self._idle.put(worker)
+            return response
+        raise ExpressionError("worker", "expression sandbox exited")
+
+
+_POOL = SandboxPool()
+
+
+def _remember_failure(key: str, reason: str) -> None:
+    if reason not in _DETERMINISTIC:
+        return
+    now = time.monotonic()
+    with _FAILURES_LOCK:
+        previous, count, expires = _FAILURES.get(key, (reason, 0, 0.0))
+        count = count + 1 if previous == reason and expires > now else 1
+        _FAILURES[key] = (reason, count, now + FAILURE_TTL_S)
+        _FAILURES.move_to_end(key)
+        while len(_FAILURES) > _FAILURES_MAX:
+            _FAILURES.popitem(last=False)
+
+
+def _known_failure(key: str) -> Optional[str]:
+    """Reason if key failed deterministically within the TTL."""
+    with _FAILURES_LOCK:
+        entry = _FAILURES.get(key)
+        if entry is None:
+            return None
+        reason, count, expires = entry
+        if expires <= time.monotonic():
+            del _FAILURES[key]
+            return None
+    return reason if count >= _DETERMINISTIC[reason] else None
+
+
+def plot_data(text: str, derivative: bool = False, domain: Optional[Sequence[float]] = None,
+              budget: Optional[int] = None) -> PlotData:
+    """
+    Sampled curves for f (and f') from untrusted expression text.
+
+    Args:
+        text: Expression in x, e.g. "x^2 - 4" or "sin(10*x)"
+        derivative: Also differentiate and sample f'
+        domain: (a, b) x-range (default [-10, 10])
+        budget: Point budget per curve (default PLOT_POINT_BUDGET)
+
+    Returns:
+        PlotData(expression, derivative, curves)
+
+    Raises:
+        ExpressionError: rejected by the parser/budget, timed out, out of memory
+    """
+    with span("safe_expr", derivative=derivative, chars=len(text)) as scope:
+        check(text)  # fail fast, before any sandbox is involved
+        key = f"{int(derivative)}:{normalize(text)}"
+        reason = _known_failure(key)
+        if reason:
+            _reject(reason, f"expression recently failed ({reason})")
+
+        payload = {"text": text, "derivative": derivative,
+                   "domain": list(domain) if domain else None, "budget": budget}
+        try:
+            if os.getenv("SAFE_EXPR_SANDBOX", "1") == "0":
+                try:
+                    response = {"ok": True, **evaluate(**payload)}
+                except ExpressionError as e:
+                    response = {"ok": False, "reason": e.reason, "error": str(e)}
+            else:
+                response = _POOL.run(payload)
+        except ExpressionError as e:
+            _remember_failure(key, e.reason)
+            PLOT_EXPRESSIONS.inc(result=e.reason)
+            scope.set(result=e.reason)
+            raise
+
+        if not response["ok"]:
+            _remember_failure(key, response["reason"])
+            scope.set(result=response["reason"])
+            _reject(response["reason"], response["error"])
+
+        curves = []
+        for curve in response["curves"]:
+            PLOT_EVALUATIONS.observe(curve["evaluations"])
+            curves.append(Curve(
+                np.asarray(curve["x"], dtype=float),
+                np.asarray(curve["y"], dtype=float),
+                tuple(curve["ylim"]),
+                curve["evaluations"],
+            ))
+        PLOT_EXPRESSIONS.inc(result="ok")
+        scope.set(result="ok")
+        return PlotData(response["expression"], response["derivative"], curves)
+
+
+if __name__ == "__main__" and "--worker" in sys.argv:
+    sys.path.insert(0, ROOT)
+    try:
+        sys.exit(_worker_main())
+    except (BrokenPipeError, KeyboardInterrupt):
+        # The server process went away; nothing left to answer
+        sys.exit(0)
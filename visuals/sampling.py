@@ -0,0 +1,243 @@
+"""
+Adaptive Sampling for Function Plots
+
+Instead of 400 evenly spaced points on [-10, 10]:
+  - start from a coarse uniform grid, then repeatedly bisect only the
+    intervals whose midpoint deviates from the straight line between the
+    endpoints (curvature) or whose ends differ in finiteness; smooth curves
+    stop early, sin(10*x) gets detail where it oscillates
+  - a point budget caps the evaluations; when it is short the worst
+    intervals are refined first
+  - non-finite and complex values are masked (NaN), and an interval that is
+    still a large jump after bisecting down to the minimum width is a
+    discontinuity: a NaN is inserted so matplotlib breaks the line instead
+    of drawing a vertical through the pole of tan(x) or 1/x
+  - y-limits come from robust percentiles, so a pole does not flatten the rest
+  - the domain can be given in the question ("from -pi to pi", "on [0, 5]")
+
+Configuration:
+  - PLOT_POINT_BUDGET        maximum evaluations per curve (default 2000)
+"""
+
+import math
+import os
+import re
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DOMAIN = (-10.0, 10.0)
+POINT_BUDGET = int(os.getenv("PLOT_POINT_BUDGET", "2000"))
+INITIAL_POINTS = 129
+# Midpoint error tolerance, relative to the robust y-range (below a pixel on a ~500 px plot)
+TOLERANCE = 1e-3
+MAX_DEPTH = 10
+# A bisected interval whose |dy| stays above JUMP * y-range for MAX_JUMP_DEPTH
+# levels contains a jump or pole
+JUMP = 0.5
+MAX_JUMP_DEPTH = 6
+MAX_DOMAIN_WIDTH = 1e6
+
+
+class Sampled(NamedTuple):
+    x: np.ndarray
+    y: np.ndarray          # NaN where masked or at a discontinuity break
+    ylim: Tuple[float, float]
+    evaluations: int
+    breaks: int
+
+
+def _evaluate(f: Callable, x: np.ndarray) -> np.ndarray:
+    with np.errstate(all="ignore"):
+        y = f(x)
+    y = np.asarray(y)
+    if y.ndim == 0:
+        # Constant expressions lambdify to a scalar
+        y = np.full(x.shape, y)
+    if np.iscomplexobj(y):
+        y = np.where(np.abs(y.imag) < 1e-12, y.real, np.nan)
+    y = np.asarray(y, dtype=float)
+    y[~np.isfinite(y)] = np.nan
+    return y
+
+
+def _robust_range(y: np.ndarray) -> Tuple[float, float]:
+    finite = y[np.isfinite(y)]
+    if finite.size == 0:
+        return -1.0, 1.0
+    lo, hi = np.percentile(finite, [2, 98])
+    if hi - lo < 1e-12:
+        lo, hi = lo - 1.0, hi + 1.0
+    return float(lo), float(hi)
+
+
+def sample_function(f: Callable[[np.ndarray], np.ndarray], domain: Optional[Tuple[float, float]] = None,
+                    budget: Optional[int] = None) -> Sampled:
+    """
+    Adaptively sample a vectorized function for plotting.
+
+    Args:
+        f: Vectorized function (e.g. sympy.lambdify(x, expr, "numpy"))
+        domain: (a, b) x-range, default [-10, 10]
+        budget: Maximum number of evaluations (default PLOT_POINT_BUDGET)
+
+    Returns:
+        Sampled(x, y, ylim, evaluations, breaks)
+
+    Raises:
+        ValueError: domain is not a finite (a, b) with a < b
+    """
+    a, b = (float(v) for v in (domain or DEFAULT_DOMAIN))
+    if not (math.isfinite(a) and math.isfinite(b) and a < b):
+        raise ValueError(f"invalid domain {domain!r}")
+    budget = max(16, budget or POINT_BUDGET)
+    n0 = min(INITIAL_POINTS, budget // 2)
+    x0 = np.linspace(a, b, n0)
+    y0 = _evaluate(f, x0)
+    evaluations = n0
+
+    lo, hi = _robust_range(y0)
+    scale = hi - lo
+    tol = TOLERANCE * scale
+    jump = JUMP * scale
+    min_width = (b - a) / (n0 - 1) / 2 ** MAX_DEPTH
+
+    xs, ys = [x0], [y0]
+    xl, xr, yl, yr = x0[:-1], x0[1:], y0[:-1], y0[1:]
+    # Consecutive bisections in which the interval still spanned a large jump
+    jumps = np.zeros(xl.size, dtype=int)
+    discontinuities = []  # left ends of intervals given up on as jumps/poles
+    while xl.size:
+        take = min(xl.size, budget - evaluations)
+        if take <= 0:
+            break
+        xm = (xl + xr) / 2
+        if take < xl.size:
+            # Out of budget: spend the rest on the widest-jumping intervals
+            worst = np.argsort(-np.nan_to_num(np.abs(yr - yl), nan=np.inf))[:take]
+            xl, xr, yl, yr, xm, jumps = xl[worst], xr[worst], yl[worst], yr[worst], xm[worst], jumps[worst]
+        ym = _evaluate(f, xm)
+        evaluations += xm.size
+        xs.append(xm)
+        ys.append(ym)
+
+        with np.errstate(invalid="ignore"):
+            finite = np.isfinite(yl) & np.isfinite(ym) & np.isfinite(yr)
+            mixed = ~finite & ~(np.isnan(yl) & np.isnan(ym) & np.isnan(yr))
+            curved = finite & (np.abs(ym - (yl + yr) / 2) > tol)
+            # Entirely above or below the view (e.g. beside a pole): nothing to draw there
+            low = np.fmax(np.fmax(yl, ym), yr) < lo - 2 * scale
+            high = np.fmin(np.fmin(yl, ym), yr) > hi + 2 * scale
+            flagged = (curved & ~low & ~high) | mixed
+            left_jump = np.abs(ym - yl) > jump
+            right_jump = np.abs(yr - ym) > jump
+
+        flagged &= (xr - xl) / 2 >= min_width
+        # A jump that does not shrink under bisection is a discontinuity, not a steep slope
+        left_jumps = np.where(left_jump, jumps + 1, 0)
+        right_jumps = np.where(right_jump, jumps + 1, 0)
+        pole_left = flagged & (left_jumps >= MAX_JUMP_DEPTH)
+        pole_right = flagged & (right_jumps >= MAX_JUMP_DEPTH)
+        discontinuities.extend(xl[pole_left])
+        discontinuities.extend(xm[pole_right])
+        keep_left = flagged & ~pole_left
+        keep_right = flagged & ~pole_right
+        xl, xr, yl, yr, jumps = (
+            np.concatenate([xl[keep_left], xm[keep_right]]),
+            np.concatenate([xm[keep_left], xr[keep_right]]),
+            np.concatenate([yl[keep_left], ym[keep_right]]),
+            np.concatenate([ym[keep_left], yr[keep_right]]),
+            np.concatenate([left_jumps[keep_left], right_jumps[keep_right]]),
+        )
+
+    x = np.concatenate(xs)
+    y = np.concatenate(ys)
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+    ylim = _view(y, y0)
+
+    # Break the line at detected discontinuities and wherever one segment would
+    # span half the view (refined curves never do; the vertical through a pole does)
+    with np.errstate(invalid="ignore"):
+        dy = np.abs(np.diff(y))
+        at = (np.isin(x[:-1], discontinuities) & (dy > jump)) | (dy > 0.5 * (ylim[1] - ylim[0]))
+    idx = np.flatnonzero(at) + 1
+    if idx.size:
+        x = np.insert(x, idx, (x[idx - 1] + x[idx]) / 2)
+        y = np.insert(y, idx, np.nan)
+    return Sampled(x, y, ylim, evaluations, int(idx.size))
+
+
+def _view(y: np.ndarray, y_uniform: np.ndarray) -> Tuple[float, float]:
+    """
+    y-limits: the whole curve when it has no poles, otherwise a robust window.
+    Percentiles come from the uniform grid; refined points cluster near poles.
+    """
+    lo, hi = _robust_range(y_uniform)
+    span = hi - lo
+    finite = y[np.isfinite(y)]
+    if finite.size and finite.min() >= lo - 1.5 * span and finite.max() <= hi + 1.5 * span:
+        lo, hi = float(finite.min()), float(finite.max())
+    margin = 0.05 * (hi - lo) or 1.0
+    return lo - margin, hi + margin
+
+
+# =====================================================
+# Domain from the question text
+# =====================================================
+
+_NUM = r"[-+−]?\s*(?:\d+(?:\.\d+)?\s*\*?\s*(?:pi|π)?|(?:pi|π))(?:\s*/\s*\d+(?:\.\d+)?)?"
+# "for", "for x" or ", x" before the range belongs to the clause; a bare x
+# does not (in "plot x from 0 to 5" it is the expression)
+_LEAD = r"(?:(?:\bfor|,)\s*x\s*|\bfor\s+)?"
+_DOMAIN_PATTERNS = (
+    # from -2 to 5, from x = -2 to x = 5, for x from 0 to 2pi
+    re.compile(rf"{_LEAD}\bfrom\s+(?:x\s*=\s*)?({_NUM})\s+(?:to|until)\s+(?:x\s*=\s*)?({_NUM})", re.I),
+    # for x between -3 and 3
+    re.compile(rf"{_LEAD}\bbetween\s+({_NUM})\s+and\s+({_NUM})", re.I),
+    # on [0, 5], over (-1, 1), for x in [-pi, pi], x ∈ [0, 1]
+    re.compile(rf"{_LEAD}(?:\bon|\bover|\bin|∈)\s*[\[\(]\s*({_NUM})\s*,\s*({_NUM})\s*[\]\)]", re.I),
+    # -2 <= x <= 5
+    re.compile(rf"({_NUM})\s*<=?\s*x\s*<=?\s*({_NUM})", re.I),
+)
+
+
+def _parse_number(token: str) -> float:
+    token = token.replace("−", "-").replace(" ", "").lower().replace("π", "pi")
+    sign = -1.0 if token.startswith("-") else 1.0
+    token = token.lstrip("+-")
+    divisor = 1.0
+    if "/" in token:
+        token, denominator = token.split("/", 1)
+        divisor = float(denominator)
+    if token.endswith("pi"):
+        coefficient = token[:-2].rstrip("*")
+        value = (float(coefficient) if coefficient else 1.0) * math.pi
+    else:
+        value = float(token)
+    return sign * value / divisor
+
+
+def split_domain(text: str) -> Tuple[str, Optional[Tuple[float, float]]]:
+    """
+    Find an x-range in a question and remove it from the expression text.
+
+    Returns:
+        (text without the domain clause, (a, b) or None)
+    """
+    for pattern in _DOMAIN_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        try:
+            a, b = _parse_number(match.group(1)), _parse_number(match.group(2))
+        except (ValueError, ZeroDivisionError):
+            continue
+        if not (math.isfinite(a) and math.isfinite(b)) or a == b:
+            continue
+        a, b = min(a, b), max(a, b)
+        if b - a > MAX_DOMAIN_WIDTH:
+            continue
+        remaining = (text[:match.start()] + text[match.end():]).strip().rstrip(",;")
+        return remaining, (a, b)
+    return text, None
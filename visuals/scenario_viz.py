@@ -1,6 +1,7 @@
 
 import matplotlib.pyplot as plt
 import networkx as nx
+from visuals.output import save_figure
 
 def draw_flowchart(steps=None, title="Process Flow", output_path="flowchart.png"):
     """
@@ -33,6 +34,5 @@ def draw_flowchart(steps=None, title="Process Flow", output_path="flowchart.png"
             
     plt.title(title)
     plt.axis("off") # hide axis
-    plt.savefig(output_path)
-    plt.close()
+    save_figure(output_path)
     return output_path
@@ -0,0 +1,176 @@
+"""
+Pre-rendered Static Visuals
+Parameter-free and default visuals rendered once, served from memory
+
+generate_triangle, draw_circuit and draw_motion_vector ignore the question,
+and most circle/rectangle/force questions use the defaults, so their PNGs
+never change between requests. They are rendered once (at startup, or at
+build time with --build) and kept as bytes; /generate links to them under
+/static_visuals/<name>?v=<hash> instead of re-running matplotlib.
+
+Variants are keyed by their worksheet spec (nlp_engine.worksheet_spec), so
+a question hits the cache exactly when text_to_image would have drawn the
+same image. The cache is tagged with visuals.output.STYLE_VERSION and the
+matplotlib version; a build from another version is ignored and re-rendered.
+
+Configuration:
+  - STATIC_VISUALS=0          disable (every visual is rendered per request)
+  - STATIC_VISUALS_DIR        load a --build output instead of rendering at startup
+
+Usage:
+    python -m visuals.static_cache --build static_visuals/
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+from typing import Callable, Dict, Optional, Tuple
+
+import matplotlib
+
+from visuals.output import STYLE_VERSION
+from visuals.geometry import generate_triangle, generate_circle, generate_rectangle
+from visuals.physics import draw_force_diagram, draw_motion_vector, draw_circuit
+from metrics import CACHE_HITS, CACHE_MISSES
+
+MANIFEST = "manifest.json"
+
+# name -> (spec as produced by nlp_engine.worksheet_spec, renderer writing to a file object)
+VARIANTS: Dict[str, Tuple[dict, Callable[[io.BytesIO], object]]] = {
+    "triangle": ({"type": "triangle"}, lambda f: generate_triangle(output_path=f)),
+    "circuit": ({"type": "circuit"}, lambda f: draw_circuit(output_path=f)),
+    "circle": ({"type": "circle", "radius": 5}, lambda f: generate_circle(radius=5, output_path=f)),
+    "rectangle": (
+        {"type": "rectangle", "length": 6, "width": 4},
+        lambda f: generate_rectangle(length=6, width=4, output_path=f),
+    ),
+}
+for _direction in ("left", "right"):
+    VARIANTS[f"motion_{_direction}"] = (
+        {"type": "motion", "direction": _direction},
+        lambda f, d=_direction: draw_motion_vector(direction=d, output_path=f),
+    )
+for _direction in ("up", "down", "left", "right"):
+    VARIANTS[f"force_{_direction}"] = (
+        {"type": "force", "force_value": 10, "direction": _direction},
+        lambda f, d=_direction: draw_force_diagram(force_value=10, direction=d, output_path=f),
+    )
+
+
+def _spec_key(spec: dict) -> str:
+    # 5 and 5.0 stay distinct: the titles read "r=5" vs "r=5.0"
+    return json.dumps(spec, sort_keys=True)
+
+
+_BY_SPEC = {_spec_key(spec): name for name, (spec, _) in VARIANTS.items()}
+
+
+def style_tag() -> str:
+    return f"{STYLE_VERSION}-mpl{matplotlib.__version__}"
+
+
+class StaticVisual:
+    __slots__ = ("data", "digest")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+_CACHE: Dict[str, StaticVisual] = {}
+
+
+def enabled() -> bool:
+    return os.getenv("STATIC_VISUALS", "1") != "0"
+
+
+def render(name: str) -> bytes:
+    buffer = io.BytesIO()
+    VARIANTS[name][1](buffer)
+    return buffer.getvalue()
+
+
+def _load_dir(directory: str) -> Optional[Dict[str, StaticVisual]]:
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        print(f"⚠️  No static visuals manifest in {directory}; rendering at startup")
+        return None
+    if manifest.get("style") != style_tag():
+        print(f"⚠️  Static visuals in {directory} are style {manifest.get('style')}, "
+              f"current is {style_tag()}; rendering at startup")
+        return None
+    loaded = {}
+    for name in VARIANTS:
+        try:
+            with open(os.path.join(directory, f"{name}.png"), "rb") as f:
+                loaded[name] = StaticVisual(f.read())
+        except OSError:
+            loaded[name] = StaticVisual(render(name))
+    return loaded
+
+
+def prerender(directory: Optional[str] = None) -> int:
+    """
+    Fill the in-memory cache (from a --build directory when it matches the style).
+
+    Returns:
+        Number of cached visuals
+    """
+    global _CACHE
+    if not enabled():
+        return 0
+    directory = directory or os.getenv("STATIC_VISUALS_DIR")
+    cache = _load_dir(directory) if directory else None
+    if cache is None:
+        cache = {name: StaticVisual(render(name)) for name in VARIANTS}
+    _CACHE = cache
+    return len(_CACHE)
+
+
+def lookup(spec: dict) -> Optional[str]:
+    """Name of the pre-rendered visual identical to spec, or None."""
+    if not _CACHE:
+        return None
+    name = _BY_SPEC.get(_spec_key(spec))
+    if name is None or name not in _CACHE:
+        CACHE_MISSES.inc(cache="static_visuals")
+        return None
+    CACHE_HITS.inc(cache="static_visuals")
+    return name
+
+
+def get(name: str) -> Optional[StaticVisual]:
+    return _CACHE.get(name)
+
+
+def url(name: str) -> str:
+    """Content-addressed URL for /static_visuals (served as immutable)."""
+    return f"/static_visuals/{name}.png?v={_CACHE[name].digest[:16]}"
+
+
+def build(directory: str) -> None:
+    """Render every variant to directory for STATIC_VISUALS_DIR."""
+    os.makedirs(directory, exist_ok=True)
+    for name in VARIANTS:
+        with open(os.path.join(directory, f"{name}.png"), "wb") as f:
+            f.write(render(name))
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"style": style_tag(), "variants": sorted(VARIANTS)}, f, indent=2)
+    print(f"Wrote {len(VARIANTS)} static visuals ({style_tag()}) to {directory}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", metavar="DIR", required=True, help="write PNGs and manifest to DIR")
+    args = parser.parse_args(argv)
+    build(args.build)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Worksheet Renderer
+Many visuals laid out as subplots of one figure, encoded once
+
+A worksheet is a list of visual specs, e.g.
+    [{"type": "circle", "radius": [2, 4, 6]},
+     {"type": "projectile", "angle": [15, 30, 45, 60, 75], "velocity": 20},
+     {"type": "derivative", "expression": "x**3 - 2*x", "domain": [-2, 2]}]
+
+List-valued parameters expand into one panel per value (three circles
+above), except for projectile launches: a sweep is computed as one
+vectorized NumPy array (visuals.physics.projectile_trajectories) and drawn
+on a single panel, at most MAX_SWEEP values per list. Every panel shares one
+figure setup and one PNG encode.
+"""
+
+import math
+import os
+from typing import Dict, List, Sequence
+
+import matplotlib.pyplot as plt
+
+from visuals.output import save_figure
+from visuals.geometry import draw_triangle_on, draw_circle_on, draw_rectangle_on
+from visuals.physics import (
+    draw_force_diagram_on,
+    draw_motion_vector_on,
+    draw_projectile_motion_on,
+    draw_circuit_on,
+)
+from visuals.graphs import draw_linear_graph_on, draw_parabola_on, draw_generic_function_on
+from visuals.derivative import draw_derivative_on
+
+MAX_PANELS = int(os.getenv("WORKSHEET_MAX_PANELS", "24"))
+MAX_SWEEP = int(os.getenv("WORKSHEET_MAX_SWEEP", "24"))
+PANEL_SIZE = (4.0, 3.2)
+
+# type -> (drawer, accepted parameters)
+DRAWERS = {
+    "triangle": (draw_triangle_on, ()),
+    "circle": (draw_circle_on, ("radius",)),
+    "rectangle": (draw_rectangle_on, ("length", "width")),
+    "force": (draw_force_diagram_on, ("force_value", "direction")),
+    "motion": (draw_motion_vector_on, ("direction",)),
+    "projectile": (draw_projectile_motion_on, ("angle", "velocity")),
+    "circuit": (draw_circuit_on, ()),
+    "line": (draw_linear_graph_on, ("points",)),
+    "parabola": (draw_parabola_on, ("points",)),
+    "function": (draw_generic_function_on, ("expression_str", "domain")),
+    "derivative": (draw_derivative_on, ("function_str", "domain")),
+}
+# Spec aliases for the drawers' own argument names
+_ALIASES = {"expression": {"function": "expression_str", "derivative": "function_str"}}
+# Parameters whose value is itself a list (never expanded into panels)
+_LIST_PARAMS = {"points", "domain"}
+# Types whose list parameters are drawn as one vectorized sweep
+_SWEEP_TYPES = {"projectile"}
+
+
+def _params(spec: dict) -> Dict[str, object]:
+    kind = spec.get("type")
+    if kind not in DRAWERS:
+        raise ValueError(f"unknown visual type {kind!r} (expected one of: {', '.join(sorted(DRAWERS))})")
+    accepted = DRAWERS[kind][1]
+    params = {}
+    for key, value in spec.items():
+        if key == "type":
+            continue
+        key = _ALIASES.get(key, {}).get(kind, key)
+        if key not in accepted:
+            raise ValueError(f"{kind}: unexpected parameter {key!r}")
+        params[key] = value
+    return params
+
+
+def expand_specs(specs: Sequence[dict]) -> List[dict]:
+    """
+    One entry per panel: list-valued parameters become one panel per value.
+
+    Returns:
+        [{"type": ..., "params": {...}}, ...]
+
+    Raises:
+        ValueError: unknown type/parameter, mismatched list lengths, too many
+            panels, or a sweep longer than MAX_SWEEP
+    """
+    panels = []
+    for spec in specs:
+        if not isinstance(spec, dict):
+            raise ValueError("each visual spec must be an object with a 'type'")
+        kind = spec.get("type")
+        params = _params(spec)
+        sweeps = {
+            k: v for k, v in params.items()
+            if isinstance(v, (list, tuple)) and k not in _LIST_PARAMS
+        }
+        if kind in _SWEEP_TYPES:
+            for key, values in sweeps.items():
+                if len(values) > MAX_SWEEP:
+                    raise ValueError(f"{kind}: {key} has {len(values)} values (max {MAX_SWEEP})")
+        if not sweeps or kind in _SWEEP_TYPES:
+            panels.append({"type": kind, "params": params})
+            continue
+        lengths = {len(v) for v in sweeps.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"{kind}: list parameters must have the same length")
+        for i in range(lengths.pop()):
+            panel = dict(params)
+            panel.update({k: v[i] for k, v in sweeps.items()})
+            panels.append({"type": kind, "params": panel})
+    if not panels:
+        raise ValueError("worksheet has no visuals")
+    if len(panels) > MAX_PANELS:
+        raise ValueError(f"worksheet has {len(panels)} panels (max {MAX_PANELS})")
+    return panels
+
+
+def render_worksheet(specs: Sequence[dict], output_path="worksheet.png", title=None, columns=None):
+    """
+    Draw every spec as a subplot of one figure and save it once.
+
+    Args:
+        specs: Visual specs (see module docstring)
+        output_path: PNG to write
+        title: Optional heading over the whole sheet
+        columns: Panels per row (default: about square)
+
+    Returns:
+        output_path
+
+    Raises:
+        ValueError: invalid specs or columns (nothing is rendered)
+    """
+    if columns is not None and (isinstance(columns, bool) or not isinstance(columns, int) or columns < 1):
+        raise ValueError("columns must be a positive integer")
+    panels = expand_specs(specs)
+    n = len(panels)
+    columns = min(columns or math.ceil(math.sqrt(n)), n)
+    rows = math.ceil(n / columns)
+
+    fig, axes = plt.subplots(
+        rows, columns, figsize=(PANEL_SIZE[0] * columns, PANEL_SIZE[1] * rows), squeeze=False
+    )
+    flat = axes.ravel()
+    for ax, panel in zip(flat, panels):
+        drawer = DRAWERS[panel["type"]][0]
+        try:
+            drawer(ax, **panel["params"])
+        except Exception as e:
+            # One bad expression should not cost the teacher the whole sheet
+            print(f"⚠️  Worksheet panel {panel['type']} failed: {e}")
+            ax.clear()
+            ax.text(0.5, 0.5, f"Could not draw {panel['type']}", ha='center', va='center')
+            ax.axis('off')
+    for ax in flat[n:]:
+        ax.axis('off')
+
+    if title:
+        fig.suptitle(title, fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    save_figure(output_path)
+    return output_path
@@ -0,0 +1,175 @@
+"""
+Model Warm-up and Readiness Registry
+Per-component load state for /health, /health/live and /health/ready
+
+Components move through: loading -> loaded -> warming -> ready (or failed).
+The warm-up runs one representative input through every loaded model and
+the render paths, so lazy first-call costs (PyTorch kernel init, SBERT
+tokenizer, spaCy vocab, matplotlib font cache) are paid before a load
+balancer sends traffic, not by the first /simplify.
+
+Configuration:
+  - WARMUP=0                 skip the warm-up (loaded components count as ready)
+  - WARMUP_DEFERRED=1        app.py does not start it (serve_prefork.py runs it per worker)
+  - READY_COMPONENTS=a,b     components readiness depends on (default: all)
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+SAMPLE_QUESTION = "Calculate the area of the circle with radius = 6cm."
+SAMPLE_SIMPLIFIED = "Find the area of the circle with radius = 6cm."
+# One prompt per render family: geometry, graphs, physics
+SAMPLE_VISUALS = (
+    SAMPLE_QUESTION,
+    "Plot the parabola y = x^2 - 4",
+    "Draw the projectile motion of a ball thrown at 20 m/s at 45 degrees",
+)
+
+_LOCK = threading.Lock()
+_COMPONENTS: Dict[str, dict] = {}
+_STARTED = time.time()
+_WARMUP = {"state": "pending", "duration_ms": None}
+
+
+def _set(name: str, **fields) -> None:
+    with _LOCK:
+        component = _COMPONENTS.setdefault(
+            name, {"state": "loading", "load_ms": None, "warmup_ms": None, "error": None}
+        )
+        component.update(fields)
+
+
+def mark_failed(name: str, error: str) -> None:
+    """Record a component that cannot serve (e.g. models missing, mock mode)."""
+    _set(name, state="failed", error=error)
+
+
+@contextmanager
+def loading(name: str):
+    """Time a component load: `with warmup.loading("text_simplifier"): ...` (re-raises)."""
+    _set(name, state="loading")
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        _set(name, state="failed", error=str(e), load_ms=round((time.perf_counter() - start) * 1000, 1))
+        raise
+    _set(name, state="loaded", load_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+def _warm(name: str, fn: Callable[[], object]) -> None:
+    with _LOCK:
+        state = _COMPONENTS.get(name, {}).get("state")
+    if state != "loaded":
+        return
+    _set(name, state="warming")
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        print(f"⚠️  Warm-up failed for {name}: {e}")
+        _set(name, state="failed", error=f"warm-up: {e}")
+        return
+    _set(name, state="ready", warmup_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+def _render_samples() -> None:
+    from nlp_engine import text_to_image
+    # Throwaway folder: warm-up images must not show up in generated_images
+    folder = tempfile.mkdtemp(prefix="warmup_")
+    try:
+        for prompt in SAMPLE_VISUALS:
+            text_to_image(prompt, folder)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _steps(simplifier) -> List[Tuple[str, Callable[[], object]]]:
+    steps = []
+    if simplifier is not None:
+        def warm_simplifier():
+            simplifier.difficulty_scorer.calculate_difficulty(SAMPLE_QUESTION)
+            simplifier.semantic_checker.check_similarity(SAMPLE_QUESTION, SAMPLE_SIMPLIFIED)
+            simplifier.rule_simplifier(SAMPLE_QUESTION, aggression=2)
+        steps.append(("text_simplifier", warm_simplifier))
+
+    def warm_equivalence():
+        from equivalence_engine import validate_pairs
+        validate_pairs([SAMPLE_QUESTION], [SAMPLE_SIMPLIFIED], early_exit=False)
+    steps.append(("equivalence_engine", warm_equivalence))
+
+    steps.append(("nlp_engine", _render_samples))
+
+    def warm_braille():
+        from braille_converter import to_braille
+        to_braille(SAMPLE_QUESTION)
+    steps.append(("braille", warm_braille))
+    return steps
+
+
+def warm_up(simplifier=None) -> None:
+    """Run every loaded component once; failures mark that component failed."""
+    enabled = os.getenv("WARMUP", "1") != "0"
+    _WARMUP["state"] = "running"
+    start = time.perf_counter()
+    if enabled:
+        for name, fn in _steps(simplifier):
+            _warm(name, fn)
+    # Components without a warm-up step (the shared model preload, or all of
+    # them with WARMUP=0) are ready once loaded
+    with _LOCK:
+        for component in _COMPONENTS.values():
+            if component["state"] == "loaded":
+                component["state"] = "ready"
+    _WARMUP["state"] = "done" if enabled else "skipped"
+    _WARMUP["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"Warm-up {_WARMUP['state']} in {_WARMUP['duration_ms']:.0f} ms - ready: {is_ready()}")
+
+
+def start_background(simplifier=None) -> threading.Thread:
+    """Run warm_up in a daemon thread so the server starts answering liveness at once."""
+    thread = threading.Thread(target=warm_up, args=(simplifier,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _required() -> List[str]:
+    configured = os.getenv("READY_COMPONENTS")
+    if configured:
+        return [name.strip() for name in configured.split(",") if name.strip()]
+    with _LOCK:
+        return list(_COMPONENTS)
+
+
+def is_ready() -> bool:
+    """True once every required component is loaded and warmed."""
+    with _LOCK:
+        states = {name: c["state"] for name, c in _COMPONENTS.items()}
+    required = _required()
+    return bool(required) and all(states.get(name) == "ready" for name in required)
+
+
+def snapshot() -> dict:
+    """Readiness report: overall status plus per-component state and timings."""
+    with _LOCK:
+        components = {name: dict(c) for name, c in _COMPONENTS.items()}
+    ready = is_ready()
+    if ready:
+        status = "ready"
+    elif any(components.get(name, {}).get("state") == "failed" for name in _required()):
+        status = "degraded"
+    else:
+        status = "starting"
+    return {
+        "status": status,
+        "ready": ready,
+        "uptime_s": round(time.time() - _STARTED, 1),
+        "warmup": dict(_WARMUP),
+        "components": components,
+    }